@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自适应采集间隔
+根据每个周期观察到的新增新闻速率（指数加权平均）和从运行记录中学习到的
+各时段新增速率，在最小和最大间隔之间调整下一次采集的等待时间：新闻多时
+缩短间隔，深夜等新闻少的时段拉长间隔；连续出错时按指数退避。
+"""
+
+import time
+import logging
+import datetime
+
+from run_ledger import iter_records, parse_time
+
+# 计算时段速率时，相邻两条记录间隔超过该秒数视为中断，不参与统计
+MAX_RECORD_GAP = 2 * 3600
+
+
+def hourly_rates(records, min_samples=3):
+    """从运行记录中统计每个小时的平均新增速率
+
+    参数:
+        records: 按时间顺序排列的运行记录
+        min_samples: 某个小时至少需要多少个样本
+
+    返回:
+        dict: {小时: 每分钟新增新闻数}
+    """
+    samples = {}
+    previous = None
+    for record in records:
+        try:
+            moment = parse_time(record["timestamp"])
+        except (KeyError, ValueError):
+            continue
+        if previous is not None:
+            gap = (moment - previous).total_seconds()
+            if 0 < gap <= MAX_RECORD_GAP and record.get("success", True):
+                rate = (record.get("new_news", 0) or 0) / (gap / 60)
+                samples.setdefault(moment.hour, []).append(rate)
+        previous = moment
+
+    return {
+        hour: sum(values) / len(values)
+        for hour, values in samples.items()
+        if len(values) >= min_samples
+    }
+
+
+class AdaptiveInterval:
+    """自适应采集间隔
+
+    用法:
+        scheduler = AdaptiveInterval.from_ledger(dirs["logs"] / "runs", base_interval=300)
+        ...  # 每个周期结束后
+        scheduler.observe(new_items=result["news_count"], success=result["success"])
+        await asyncio.sleep(scheduler.next_interval() - elapsed_time)
+    """
+
+    def __init__(self, base_interval=300, min_interval=60, max_interval=1800, target_new_items=10,
+                 smoothing=0.3, history_weight=0.5, error_backoff=2.0, hourly_profile=None, logger=None):
+        """初始化
+
+        参数:
+            base_interval: 没有任何观察数据时的间隔（秒）
+            min_interval: 最小间隔（秒）
+            max_interval: 最大间隔（秒）
+            target_new_items: 希望每个周期采集到的新新闻数，间隔按此换算
+            smoothing: 新增速率指数加权平均的系数，越大越看重最近的周期
+            history_weight: 时段速率在估计中所占的比重
+            error_backoff: 连续出错时的退避倍数
+            hourly_profile: 每个小时的平均新增速率（每分钟），见hourly_rates
+            logger: 日志记录器
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.target_new_items = target_new_items
+        self.smoothing = smoothing
+        self.history_weight = history_weight
+        self.error_backoff = error_backoff
+        self.hourly_profile = hourly_profile or {}
+        self.logger = logger or logging.getLogger("news_crawler")
+
+        self.rate = None
+        self.consecutive_errors = 0
+        self.interval = self.clamp(base_interval)
+        self._last_observed = None
+
+    @classmethod
+    def from_ledger(cls, directory, days=7, **kwargs):
+        """从最近几天的运行记录学习各时段的新增速率"""
+        start = datetime.datetime.now() - datetime.timedelta(days=days)
+        try:
+            profile = hourly_rates(iter_records(directory, start))
+        except OSError:
+            profile = {}
+        return cls(hourly_profile=profile, **kwargs)
+
+    def clamp(self, seconds):
+        return min(self.max_interval, max(self.min_interval, seconds))
+
+    def observe(self, new_items=None, success=True, elapsed=None):
+        """记录一个周期的结果
+
+        参数:
+            new_items: 本周期的新新闻数，为None时表示无法统计
+            success: 本周期是否成功
+            elapsed: 距上次采集开始的秒数，默认按两次observe之间的时间计算
+        """
+        now = time.monotonic()
+        if elapsed is None:
+            elapsed = now - self._last_observed if self._last_observed is not None else self.interval
+        self._last_observed = now
+
+        if not success:
+            self.consecutive_errors += 1
+            return
+        self.consecutive_errors = 0
+
+        if new_items is None or elapsed <= 0:
+            return
+        rate = new_items / (elapsed / 60)
+        if self.rate is None:
+            self.rate = rate
+        else:
+            self.rate = self.smoothing * rate + (1 - self.smoothing) * self.rate
+
+    def expected_rate(self, moment=None):
+        """估计当前的新增速率（每分钟），结合最近的观察和同一时段的历史"""
+        moment = moment or datetime.datetime.now()
+        history_rate = self.hourly_profile.get(moment.hour)
+        if self.rate is None:
+            return history_rate
+        if history_rate is None:
+            return self.rate
+        return self.history_weight * history_rate + (1 - self.history_weight) * self.rate
+
+    def next_interval(self, moment=None):
+        """下一次采集前应等待的间隔（秒），从本次采集开始时计算"""
+        if self.consecutive_errors:
+            # 出错后先尽快重试，持续出错时按指数退避
+            interval = self.min_interval * self.error_backoff ** self.consecutive_errors
+            reason = f"连续出错 {self.consecutive_errors} 次"
+        else:
+            rate = self.expected_rate(moment)
+            if rate is None:
+                interval = self.base_interval
+                reason = "没有观察数据"
+            elif rate <= 0:
+                interval = self.max_interval
+                reason = "没有新增新闻"
+            else:
+                interval = self.target_new_items / rate * 60
+                reason = f"新增速率 {rate:.2f} 条/分钟"
+
+        self.interval = self.clamp(interval)
+        self.logger.debug(f"自适应采集间隔: {self.interval:.0f} 秒（{reason}）")
+        return self.interval
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+接口捕获模式
+在DOM采集时记录页面加载的JSON响应，学习哪些接口返回新闻列表；
+之后的采集直接请求这些接口，无需启动浏览器。接口数据校验失败时由调用方回退到DOM采集。
+"""
+
+import json
+import time
+import asyncio
+import logging
+import urllib.parse
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+# 候选字段名
+TITLE_KEYS = ("title", "name", "headline", "text")
+LINK_KEYS = ("url", "link", "href", "mobileUrl", "mobile_url")
+SOURCE_KEYS = ("source", "author", "site", "publisher")
+TIME_KEYS = ("pubDate", "pub_time", "pubTime", "publishedAt", "time", "date", "created_at")
+SUMMARY_KEYS = ("summary", "description", "desc", "abstract")
+
+# 查找新闻列表时的最大嵌套深度
+MAX_DEPTH = 4
+
+
+def _first_key(item, keys):
+    """返回item中第一个存在且为非空字符串的字段名"""
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, str) and value.strip():
+            return key
+    return None
+
+
+def _find_lists(data, path=(), depth=0):
+    """遍历JSON结构，返回所有由字典组成的列表及其路径"""
+    if depth > MAX_DEPTH:
+        return
+    if isinstance(data, list):
+        if data and all(isinstance(item, dict) for item in data):
+            yield list(path), data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            yield from _find_lists(value, path + (key,), depth + 1)
+
+
+def _resolve_path(data, path):
+    """按路径取出JSON中的列表"""
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def infer_schema(items):
+    """推断新闻列表的字段映射，无法识别标题和链接时返回None"""
+    sample = items[:20]
+    schema = {}
+    for name, keys in (("title_key", TITLE_KEYS), ("link_key", LINK_KEYS),
+                       ("source_key", SOURCE_KEYS), ("time_key", TIME_KEYS),
+                       ("summary_key", SUMMARY_KEYS)):
+        found = [_first_key(item, keys) for item in sample]
+        found = [key for key in found if key]
+        # 多数条目都具备的字段才采用
+        if found and len(found) >= len(sample) / 2:
+            schema[name] = max(set(found), key=found.count)
+
+    if "title_key" not in schema or "link_key" not in schema:
+        return None
+    return schema
+
+
+def convert_items(items, schema, base_url=""):
+    """按字段映射把接口数据转换为与DOM提取脚本相同的格式
+
+    参数:
+        items: 接口返回的新闻列表
+        schema: 字段映射
+        base_url: 接口地址，相对链接按此补全为绝对地址（与页面中a.href一致），
+                  使两种采集方式生成相同的news_id
+    """
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        title = item.get(schema["title_key"])
+        link = item.get(schema["link_key"])
+        if not isinstance(title, str) or not title.strip():
+            continue
+        link = link.strip() if isinstance(link, str) else ""
+        results.append({
+            "title": title.strip(),
+            "link": urllib.parse.urljoin(base_url, link) if link else "",
+            "source": str(item.get(schema.get("source_key"), "") or ""),
+            "pubTime": str(item.get(schema.get("time_key"), "") or ""),
+            "summary": str(item.get(schema.get("summary_key"), "") or ""),
+        })
+    return results
+
+
+class ApiCapture:
+    """新闻接口的学习与直接请求
+
+    接口按目标页面分别保存，没有学习到接口的目标仍通过DOM采集。
+
+    用法:
+        responses = capture.attach(page)         # DOM采集前开始记录JSON响应
+        capture.learn(url, dom_items, responses) # DOM采集后根据标题匹配学习该目标的接口
+        items = await capture.fetch(url)         # 之后的周期直接请求该目标的接口
+    """
+
+    def __init__(self, store_path, logger=None, min_items=5, min_overlap=0.5, timeout=10000):
+        """初始化接口捕获
+
+        参数:
+            store_path: 已学习接口的保存路径（JSON文件）
+            logger: 日志记录器
+            min_items: 接口数据至少包含多少条新闻才视为有效
+            min_overlap: 接口标题与页面标题的最低重合比例
+            timeout: 单个接口请求的超时时间（毫秒）
+        """
+        self.store_path = Path(store_path)
+        self.logger = logger or logging.getLogger("news_crawler")
+        self.min_items = min_items
+        self.min_overlap = min_overlap
+        self.timeout = timeout
+
+        self.endpoints = self._load()
+        self._playwright = None
+        self._request = None
+
+    def _load(self):
+        """读取已学习的接口"""
+        if not self.store_path.exists():
+            return []
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                endpoints = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"读取接口配置失败: {str(e)}")
+            return []
+        # 旧版本保存的接口没有记录目标页面，无法确定替代哪个目标，丢弃后重新学习
+        return [endpoint for endpoint in endpoints if endpoint.get("target")]
+
+    def _save(self):
+        """保存已学习的接口"""
+        with open(self.store_path, "w", encoding="utf-8") as f:
+            json.dump(self.endpoints, f, ensure_ascii=False, indent=2)
+
+    def _target_endpoints(self, target):
+        """返回目标页面对应的接口"""
+        return [endpoint for endpoint in self.endpoints if endpoint["target"] == target]
+
+    def has_endpoints(self, target=None):
+        """是否已学习到可用接口
+
+        参数:
+            target: 目标页面URL，为空时判断是否有任意目标的接口
+        """
+        if target is None:
+            return bool(self.endpoints)
+        return bool(self._target_endpoints(target))
+
+    def invalidate(self, target):
+        """目标的接口失效，清空后由下一次DOM采集重新学习"""
+        self.logger.warning(f"{target} 的新闻接口已失效，将通过DOM采集重新学习")
+        self.endpoints = [endpoint for endpoint in self.endpoints if endpoint["target"] != target]
+        self._save()
+
+    def attach(self, page):
+        """开始记录页面的JSON响应
+
+        返回:
+            list: 该页面的响应记录，采集完成后传给learn()
+        """
+        responses = []
+
+        async def on_response(response):
+            try:
+                content_type = response.headers.get("content-type", "")
+                if response.request.method != "GET" or "json" not in content_type:
+                    return
+                responses.append((response.url, await response.json()))
+            except Exception:
+                pass
+
+        page.on("response", on_response)
+        return responses
+
+    def learn(self, target, dom_items, responses):
+        """根据DOM提取结果学习目标页面的新闻接口
+
+        参数:
+            target: 目标页面URL，学习到的接口替换该目标之前的接口
+            dom_items: DOM提取的新闻列表，用于判断接口数据是否就是页面上的新闻
+            responses: attach()返回的响应记录
+
+        返回:
+            int: 本次学习到的接口数量
+        """
+        dom_titles = {item["title"].strip() for item in dom_items if (item.get("title") or "").strip()}
+        endpoints = []
+
+        for url, data in responses:
+            for path, items in _find_lists(data):
+                schema = infer_schema(items)
+                if schema is None:
+                    continue
+                # 空标题包含在任何字符串中，不参与匹配
+                titles = [item.get(schema["title_key"]) for item in items]
+                titles = [title.strip() for title in titles if isinstance(title, str) and title.strip()]
+                if not titles:
+                    continue
+                # DOM标题可能带有序号前缀，按包含关系匹配
+                matched = sum(1 for title in titles if any(title in dom for dom in dom_titles))
+                if matched / len(items) >= self.min_overlap:
+                    endpoints.append({"target": target, "url": url, "path": path, **schema})
+                    break
+
+        if endpoints:
+            # 各目标的接口分别保存，同一目标以最新学习到的接口为准
+            self.endpoints = [endpoint for endpoint in self.endpoints if endpoint["target"] != target] + endpoints
+            self._save()
+            self.logger.info(f"{target} 学习到 {len(endpoints)} 个新闻接口，后续采集将直接请求接口")
+        return len(endpoints)
+
+    async def _ensure_client(self):
+        """创建可复用连接的HTTP请求上下文（不启动浏览器）"""
+        if self._request is None:
+            self._playwright = await async_playwright().start()
+            self._request = await self._playwright.request.new_context(
+                extra_http_headers={"Accept": "application/json"},
+                timeout=self.timeout,
+            )
+
+    async def _fetch_endpoint(self, endpoint):
+        """请求单个接口并按学习到的结构解析"""
+        response = await self._request.get(endpoint["url"])
+        if not response.ok:
+            raise ValueError(f"HTTP {response.status}")
+        items = _resolve_path(await response.json(), endpoint["path"])
+        if not isinstance(items, list):
+            raise ValueError("接口数据结构已变化")
+        return convert_items(items, endpoint, base_url=endpoint["url"])
+
+    async def fetch(self, target):
+        """直接请求目标页面已学习的接口
+
+        参数:
+            target: 目标页面URL
+
+        返回:
+            list: 新闻列表；没有该目标的接口、请求失败或数据校验不通过时返回None，
+                  调用方应对该目标回退到DOM采集
+        """
+        endpoints = self._target_endpoints(target)
+        if not endpoints:
+            return None
+
+        start_time = time.time()
+        try:
+            await self._ensure_client()
+            results = await asyncio.gather(
+                *(self._fetch_endpoint(endpoint) for endpoint in endpoints),
+                return_exceptions=True,
+            )
+        except Exception as e:
+            self.logger.warning(f"请求新闻接口失败: {str(e)}")
+            return None
+
+        news_data = []
+        seen_titles = set()
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"接口 {endpoint['url']} 请求失败: {str(result)}")
+                continue
+            for item in result:
+                if item["title"] not in seen_titles:
+                    seen_titles.add(item["title"])
+                    news_data.append(item)
+
+        # 校验数据，不通过时清空接口，回退到DOM采集
+        if len(news_data) < self.min_items:
+            self.invalidate(target)
+            return None
+
+        self.logger.info(f"{target} 通过接口获取 {len(news_data)} 条新闻，耗时: {time.time() - start_time:.2f} 秒")
+        return news_data
+
+    async def close(self):
+        """关闭HTTP请求上下文"""
+        if self._request is not None:
+            await self._request.dispose()
+            self._request = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
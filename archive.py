@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+每日数据归档
+把已结束日期的CSV/JSONL/Parquet数据压缩合并为按日期和来源分区的Parquet数据集，
+并提供只读取所需列和分区的查询函数（需要安装pyarrow）
+
+用法:
+    python archive.py compact                     # 归档所有已结束的日期
+    python archive.py query --start=2025-02-01 --columns=title,link
+"""
+
+import re
+import csv
+import json
+import argparse
+import datetime
+import logging
+from pathlib import Path
+
+from normalize import generate_news_id
+
+# 归档的数据集字段（date和source作为分区字段）
+ARCHIVE_FIELDS = [
+    "number", "original_number", "title", "link", "summary",
+    "pub_time", "collect_time", "news_id", "dataset",
+]
+
+# 数据文件名：<数据集>_<日期>[_<时间戳>].<扩展名>，Parquet输出是由分片文件组成的目录
+DATA_FILE_PATTERN = re.compile(
+    r"^(?P<dataset>[a-z_]*news)_(?P<date>\d{4}-\d{2}-\d{2})(?:_\d{8}_\d{6})?\.(?:csv|jsonl|parquet)$"
+)
+
+logger = logging.getLogger("news_crawler")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError("数据归档需要安装pyarrow: pip install pyarrow")
+
+
+def find_data_files(data_dir):
+    """按日期分组列出数据文件
+
+    返回:
+        dict: {日期: [(数据集名称, 文件路径), ...]}
+    """
+    files = {}
+    for path in sorted(Path(data_dir).iterdir()):
+        match = DATA_FILE_PATTERN.match(path.name)
+        if match:
+            files.setdefault(match.group("date"), []).append((match.group("dataset"), path))
+    return files
+
+
+def _read_rows(path):
+    """逐行读取CSV、JSONL数据文件或Parquet输出目录"""
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        # 正在写入的分片是预先创建的空文件，跳过
+        for part in sorted(path.glob("part-*.parquet")):
+            if part.stat().st_size > 0:
+                yield from pq.read_table(part).to_pylist()
+    elif path.suffix == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+def _normalize_row(row, dataset):
+    """统一各个爬虫脚本输出的字段"""
+    title = row.get("title") or ""
+    link = row.get("link") or ""
+    news_id = row.get("news_id") or generate_news_id(title, link)
+
+    record = {name: row.get(name) for name in ARCHIVE_FIELDS}
+    record["news_id"] = news_id
+    record["dataset"] = dataset
+    record["source"] = row.get("source") or "未知来源"
+    return {key: None if value is None else str(value) for key, value in record.items()}
+
+
+def _archive_schema():
+    import pyarrow as pa
+
+    # 哈希列和数据集名称重复值多，使用字典编码；来源作为分区字段，读取时同样按字典编码
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    fields = [(name, dictionary if name in ("news_id", "dataset") else pa.string())
+              for name in ARCHIVE_FIELDS]
+    fields.append(("source", pa.string()))
+    return pa.schema(fields)
+
+
+def compact_day(date_str, files, archive_dir):
+    """把一天的数据文件合并写入归档
+
+    参数:
+        date_str: 日期，YYYY-MM-DD
+        files: [(数据集名称, 文件路径), ...]
+        archive_dir: 归档目录
+
+    返回:
+        int: 归档的行数
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    rows = []
+    for dataset, path in files:
+        for row in _read_rows(path):
+            rows.append(_normalize_row(row, dataset))
+    if not rows:
+        return 0
+
+    schema = _archive_schema()
+    columns = {name: [row[name] for row in rows] for name in schema.names}
+    table = pa.Table.from_pydict(columns, schema=schema)
+    table = table.append_column("date", pa.array([date_str] * len(rows), pa.string()))
+
+    ds.write_dataset(
+        table,
+        str(archive_dir),
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([("date", pa.string()), ("source", pa.string())]), flavor="hive"
+        ),
+        existing_data_behavior="delete_matching",
+        basename_template=f"part-{date_str}-{{i}}.parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+    return len(rows)
+
+
+def compact_closed_days(data_dir, archive_dir, force=False):
+    """归档所有已结束且尚未归档的日期
+
+    参数:
+        data_dir: 数据目录
+        archive_dir: 归档目录
+        force: 是否重新归档已归档的日期
+
+    返回:
+        dict: {日期: 行数}
+    """
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    today = datetime.date.today().isoformat()
+
+    results = {}
+    for date_str, files in sorted(find_data_files(data_dir).items()):
+        if date_str >= today:
+            continue
+        if not force and (archive_dir / f"date={date_str}").exists():
+            continue
+        results[date_str] = compact_day(date_str, files, archive_dir)
+        logger.info(f"已归档 {date_str}: {results[date_str]} 条数据")
+    return results
+
+
+def query_archive(archive_dir, columns=None, start_date=None, end_date=None, sources=None):
+    """查询归档数据，只读取需要的列和分区
+
+    参数:
+        archive_dir: 归档目录
+        columns: 需要的列，默认全部
+        start_date: 开始日期（包含），YYYY-MM-DD
+        end_date: 结束日期（包含），YYYY-MM-DD
+        sources: 只读取这些来源
+
+    返回:
+        pyarrow.Table: 查询结果，可用to_pandas()转换为DataFrame
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        str(archive_dir),
+        format="parquet",
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+    )
+
+    # 日期和来源条件作用在分区上，不相关的文件不会被读取
+    conditions = []
+    if start_date:
+        conditions.append(ds.field("date") >= start_date)
+    if end_date:
+        conditions.append(ds.field("date") <= end_date)
+    if sources:
+        conditions.append(ds.field("source").isin(list(sources)))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="新闻数据归档")
+    parser.add_argument("command", choices=["compact", "query"], help="compact（归档）或query（查询）")
+    parser.add_argument("--data-dir", type=str, default="data", help="数据目录（默认：data）")
+    parser.add_argument("--archive-dir", type=str, default="data/archive", help="归档目录（默认：data/archive）")
+    parser.add_argument("--force", action="store_true", help="重新归档已归档的日期")
+    parser.add_argument("--start", type=str, help="查询开始日期，YYYY-MM-DD")
+    parser.add_argument("--end", type=str, help="查询结束日期，YYYY-MM-DD")
+    parser.add_argument("--columns", type=str, help="查询的列，逗号分隔")
+    parser.add_argument("--sources", type=str, help="查询的来源，逗号分隔")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "compact":
+        results = compact_closed_days(args.data_dir, args.archive_dir, force=args.force)
+        logger.info(f"归档完成，共 {len(results)} 天，{sum(results.values())} 条数据")
+    else:
+        table = query_archive(
+            args.archive_dir,
+            columns=args.columns.split(",") if args.columns else None,
+            start_date=args.start,
+            end_date=args.end,
+            sources=args.sources.split(",") if args.sources else None,
+        )
+        for row in table.to_pylist():
+            print(json.dumps(row, ensure_ascii=False))
+        logger.info(f"共 {table.num_rows} 条数据")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+端到端采集基准
+在本地启动内容固定的测试服务器（可配置响应延迟和卡片数量），不依赖网络，
+分别完整运行news_crawler.scrape_news和src/main.py中的NewsCrawler.run，
+统计启动、页面加载、滚动、提取、后处理和写入各阶段的耗时。
+结果输出为JSON，便于在不同提交之间比较性能变化。
+
+用法:
+    python benchmarks/bench_crawl.py
+    python benchmarks/bench_crawl.py --cards=50,200 --latency=0.2 --repeat=5 --json=bench_crawl.json
+    python benchmarks/bench_crawl.py --fixture-dir=html_cache   # 使用录制的页面
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+import functools
+import statistics
+import contextvars
+import subprocess
+import importlib.util
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+PHASES = ["launch", "goto", "scroll", "evaluate", "post_process", "write"]
+
+SOURCES = ["知乎", "微博", "百度", "今日头条", "B站", "华尔街见闻", "澎湃新闻", "36氪"]
+
+# 1x1透明PNG，作为卡片配图返回
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)
+
+
+# ---- 测试服务器 ----
+
+def render_cards(start, end, seed=42):
+    """生成第start到end-1条新闻卡片的HTML，内容只取决于序号"""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(end):
+        source = rng.choice(SOURCES)
+        minutes = rng.randint(1, 59)
+        if i < start:
+            continue
+        cards.append(
+            f'<div class="news-item card">'
+            f'<a href="/article/{i}"><h3 class="title">{i + 1}. 测试新闻标题 第{i}条</h3></a>'
+            f'<img src="/img/{i}.png" width="80" height="60">'
+            f'<span class="source">{source}</span>'
+            f'<time datetime="2025-01-01T{i % 24:02d}:{minutes:02d}:00">{minutes} 分钟前</time>'
+            f'<p class="summary">第{i}条新闻的摘要内容</p>'
+            f'</div>'
+        )
+    return "".join(cards)
+
+
+def render_page(cards, batch):
+    """生成新闻列表页面
+
+    首屏渲染batch条卡片，其余卡片在滚动到底部时分批追加，模拟无限滚动加载。
+    """
+    first = min(cards, batch)
+    rest = [render_cards(start, min(start + batch, cards)) for start in range(first, cards, batch)]
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>news fixture</title>
+<style>.news-item {{ height: 120px; border-bottom: 1px solid #ddd; }}</style></head>
+<body>
+<div class="news-list">{render_cards(0, first)}</div>
+<script>
+const pending = {json.dumps(rest, ensure_ascii=False)};
+window.addEventListener("scroll", () => {{
+    if (pending.length && window.innerHeight + window.scrollY >= document.body.scrollHeight - 10) {{
+        document.querySelector(".news-list").insertAdjacentHTML("beforeend", pending.shift());
+    }}
+}});
+</script>
+</body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """测试服务器请求处理
+
+    - /c/<分类>?cards=N&batch=B: 生成的新闻列表页面
+    - /fixture/<文件名>: 录制的页面（--fixture-dir中的HTML文件）
+    - /article/<序号>、/img/<序号>.png: 新闻链接和配图
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        # 固定延迟，模拟网络往返时间
+        if server.latency:
+            time.sleep(server.latency)
+
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/c/"):
+            query = parse_qs(parts.query)
+            cards = int(query.get("cards", [server.cards])[0])
+            batch = int(query.get("batch", [server.batch])[0])
+            self._send(200, render_page(cards, batch).encode("utf-8"), "text/html; charset=utf-8")
+        elif parts.path.startswith("/fixture/") and server.fixture_dir is not None:
+            path = server.fixture_dir / Path(parts.path).name
+            if path.is_file():
+                self._send(200, path.read_bytes(), "text/html; charset=utf-8")
+            else:
+                self._send(404, b"not found", "text/plain")
+        elif parts.path.startswith("/img/"):
+            self._send(200, PIXEL_PNG, "image/png")
+        elif parts.path.startswith("/article/"):
+            self._send(200, b"<html><body>article</body></html>", "text/html; charset=utf-8")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+
+class FixtureServer:
+    """在后台线程中运行的本地测试服务器"""
+
+    def __init__(self, latency=0.0, cards=100, batch=20, fixture_dir=None):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.cards = cards
+        self.httpd.batch = batch
+        self.httpd.fixture_dir = Path(fixture_dir) if fixture_dir else None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page_url(self, cards, batch):
+        return f"{self.base_url}/c/hottest?cards={cards}&batch={batch}"
+
+    def fixture_urls(self):
+        if self.httpd.fixture_dir is None:
+            return []
+        return [f"{self.base_url}/fixture/{path.name}" for path in sorted(self.httpd.fixture_dir.glob("*.html"))]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# ---- 阶段计时 ----
+
+class PhaseTimer:
+    """通过替换函数记录各阶段耗时
+
+    被替换的函数嵌套调用时：不透明阶段（如滚动）内部的调用不单独计时，
+    透明阶段（如后处理）内部的调用单独计时，并从外层阶段中扣除。
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self._stack = contextvars.ContextVar("phase_stack", default=())
+        self._patches = []
+
+    def reset(self):
+        self.totals = {}
+
+    def _record(self, phase, elapsed):
+        self.totals[phase] = self.totals.get(phase, 0.0) + elapsed
+
+    def _enter(self, phase, opaque):
+        stack = self._stack.get()
+        if stack and stack[-1][1]:
+            return None, None
+        frame = [phase, opaque, 0.0]
+        token = self._stack.set(stack + (frame,))
+        return frame, token
+
+    def _exit(self, frame, token, elapsed):
+        self._stack.reset(token)
+        self._record(frame[0], elapsed - frame[2])
+        stack = self._stack.get()
+        if stack:
+            stack[-1][2] += elapsed
+
+    def patch(self, owner, name, phase, opaque=True):
+        """替换owner上的函数或方法，调用时计入phase阶段"""
+        original = getattr(owner, name)
+        timer = self
+
+        if asyncio.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def wrapper(*args, **kwargs):
+                frame, token = timer._enter(phase, opaque)
+                if frame is None:
+                    return await original(*args, **kwargs)
+                start_time = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    timer._exit(frame, token, time.perf_counter() - start_time)
+        else:
+            @functools.wraps(original)
+            def wrapper(*args, **kwargs):
+                frame, token = timer._enter(phase, opaque)
+                if frame is None:
+                    return original(*args, **kwargs)
+                start_time = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    timer._exit(frame, token, time.perf_counter() - start_time)
+
+        # 类上继承来的方法恢复时直接删除替换的属性
+        inherited = isinstance(owner, type) and name not in owner.__dict__
+        self._patches.append((owner, name, None if inherited else owner.__dict__.get(name, original)))
+        setattr(owner, name, wrapper)
+
+    def restore(self):
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+
+
+# ---- 运行场景 ----
+
+def make_dirs(base):
+    """创建与news_crawler.create_dirs相同结构的临时目录"""
+    dirs = {name: Path(base) / name for name in ["data", "logs", "screenshots", "html_cache"]}
+    for path in dirs.values():
+        path.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
+def load_news_crawler_class():
+    """导入src/main.py中的NewsCrawler
+
+    src/selectors.py与标准库selectors同名，导入时临时替换，导入后恢复。
+    """
+    src_dir = ROOT / "src"
+    spec = importlib.util.spec_from_file_location("src_selectors", src_dir / "selectors.py")
+    src_selectors = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(src_selectors)
+
+    stdlib_selectors = sys.modules.get("selectors")
+    sys.modules["selectors"] = src_selectors
+    sys.path.insert(0, str(src_dir))
+    try:
+        import main as src_main
+    finally:
+        sys.path.remove(str(src_dir))
+        if stdlib_selectors is not None:
+            sys.modules["selectors"] = stdlib_selectors
+
+    # 基准运行时不写入项目的日志目录
+    src_main.logger.remove()
+    src_main.logger.add(sys.stderr, level="WARNING")
+    return src_main
+
+
+async def run_scrape_news(url, work_dir, pool=None, screenshot_enabled=False, save_html=False):
+    """运行一次news_crawler.scrape_news，返回 (新闻数, 总耗时)"""
+    import news_crawler
+
+    logger = logging.getLogger("bench_crawl")
+    dirs = make_dirs(work_dir)
+    start_time = time.perf_counter()
+    result = await news_crawler.scrape_news(
+        logger, dirs,
+        save_mode="single",
+        screenshot_enabled=screenshot_enabled,
+        save_html=save_html,
+        pool=pool,
+        urls=[url],
+        excel_enabled=False,
+    )
+    elapsed = time.perf_counter() - start_time
+    if not result.get("success"):
+        raise RuntimeError(f"scrape_news失败: {result.get('error', '没有数据')}")
+    return result["news_count"], elapsed
+
+
+async def run_news_crawler(src_main, url, work_dir):
+    """运行一次NewsCrawler.run，返回 (新闻数, 总耗时)"""
+    output_path = Path(work_dir) / "news_crawler.csv"
+    src_main.get_data_file_path = lambda date_str=None: output_path
+
+    crawler = src_main.NewsCrawler(url=url)
+    start_time = time.perf_counter()
+    await crawler.run()
+    elapsed = time.perf_counter() - start_time
+
+    news_count = 0
+    if output_path.exists():
+        with open(output_path, "r", encoding="utf-8") as f:
+            news_count = max(sum(1 for _ in f) - 1, 0)
+    if not news_count:
+        raise RuntimeError("NewsCrawler.run没有保存任何数据")
+    return news_count, elapsed
+
+
+def patch_scrape_news(timer):
+    """为scrape_news的各阶段安装计时"""
+    import news_crawler
+    import sinks
+    from playwright.async_api import Page
+
+    timer.patch(news_crawler.BrowserPool, "begin_cycle", "launch")
+    timer.patch(Page, "goto", "goto")
+    timer.patch(news_crawler, "scroll_until_stable", "scroll")
+    timer.patch(Page, "evaluate", "evaluate")
+    timer.patch(news_crawler, "normalize_items", "post_process")
+    for sink_class in sinks.SINK_CLASSES.values():
+        for name in ("open", "write_rows", "close"):
+            timer.patch(sink_class, name, "write")
+
+
+def patch_news_crawler(timer, src_main):
+    """为NewsCrawler.run的各阶段安装计时"""
+    from playwright.async_api import Page
+
+    crawler_class = src_main.NewsCrawler
+    timer.patch(crawler_class, "setup", "launch")
+    timer.patch(crawler_class, "navigate_to_page", "goto")
+    timer.patch(crawler_class, "scroll_to_bottom", "scroll")
+    # 提取方法中page.evaluate之外的部分计为后处理
+    timer.patch(crawler_class, "extract_news", "post_process", opaque=False)
+    timer.patch(Page, "evaluate", "evaluate")
+    timer.patch(crawler_class, "save_to_csv", "write")
+
+
+def summarize(runs):
+    """计算各指标的中位数"""
+    keys = sorted({key for run in runs for key in run if isinstance(run[key], (int, float))})
+    return {key: round(statistics.median(run.get(key, 0.0) for run in runs), 6) for key in keys}
+
+
+async def bench_scenario(name, urls, repeat, run_once, timer):
+    """对每个目标页面重复运行场景，返回结果列表"""
+    results = []
+    for label, url in urls:
+        runs = []
+        # 第一次运行作为预热，不计入结果
+        for i in range(repeat + 1):
+            timer.reset()
+            with tempfile.TemporaryDirectory() as work_dir:
+                news_count, elapsed = await run_once(url, work_dir)
+            if i == 0:
+                continue
+            run = {phase: round(timer.totals.get(phase, 0.0), 6) for phase in PHASES}
+            run["total"] = round(elapsed, 6)
+            run["other"] = round(max(elapsed - sum(timer.totals.values()), 0.0), 6)
+            run["news_count"] = news_count
+            runs.append(run)
+
+        median = summarize(runs)
+        results.append({"scenario": name, "page": label, "runs": runs, "median": median})
+        print(
+            f"{name:<22} {label:<24} 总计 {median['total'] * 1000:8.1f} ms | "
+            + " ".join(f"{phase} {median.get(phase, 0.0) * 1000:.1f}" for phase in PHASES)
+            + f" | {int(median['news_count'])} 条"
+        )
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+async def run_benchmarks(args):
+    from browser_pool import BrowserPool
+
+    logging.getLogger("bench_crawl").setLevel(logging.WARNING)
+    scenarios = args.scenarios.split(",")
+    results = []
+
+    with FixtureServer(latency=args.latency, batch=args.batch, fixture_dir=args.fixture_dir) as server:
+        if args.fixture_dir:
+            urls = [(Path(url).name, url) for url in server.fixture_urls()]
+            if not urls:
+                raise SystemExit(f"{args.fixture_dir} 中没有HTML文件")
+        else:
+            urls = [(f"cards={cards}", server.page_url(cards, args.batch))
+                    for cards in (int(c) for c in args.cards.split(","))]
+
+        if "scrape_news" in scenarios:
+            timer = PhaseTimer()
+            patch_scrape_news(timer)
+            try:
+                results += await bench_scenario(
+                    "scrape_news", urls, args.repeat,
+                    lambda url, work_dir: run_scrape_news(
+                        url, work_dir,
+                        screenshot_enabled=args.screenshot, save_html=args.save_html
+                    ),
+                    timer,
+                )
+
+                # 持续模式：浏览器池在多次采集之间复用
+                pool = BrowserPool(logger=logging.getLogger("bench_crawl"))
+                try:
+                    results += await bench_scenario(
+                        "scrape_news_warm_pool", urls, args.repeat,
+                        lambda url, work_dir: run_scrape_news(
+                            url, work_dir, pool=pool,
+                            screenshot_enabled=args.screenshot, save_html=args.save_html
+                        ),
+                        timer,
+                    )
+                finally:
+                    await pool.close()
+            finally:
+                timer.restore()
+
+        if "news_crawler" in scenarios:
+            src_main = load_news_crawler_class()
+            timer = PhaseTimer()
+            patch_news_crawler(timer, src_main)
+            try:
+                results += await bench_scenario(
+                    "news_crawler", urls, args.repeat,
+                    lambda url, work_dir: run_news_crawler(src_main, url, work_dir),
+                    timer,
+                )
+            finally:
+                timer.restore()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="端到端采集基准")
+    parser.add_argument("--cards", type=str, default="50,200", help="页面卡片数量，逗号分隔")
+    parser.add_argument("--batch", type=int, default=20, help="首屏和每次滚动加载的卡片数量")
+    parser.add_argument("--latency", type=float, default=0.05, help="每个请求的响应延迟（秒）")
+    parser.add_argument("--fixture-dir", type=str, help="使用目录中录制的HTML页面代替生成的页面")
+    parser.add_argument("--repeat", type=int, default=3, help="每个场景重复次数（另有一次预热），取中位数")
+    parser.add_argument("--scenarios", type=str, default="scrape_news,news_crawler",
+                        help="运行的场景，逗号分隔：scrape_news、news_crawler")
+    parser.add_argument("--screenshot", action="store_true", help="scrape_news保存页面截图")
+    parser.add_argument("--save-html", action="store_true", help="scrape_news保存HTML内容")
+    parser.add_argument("--json", type=str, help="结果输出的JSON文件路径")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args))
+
+    if args.json:
+        report = {
+            "benchmark": "crawl",
+            "commit": git_commit(),
+            "config": {
+                "latency": args.latency,
+                "batch": args.batch,
+                "repeat": args.repeat,
+                "fixture_dir": args.fixture_dir,
+                "screenshot": args.screenshot,
+                "save_html": args.save_html,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据标准化微基准
+对比逐条处理（原scrape_news中的循环）与normalize_items批量处理的耗时，
+数据规模为1千、1万、10万条
+
+用法:
+    python benchmarks/bench_normalize.py
+    python benchmarks/bench_normalize.py --sizes=1000,10000 --repeat=5 --json=bench_normalize.json
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from normalize import normalize_items
+
+
+# ---- 原实现（作为基准，与改动前的news_crawler保持一致） ----
+
+def legacy_clean_text(text):
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text.strip())
+    return text
+
+
+def legacy_extract_domain(url):
+    if not url:
+        return "未知来源"
+
+    try:
+        import urllib.parse
+        domain = urllib.parse.urlparse(url).netloc
+
+        parts = domain.split('.')
+        if len(parts) >= 2:
+            if parts[-2] in ['com', 'net', 'org', 'gov', 'edu'] and len(parts) > 2:
+                main_domain = parts[-3]
+            else:
+                main_domain = parts[-2]
+
+            domain_mapping = {
+                'zhihu': '知乎',
+                'weibo': '微博',
+                'baidu': '百度',
+                'douyin': '抖音',
+                'toutiao': '今日头条',
+                'bilibili': 'B站',
+                'wallstreetcn': '华尔街见闻',
+                'thepaper': '澎湃新闻',
+                'github': 'GitHub',
+                'coolapk': '酷安'
+            }
+
+            return domain_mapping.get(main_domain, domain)
+    except:
+        pass
+
+    return "未知来源"
+
+
+def legacy_generate_news_id(title, link):
+    if not title or not link:
+        return None
+    content = f"{title}{link}".encode("utf-8")
+    return hashlib.md5(content).hexdigest()
+
+
+def legacy_normalize(news_data, collect_time):
+    rows = []
+    for item in news_data:
+        title = legacy_clean_text(item['title'])
+        link = item['link']
+
+        match = re.match(r'^(\d+)[.、\s]*(.+)$', title)
+        if match:
+            original_number = match.group(1)
+            cleaned_title = legacy_clean_text(match.group(2))
+        else:
+            original_number = ""
+            cleaned_title = title
+
+        source = legacy_clean_text(item['source'])
+        if not source:
+            source = legacy_extract_domain(link)
+
+        rows.append({
+            'number': None,
+            'original_number': original_number,
+            'title': cleaned_title,
+            'source': source,
+            'link': link,
+            'summary': legacy_clean_text(item.get('summary', '')),
+            'pub_time': legacy_clean_text(item.get('pubTime', '')),
+            'collect_time': collect_time,
+            'news_id': legacy_generate_news_id(cleaned_title, link)
+        })
+    return rows
+
+
+# ---- 测试数据 ----
+
+DOMAINS = [
+    "www.zhihu.com", "s.weibo.com", "www.baidu.com", "www.douyin.com", "www.toutiao.com",
+    "www.bilibili.com", "wallstreetcn.com", "www.thepaper.cn", "github.com", "www.coolapk.com",
+    "news.sina.com.cn", "www.ithome.com", "36kr.com", "www.cls.cn", "xueqiu.com",
+]
+
+
+def make_items(count, seed=42):
+    """生成模拟的页面提取结果"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        domain = rng.choice(DOMAINS)
+        prefix = f"{rng.randint(1, 50)}. " if rng.random() < 0.6 else ""
+        items.append({
+            "title": f"  {prefix}热点新闻 标题\n 第{i}条  {rng.random():.6f} ",
+            "link": f"https://{domain}/article/{i}?from=newsnow",
+            # 大部分卡片没有来源，需要从链接识别
+            "source": "" if rng.random() < 0.8 else " 来源\t名称 ",
+            "pubTime": "3 分钟前" if rng.random() < 0.5 else "",
+            "summary": "摘要  内容\n第二行" if rng.random() < 0.3 else "",
+        })
+    return items
+
+
+def best_time(func, items, repeat):
+    """多次运行取最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func(items, "2025-01-01 00:00:00")
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据标准化微基准")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000", help="数据规模，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=3, help="每个规模重复次数，取最短耗时")
+    parser.add_argument("--json", type=str, help="结果输出的JSON文件路径")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        items = make_items(size)
+
+        # 两种实现的结果必须完全一致
+        assert legacy_normalize(items, "t") == normalize_items(items, "t"), "标准化结果不一致"
+
+        legacy = best_time(legacy_normalize, items, args.repeat)
+        batch = best_time(normalize_items, items, args.repeat)
+        results.append({
+            "size": size,
+            "legacy_seconds": round(legacy, 6),
+            "batch_seconds": round(batch, 6),
+            "speedup": round(legacy / batch, 2) if batch else None,
+        })
+        print(f"{size:>8} 条: 逐条 {legacy * 1000:9.2f} ms, 批量 {batch * 1000:9.2f} ms, 提升 {legacy / batch:.2f} 倍")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "normalize", "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
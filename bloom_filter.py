@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+按天滚动的布隆过滤器
+保存最近N天出现过的news_id，用固定内存快速判断"一定是新新闻"，
+只有可能重复的新闻才需要查询精确索引
+"""
+
+import math
+import struct
+import hashlib
+import datetime
+import logging
+from pathlib import Path
+
+# 文件头：位数、哈希函数个数、已添加元素数
+HEADER_FORMAT = "<QII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+class BloomFilter:
+    """固定大小的布隆过滤器"""
+
+    def __init__(self, capacity=50000, error_rate=0.001, num_bits=None, num_hashes=None):
+        """初始化布隆过滤器
+
+        参数:
+            capacity: 预计元素数量
+            error_rate: 期望的误判率
+            num_bits: 位数组大小，从文件加载时使用
+            num_hashes: 哈希函数个数，从文件加载时使用
+        """
+        if num_bits is None:
+            num_bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        if num_hashes is None:
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = 0
+        self.bits = bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key):
+        """双重哈希计算key对应的位"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def estimated_fpr(self):
+        """根据已添加元素数估算当前误判率"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(struct.pack(HEADER_FORMAT, self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            num_bits, num_hashes, count = struct.unpack(HEADER_FORMAT, f.read(HEADER_SIZE))
+            bloom = cls(num_bits=num_bits, num_hashes=num_hashes)
+            bloom.count = count
+            bloom.bits = bytearray(f.read())
+        return bloom
+
+
+class RollingBloomFilter:
+    """最近N天的布隆过滤器，每天一个文件，过期的文件自动删除
+
+    过滤器只能回答"一定是新的"或"可能重复"；可能重复的ID由调用方查询精确索引后，
+    通过record_lookup()回报误判数量，用于统计实际误判率。
+    """
+
+    def __init__(self, directory, days=7, capacity_per_day=50000, error_rate=0.001, logger=None):
+        """初始化滚动布隆过滤器
+
+        参数:
+            directory: 过滤器文件保存目录
+            days: 时间窗口（天）
+            capacity_per_day: 每天的预计新闻数量
+            error_rate: 每天过滤器的期望误判率
+            logger: 日志记录器
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.days = days
+        self.capacity_per_day = capacity_per_day
+        self.error_rate = error_rate
+        self.logger = logger or logging.getLogger("news_crawler")
+
+        self.filters = {}
+        # 自上次保存以来有变化的日期，只重写这些文件
+        self.dirty = set()
+        self.true_negatives = 0
+        self.false_positives = 0
+        self._load()
+
+    def _path(self, date_str):
+        return self.directory / f"bloom_{date_str}.bin"
+
+    def _window(self):
+        """时间窗口内的日期，从今天开始"""
+        today = datetime.date.today()
+        return [(today - datetime.timedelta(days=i)).isoformat() for i in range(self.days)]
+
+    def _load(self):
+        """加载窗口内的过滤器，删除过期文件"""
+        window = set(self._window())
+        for path in self.directory.glob("bloom_*.bin"):
+            date_str = path.stem[len("bloom_"):]
+            if date_str not in window:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                continue
+            try:
+                self.filters[date_str] = BloomFilter.load(path)
+            except Exception as e:
+                self.logger.warning(f"读取布隆过滤器失败: {path}, {str(e)}")
+
+    def _today(self):
+        """今天的过滤器，跨天时滚动窗口"""
+        today = datetime.date.today().isoformat()
+        if today not in self.filters:
+            window = set(self._window())
+            for date_str in list(self.filters):
+                if date_str not in window:
+                    del self.filters[date_str]
+                    try:
+                        self._path(date_str).unlink()
+                    except OSError:
+                        pass
+            self.filters[today] = BloomFilter(self.capacity_per_day, self.error_rate)
+            self.dirty.add(today)
+        return self.filters[today]
+
+    def is_empty(self):
+        return not any(bloom.count for bloom in self.filters.values())
+
+    def might_contain(self, news_id):
+        """False表示一定是新的，True表示可能重复"""
+        return any(news_id in bloom for bloom in self.filters.values())
+
+    def split(self, news_ids):
+        """把ID分为一定是新的和可能重复的两组"""
+        new_ids, maybe_ids = [], []
+        for news_id in news_ids:
+            (maybe_ids if self.might_contain(news_id) else new_ids).append(news_id)
+        return new_ids, maybe_ids
+
+    def add(self, news_ids):
+        """把ID加入今天的过滤器，返回新加入的ID数量
+
+        今天已经加入过的ID（每个周期都出现的热点）不再计入count，避免误判率估算持续偏高
+        """
+        bloom = self._today()
+        added = 0
+        for news_id in news_ids:
+            if news_id and news_id not in bloom:
+                bloom.add(news_id)
+                added += 1
+        if added:
+            self.dirty.add(datetime.date.today().isoformat())
+        return added
+
+    def seed(self, news_ids):
+        """补充窗口内所有过滤器中都没有的ID（如中途退出前已写入索引、但过滤器未保存的ID），
+        返回补充的数量"""
+        return self.add(news_id for news_id in news_ids if news_id and not self.might_contain(news_id))
+
+    def record_lookup(self, definitely_new, false_positives):
+        """记录一次查询结果，用于统计实际误判率
+
+        参数:
+            definitely_new: 过滤器判定为一定是新的ID数量
+            false_positives: 过滤器判定可能重复、但精确索引中不存在的ID数量
+        """
+        self.true_negatives += definitely_new
+        self.false_positives += false_positives
+
+    def save(self):
+        """只保存有变化的过滤器（通常只有今天的）"""
+        for date_str in self.dirty:
+            if date_str in self.filters:
+                self.filters[date_str].save(self._path(date_str))
+        self.dirty.clear()
+
+    def stats(self):
+        """误判率统计"""
+        estimated = 1 - math.prod(1 - bloom.estimated_fpr() for bloom in self.filters.values())
+        checked = self.true_negatives + self.false_positives
+        return {
+            "bloom_days": len(self.filters),
+            "bloom_items": sum(bloom.count for bloom in self.filters.values()),
+            "bloom_estimated_fpr": round(estimated, 6),
+            "bloom_observed_fpr": round(self.false_positives / checked, 6) if checked else 0.0,
+            "bloom_false_positives": self.false_positives,
+        }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+浏览器池
+在多个采集周期之间复用同一个Chromium实例，按需借出页面
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+try:
+    import psutil
+except ImportError:  # psutil为可选依赖，缺失时不做内存检查
+    psutil = None
+
+# 识别浏览器子进程的名称关键字
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+class BrowserPool:
+    """长期存活的浏览器/上下文池
+
+    - 每个采集周期开始时检查浏览器健康状态，崩溃后自动重新启动
+    - 达到最大周期数或内存上限后回收（重启）浏览器
+    - 记录每次启动耗时，便于与采集耗时分开统计
+    """
+
+    def __init__(self, logger=None, headless=True, viewport=None,
+                 max_pages=4, recycle_cycles=50, max_memory_mb=1024, request_filter=None):
+        """初始化浏览器池
+
+        参数:
+            logger: 日志记录器
+            headless: 是否以无头模式启动浏览器
+            viewport: 页面视口大小
+            max_pages: 同时借出的最大页面数
+            recycle_cycles: 浏览器运行多少个周期后回收，0表示不按周期回收
+            max_memory_mb: 浏览器进程内存上限（MB），0表示不按内存回收
+            request_filter: 请求过滤器（RequestFilter），安装在浏览器上下文上
+        """
+        self.logger = logger or logging.getLogger("news_crawler")
+        self.headless = headless
+        self.viewport = viewport or {"width": 1920, "height": 1080}
+        self.recycle_cycles = recycle_cycles
+        self.max_memory_mb = max_memory_mb
+        self.request_filter = request_filter
+
+        self._playwright = None
+        self.browser = None
+        self.context = None
+
+        self._lock = asyncio.Lock()
+        self._page_slots = asyncio.Semaphore(max_pages)
+
+        # 统计信息
+        self.cycles_since_launch = 0
+        self.launch_count = 0
+        self.last_launch_time = 0.0
+
+    def is_healthy(self):
+        """浏览器是否可用"""
+        return (
+            self.browser is not None
+            and self.context is not None
+            and self.browser.is_connected()
+        )
+
+    def browser_memory_mb(self):
+        """统计浏览器相关子进程的常驻内存（MB），无法统计时返回None"""
+        if psutil is None:
+            return None
+
+        total = 0
+        try:
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    name = child.name().lower()
+                    if any(key in name for key in BROWSER_PROCESS_NAMES):
+                        total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except Exception:
+            return None
+
+        return total / (1024 * 1024)
+
+    def _recycle_reason(self):
+        """判断是否需要回收浏览器，返回原因，无需回收时返回None"""
+        if self.recycle_cycles and self.cycles_since_launch >= self.recycle_cycles:
+            return f"已运行 {self.cycles_since_launch} 个周期"
+
+        if self.max_memory_mb:
+            memory_mb = self.browser_memory_mb()
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                return f"内存占用 {memory_mb:.0f}MB 超过上限 {self.max_memory_mb}MB"
+
+        return None
+
+    async def _launch(self):
+        """启动浏览器和上下文，返回启动耗时（秒）"""
+        start_time = time.time()
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        self.browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.context = await self.browser.new_context(viewport=self.viewport)
+        if self.request_filter is not None:
+            await self.context.route("**/*", self.request_filter.handle)
+
+        self.cycles_since_launch = 0
+        self.launch_count += 1
+        self.last_launch_time = time.time() - start_time
+        self.logger.info(f"浏览器已启动（第 {self.launch_count} 次），耗时: {self.last_launch_time:.2f} 秒")
+        return self.last_launch_time
+
+    async def _close_browser(self):
+        """关闭当前浏览器，忽略已崩溃浏览器的关闭错误"""
+        if self.context is not None:
+            try:
+                await self.context.close()
+            except Exception:
+                pass
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+        self.context = None
+        self.browser = None
+
+    async def _ensure_browser(self):
+        """确保浏览器可用，必要时重新启动，返回本次启动耗时"""
+        if self.is_healthy():
+            return 0.0
+
+        if self.browser is not None:
+            self.logger.warning("检测到浏览器已断开，正在重新启动")
+            await self._close_browser()
+
+        return await self._launch()
+
+    async def begin_cycle(self):
+        """开始一个采集周期：健康检查、按需回收，返回本周期的启动耗时（秒）"""
+        async with self._lock:
+            launch_time = 0.0
+
+            if self.is_healthy():
+                reason = self._recycle_reason()
+                if reason:
+                    self.logger.info(f"回收浏览器: {reason}")
+                    await self._close_browser()
+
+            launch_time += await self._ensure_browser()
+            self.cycles_since_launch += 1
+            return launch_time
+
+    @asynccontextmanager
+    async def page(self):
+        """借出一个页面，使用完毕后自动关闭
+
+        用法:
+            async with pool.page() as page:
+                await page.goto(url)
+        """
+        async with self._page_slots:
+            async with self._lock:
+                await self._ensure_browser()
+                page = await self.context.new_page()
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    async def recycle(self):
+        """立即回收浏览器（如采集超时后），下次借出页面时重新启动"""
+        async with self._lock:
+            self.logger.info("回收浏览器")
+            await self._close_browser()
+
+    def stats(self):
+        """返回浏览器池统计信息"""
+        return {
+            "launch_count": self.launch_count,
+            "last_launch_time": round(self.last_launch_time, 3),
+            "cycles_since_launch": self.cycles_since_launch,
+            "browser_memory_mb": self.browser_memory_mb(),
+        }
+
+    async def close(self):
+        """关闭浏览器和Playwright"""
+        async with self._lock:
+            await self._close_browser()
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+        self.logger.info("浏览器已关闭")
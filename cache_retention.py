@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缓存文件保留策略
+每个目录只用os.scandir遍历一次，用堆选出最新的N个文件，再按保留天数和
+字节上限决定删除哪些文件；可以在后台线程中执行，不阻塞采集周期。
+子目录（如logs/runs）不会被清理。
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+
+
+def parse_budgets(values):
+    """解析目录预算，格式为 目录名=最大文件数[:最大MB]，如 screenshots=200:500
+
+    返回:
+        dict: {目录名: (最大文件数, 最大字节数)}，0表示不限制
+    """
+    budgets = {}
+    for value in values or []:
+        name, _, spec = value.partition("=")
+        files, _, megabytes = spec.partition(":")
+        budgets[name.strip()] = (int(files or 0), int(float(megabytes or 0) * 1024 * 1024))
+    return budgets
+
+
+def scan_files(directory):
+    """遍历目录中的普通文件，每个文件只stat一次
+
+    返回:
+        list: [(修改时间, 大小, 路径), ...]
+    """
+    entries = []
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                # 遍历过程中被删除的文件
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def select_deletions(entries, max_files=0, max_bytes=0, cutoff=None):
+    """选出需要删除的文件
+
+    只保留同时满足以下条件的文件：属于最新的max_files个、修改时间晚于cutoff、
+    从最新的文件开始累计大小不超过max_bytes。
+
+    参数:
+        entries: scan_files的结果
+        max_files: 最多保留的文件数，0表示不限制
+        max_bytes: 最多保留的总字节数，0表示不限制
+        cutoff: 修改时间早于该时间戳的文件删除，None表示不按时间删除
+
+    返回:
+        list: 需要删除的 (修改时间, 大小, 路径)
+    """
+    if max_files and len(entries) > max_files:
+        # 堆选出最新的N个文件，O(n log N)
+        newest = heapq.nlargest(max_files, entries)
+    else:
+        newest = sorted(entries, reverse=True)
+
+    keep = set()
+    kept_bytes = 0
+    for mtime, size, path in newest:
+        if cutoff is not None and mtime < cutoff:
+            # 按时间从新到旧排列，后面的文件同样过期
+            break
+        if max_bytes and kept_bytes + size > max_bytes:
+            break
+        kept_bytes += size
+        keep.add(path)
+
+    return [entry for entry in entries if entry[2] not in keep]
+
+
+def apply_retention(directory, max_files=0, max_bytes=0, keep_days=0, logger=None):
+    """按预算清理一个目录
+
+    参数:
+        directory: 目录路径
+        max_files: 最多保留的文件数，0表示不限制
+        max_bytes: 最多保留的总字节数，0表示不限制
+        keep_days: 保留多少天以内的文件，0表示不按时间删除
+        logger: 日志记录器
+
+    返回:
+        tuple: (删除的文件数, 释放的字节数)
+    """
+    logger = logger or logging.getLogger("news_crawler")
+    cutoff = time.time() - keep_days * 86400 if keep_days else None
+
+    try:
+        entries = scan_files(directory)
+    except FileNotFoundError:
+        return 0, 0
+
+    deleted_count = 0
+    freed_bytes = 0
+    for _, size, path in select_deletions(entries, max_files, max_bytes, cutoff):
+        try:
+            os.remove(path)
+            deleted_count += 1
+            freed_bytes += size
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"删除文件出错: {path}, {str(e)}")
+
+    return deleted_count, freed_bytes
+
+
+class BackgroundCleaner:
+    """在后台线程中执行清理，上一次清理未结束时跳过本次"""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger("news_crawler")
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, func, *args, **kwargs):
+        """启动后台清理，返回是否已启动"""
+        if self.is_running():
+            self.logger.info("上一次缓存清理尚未完成，跳过本次清理")
+            return False
+
+        def run():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                self.logger.warning(f"后台清理缓存失败: {str(e)}")
+
+        self._thread = threading.Thread(target=run, name="cache-cleanup", daemon=True)
+        self._thread.start()
+        return True
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
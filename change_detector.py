@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+热榜变化检测
+在页面内对有序的标题/链接列表计算指纹，与上一周期比较：指纹相同时跳过提取、
+后处理和写入；指纹变化时只处理上一周期没有出现过的新闻。
+检测状态在写入成功后才提交，写入失败的周期下次会重新处理。
+"""
+
+import hashlib
+
+# 在页面内计算卡片标题和链接的FNV-1a指纹，只返回指纹和数量，不传输新闻内容；
+# 卡片选择器与EXTRACT_NEWS_SCRIPT一致，找不到卡片时返回null（按有变化处理）
+FINGERPRINT_SCRIPT = """
+    () => {
+        const cards = document.querySelectorAll('.card, .article-card, .news-card, article, .item');
+        if (cards.length === 0) return null;
+
+        let hash = 0x811c9dc5;
+        let count = 0;
+        for (const card of cards) {
+            const titleElement = card.querySelector('h2, h3, h4, .title, [class*="title"], a');
+            const title = titleElement ? titleElement.textContent.trim() : '';
+            if (!title) continue;
+            const linkElement = card.querySelector('a');
+            const key = title + '\\u0001' + (linkElement && linkElement.href ? linkElement.href : '') + '\\u0002';
+            for (let i = 0; i < key.length; i++) {
+                hash ^= key.charCodeAt(i);
+                hash = Math.imul(hash, 0x01000193) >>> 0;
+            }
+            count++;
+        }
+        return {fingerprint: hash.toString(16) + ':' + count, count: count};
+    }
+"""
+
+
+def item_key(item):
+    """新闻在变化检测中的标记：标题和链接"""
+    return (item.get("title") or "", item.get("link") or "")
+
+
+def fingerprint_items(items):
+    """对有序的标题/链接列表计算指纹（用于接口返回的数据）"""
+    digest = hashlib.sha1()
+    for title, link in map(item_key, items):
+        digest.update(f"{title}\x01{link}\x02".encode("utf-8"))
+    return f"{digest.hexdigest()}:{len(items)}"
+
+
+class ChangeDetector:
+    """按目标记录上一周期的指纹和新闻列表
+
+    用法:
+        detector.begin_cycle()
+        if detector.check(url, fingerprint):  # 指纹未变化
+            ...
+        changed_items = detector.diff(url, news_data)
+        ...  # 写入成功后
+        detector.commit()
+    """
+
+    def __init__(self):
+        self._fingerprints = {}
+        self._seen = {}
+        self._pending_fingerprints = {}
+        self._pending_seen = {}
+        self.unchanged = set()
+
+    def begin_cycle(self):
+        """开始新的周期，丢弃上一周期未提交的状态"""
+        self._pending_fingerprints.clear()
+        self._pending_seen.clear()
+        self.unchanged = set()
+
+    def check(self, key, fingerprint):
+        """比较指纹，返回是否与上一周期相同
+
+        参数:
+            key: 目标标记，通常为URL
+            fingerprint: 本周期的指纹，为空时视为有变化
+        """
+        if fingerprint is None:
+            return False
+        if self._fingerprints.get(key) == fingerprint:
+            self.unchanged.add(key)
+            return True
+        self._pending_fingerprints[key] = fingerprint
+        return False
+
+    def diff(self, key, items):
+        """返回上一周期没有出现过的新闻，保持原有顺序"""
+        keys = [item_key(item) for item in items]
+        self._pending_seen[key] = set(keys)
+        previous = self._seen.get(key)
+        if not previous:
+            return list(items)
+        return [item for item, k in zip(items, keys) if k not in previous]
+
+    def commit(self):
+        """本周期的数据写入成功后提交检测状态"""
+        # 只提交已经处理过新闻列表的目标，计算指纹后采集失败的目标下次重新采集
+        for key, seen in self._pending_seen.items():
+            self._seen[key] = seen
+            if key in self._pending_fingerprints:
+                self._fingerprints[key] = self._pending_fingerprints[key]
+        self._pending_fingerprints.clear()
+        self._pending_seen.clear()
+
+    def reset(self):
+        """清空所有状态，下一周期完整处理"""
+        self._fingerprints.clear()
+        self._seen.clear()
+        self.begin_cycle()
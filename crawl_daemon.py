@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+采集守护进程
+在同一个进程和事件循环中按时钟对齐的时间点运行采集任务，代替每个周期用subprocess启动
+新的Python解释器：爬虫模块只导入一次，日志直接写入守护进程的日志处理器，
+每次运行有超时限制（超时后取消任务），news_crawler任务的浏览器、去重索引、
+变化检测和运行记录在各次运行之间保持。
+
+用法:
+    python crawl_daemon.py                                    # news_crawler，每5分钟一次
+    python crawl_daemon.py --job=optimized_scraper --interval=5 --timeout=4
+    python crawl_daemon.py --adaptive-interval --max-runs=10
+    python crawl_daemon.py --job=final_scraper --tick-policy=catch-up --max-concurrent-runs=2 --jitter=15
+"""
+
+import signal
+import asyncio
+import logging
+import datetime
+import argparse
+import importlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+
+from adaptive_interval import AdaptiveInterval
+from tick_scheduler import TickScheduler, TICK_POLICIES
+
+# 可运行的任务：模块名和入口函数，news_crawler单独处理以保持浏览器等状态
+SCRAPER_ENTRY_POINTS = {
+    "optimized_scraper": "scrape_news",
+    "final_scraper": "run_scraper",
+    "simple_scraper": "run_scraper",
+}
+JOB_NAMES = ["news_crawler"] + list(SCRAPER_ENTRY_POINTS)
+
+
+def setup_logger(log_file="scheduler.log"):
+    """把日志处理器安装在根记录器上，爬虫模块的日志都直接写入守护进程的日志"""
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    if not root.handlers:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        console_handler = logging.StreamHandler()
+        file_handler = RotatingFileHandler(
+            log_dir / log_file, maxBytes=10*1024*1024, backupCount=5, encoding="utf-8"
+        )
+        for handler in (console_handler, file_handler):
+            handler.setFormatter(formatter)
+            root.addHandler(handler)
+
+    return logging.getLogger("scheduler")
+
+
+class ScraperJob:
+    """运行爬虫模块的入口函数，模块只导入一次
+
+    异步入口函数作为任务运行，超时后可以取消；同步入口函数在单独的线程中运行，
+    超时后无法中断，下一次运行会等待它结束。
+    """
+
+    # 入口函数返回的是采集总数，不是新增数
+    reports_new_items = False
+
+    def __init__(self, module_name, func_name, logger=None):
+        self.name = module_name
+        self.logger = logger or logging.getLogger("scheduler")
+        self.func = getattr(importlib.import_module(module_name), func_name)
+        self.is_async = asyncio.iscoroutinefunction(self.func)
+        # 同步入口函数在同一个线程中依次运行，不能并发
+        self.concurrent_safe = self.is_async
+        self._executor = None if self.is_async else ThreadPoolExecutor(max_workers=1, thread_name_prefix=module_name)
+
+    async def run(self):
+        """运行一次，返回采集结果"""
+        if self.is_async:
+            news_count = await self.func()
+        else:
+            news_count = await asyncio.get_running_loop().run_in_executor(self._executor, self.func)
+
+        # 没有抛出异常就视为成功；没有采集到新闻的周期不算出错，否则安静时段反而会频繁重试
+        return {
+            "success": True,
+            "news_count": news_count or 0,
+        }
+
+    async def recover(self):
+        """超时后的处理，独立运行的爬虫每次都重新启动浏览器，无需处理"""
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+class NewsCrawlerJob:
+    """news_crawler的持续采集任务，浏览器池、去重索引、变化检测、截图策略、
+    运行记录、HTML快照和后处理阶段在各次运行之间保持"""
+
+    name = "news_crawler"
+    reports_new_items = True
+    # 各次运行共享浏览器池、去重索引和变化检测状态，不能同时运行
+    concurrent_safe = False
+
+    def __init__(self, logger=None, output_format="csv", concurrency=4, save_html=True, post_workers=2):
+        """初始化
+
+        参数:
+            logger: 日志记录器
+            output_format: 输出格式，csv、jsonl或parquet
+            concurrency: 同时采集的最大页面数
+            save_html: 是否保存HTML快照
+            post_workers: 后处理的工作进程/线程数，0表示在事件循环中直接处理
+        """
+        self.crawler = importlib.import_module("news_crawler")
+        self.logger = logger or logging.getLogger("news_crawler")
+        self.dirs = self.crawler.create_dirs()
+        self.output_format = output_format
+        self.concurrency = concurrency
+
+        self.pool = self.crawler.BrowserPool(
+            logger=self.logger, max_pages=concurrency, request_filter=self.crawler.RequestFilter()
+        )
+        self.ledger = self.crawler.RunLedger(self.dirs["logs"] / "runs")
+        self.change_detector = self.crawler.ChangeDetector()
+        self.screenshot_policy = self.crawler.ScreenshotPolicy(
+            mode="on-anomaly", image_format="jpeg", clip_selector=self.crawler.CARD_SELECTOR, logger=self.logger
+        )
+        self.snapshot_store = self.crawler.SnapshotStore(
+            self.dirs["html_cache"] / "snapshots", logger=self.logger
+        ) if save_html else None
+        self.pipeline = self.crawler.PostProcessPipeline(
+            workers=post_workers, logger=self.logger
+        ) if post_workers > 0 else None
+        self.news_index = None
+
+    def output_path(self):
+        """每天使用新的输出文件"""
+        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        suffix = self.crawler.FORMAT_SUFFIXES[self.output_format]
+        return self.dirs["data"] / f"continuous_news_{current_date}{suffix}"
+
+    def _open_index(self, output_path):
+        """输出文件变化时切换去重索引"""
+        if self.news_index is not None and self.news_index.csv_path == output_path:
+            return
+        if self.news_index is not None:
+            self.news_index.close()
+            # 新的输出文件需要完整写入当前热榜
+            self.change_detector.reset()
+        self.news_index = self.crawler.NewsIndex(output_path, logger=self.logger)
+
+    async def run(self):
+        """运行一次采集，返回scrape_news的结果"""
+        output_path = self.output_path()
+        self._open_index(output_path)
+        return await self.crawler.scrape_news(
+            logger=self.logger,
+            dirs=self.dirs,
+            save_mode="continuous",
+            output_file=str(output_path),
+            screenshot_policy=self.screenshot_policy,
+            save_html=self.snapshot_store is not None,
+            pool=self.pool,
+            concurrency=self.concurrency,
+            output_format=self.output_format,
+            ledger=self.ledger,
+            snapshot_store=self.snapshot_store,
+            change_detector=self.change_detector,
+            news_index=self.news_index,
+            pipeline=self.pipeline
+        )
+
+    async def recover(self):
+        """超时后回收浏览器，避免卡住的页面影响下一次运行"""
+        await self.pool.recycle()
+
+    async def close(self):
+        await self.pool.close()
+        if self.pipeline is not None:
+            await self.pipeline.close()
+        self.ledger.close()
+        if self.snapshot_store is not None:
+            self.snapshot_store.close()
+        if self.news_index is not None:
+            self.news_index.close()
+
+
+def create_job(name, logger=None, **kwargs):
+    """根据名称创建任务"""
+    if name == "news_crawler":
+        return NewsCrawlerJob(logger=logging.getLogger("news_crawler"), **kwargs)
+    if name not in SCRAPER_ENTRY_POINTS:
+        raise ValueError(f"不支持的任务: {name}")
+    return ScraperJob(name, SCRAPER_ENTRY_POINTS[name], logger=logger)
+
+
+def build_adaptive_interval(job_name, base_interval, logger=None):
+    """创建自适应采集间隔
+
+    只有news_crawler写入logs/runs下的运行记录并统计新增数，可以学习各时段的
+    新增速率；其他爬虫没有运行记录，只在出错时退避。
+    """
+    if job_name == "news_crawler":
+        return AdaptiveInterval.from_ledger(Path("logs") / "runs", base_interval=base_interval, logger=logger)
+    return AdaptiveInterval(base_interval=base_interval, logger=logger)
+
+
+class CrawlDaemon:
+    """在同一个事件循环中按时钟对齐的时间点运行采集任务"""
+
+    def __init__(self, job, logger=None, interval=300, timeout=240, adaptive_interval=None,
+                 policy="coalesce", max_concurrent=1, jitter=0.0):
+        """初始化
+
+        参数:
+            job: 采集任务（NewsCrawlerJob或ScraperJob）
+            logger: 日志记录器
+            interval: 采集间隔（秒），运行时间点对齐到间隔的整数倍
+            timeout: 单次运行的超时时间（秒），0表示不限制
+            adaptive_interval: 自适应采集间隔（AdaptiveInterval），提供时代替固定间隔
+            policy: 错过时间点时的处理策略，见TICK_POLICIES
+            max_concurrent: 同时运行的最大次数，不支持并发的任务固定为1
+            jitter: 每个时间点随机推迟0到jitter秒
+        """
+        self.job = job
+        self.logger = logger or logging.getLogger("scheduler")
+        self.interval = interval
+        self.timeout = timeout
+        self.adaptive_interval = adaptive_interval
+        self.run_count = 0
+        self.scheduler = TickScheduler(
+            self._run_tick,
+            # 没有自适应间隔时传入固定间隔
+            interval=self.current_interval if adaptive_interval is not None else interval,
+            policy=policy,
+            max_concurrent=max_concurrent if getattr(job, "concurrent_safe", False) else 1,
+            jitter=jitter,
+            logger=self.logger
+        )
+
+    def stop(self):
+        """请求停止，正在进行的运行结束后退出"""
+        self.scheduler.stop()
+
+    async def run_once(self):
+        """运行一次任务，超时后取消
+
+        返回:
+            dict: 任务结果，至少包含success和news_count
+        """
+        self.run_count += 1
+        self.logger.info(f"开始第 {self.run_count} 次运行: {self.job.name}")
+        start_time = asyncio.get_running_loop().time()
+
+        try:
+            # wait_for超时后会取消任务并等待取消完成
+            result = await asyncio.wait_for(self.job.run(), timeout=self.timeout or None)
+        except asyncio.TimeoutError:
+            self.logger.error(f"第 {self.run_count} 次运行超时（{self.timeout} 秒），已取消")
+            try:
+                await self.job.recover()
+            except Exception as e:
+                self.logger.warning(f"超时后恢复任务状态失败: {str(e)}")
+            result = {"success": False, "news_count": 0, "error": "timeout"}
+        except Exception as e:
+            self.logger.error(f"第 {self.run_count} 次运行出错: {str(e)}")
+            result = {"success": False, "news_count": 0, "error": str(e)}
+
+        duration = asyncio.get_running_loop().time() - start_time
+        if result["success"]:
+            self.logger.info(f"第 {self.run_count} 次运行完成，获取 {result['news_count']} 条新闻，耗时: {duration:.2f}秒")
+        else:
+            self.logger.warning(f"第 {self.run_count} 次运行未获取到数据，耗时: {duration:.2f}秒")
+        return result
+
+    def current_interval(self):
+        """当前的采集间隔（秒），时间点对齐到该间隔的整数倍"""
+        if self.adaptive_interval is None:
+            return self.interval
+        return self.adaptive_interval.next_interval()
+
+    async def _run_tick(self, tick):
+        result = await self.run_once()
+        if self.adaptive_interval is not None:
+            new_items = result["news_count"] if self.job.reports_new_items else None
+            self.adaptive_interval.observe(new_items=new_items, success=result["success"])
+
+    def _install_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows的事件循环不支持信号处理器，使用KeyboardInterrupt退出
+                pass
+
+    async def run_forever(self, max_runs=0):
+        """按时间点运行任务，直到收到停止信号或达到最大运行次数"""
+        self._install_signal_handlers()
+        self.logger.info(
+            f"采集守护进程启动，任务: {self.job.name}，错过时间点时: {self.scheduler.policy}，"
+            f"最多同时运行 {self.scheduler.max_concurrent} 次"
+        )
+        try:
+            await self.scheduler.run(max_runs=max_runs)
+        finally:
+            await self.job.close()
+            stats = self.scheduler.stats
+            self.logger.info(
+                f"采集守护进程已停止，共运行 {stats['run']} 次，跳过 {stats['skipped']} 个时间点，"
+                f"合并 {stats['coalesced']} 个时间点，最大调度延迟 {stats['max_lag']:.2f} 秒"
+            )
+
+
+async def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="采集守护进程")
+    parser.add_argument("--job", type=str, choices=JOB_NAMES, default="news_crawler", help="运行的采集任务（默认：news_crawler）")
+    parser.add_argument("--interval", type=float, default=5.0, help="采集间隔，单位分钟（默认：5分钟）")
+    parser.add_argument("--timeout", type=float, default=4.0, help="单次运行的超时时间，单位分钟，0表示不限制（默认：4分钟）")
+    parser.add_argument("--adaptive-interval", action="store_true", help="根据新增速率、历史时段规律和出错情况自动调整采集间隔")
+    parser.add_argument("--tick-policy", type=str, choices=TICK_POLICIES, default="coalesce", help="上一次运行未结束或错过时间点时的处理：skip、coalesce或catch-up（默认：coalesce）")
+    parser.add_argument("--max-concurrent-runs", type=int, default=1, help="同时运行的最大次数，news_crawler和同步爬虫固定为1（默认：1）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="每个时间点随机推迟的最大秒数（默认：0）")
+    parser.add_argument("--max-runs", type=int, default=0, help="运行多少次后退出，0表示一直运行")
+    parser.add_argument("--output-format", type=str, choices=["csv", "jsonl", "parquet"], default="csv", help="news_crawler任务的输出格式（默认：csv）")
+    args = parser.parse_args()
+
+    logger = setup_logger()
+    job_options = {"output_format": args.output_format} if args.job == "news_crawler" else {}
+    daemon = CrawlDaemon(
+        create_job(args.job, logger=logger, **job_options),
+        logger=logger,
+        interval=args.interval * 60,
+        timeout=args.timeout * 60,
+        adaptive_interval=build_adaptive_interval(args.job, args.interval * 60, logger) if args.adaptive_interval else None,
+        policy=args.tick_policy,
+        max_concurrent=args.max_concurrent_runs,
+        jitter=args.jitter
+    )
+    await daemon.run_forever(max_runs=args.max_runs)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
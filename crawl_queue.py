@@ -0,0 +1,545 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分布式采集任务队列
+协调进程按周期把目标URL放入队列，多台机器上的采集进程领取任务（租约）、采集
+并提交标准化后的新闻；只有协调进程写入data/下的输出文件。
+
+- 租约：领取任务时设置租约到期时间，采集进程定期续约；进程崩溃或卡住时租约
+  到期，任务由其他采集进程重新领取
+- 重试：失败或租约到期时按指数退避重新排队，超过最大尝试次数后标记为失败
+- 幂等提交：结果以news_id为主键，同一条新闻被多次提交（重试、租约到期后原进程
+  仍然提交、多个目标出现同一条新闻）只保存一次，协调进程只导出一次
+
+本地使用SQLite（同一台机器上的多个进程，或共享目录），也可以使用Redis
+（需要安装redis），两者接口相同。
+"""
+
+import json
+import time
+import sqlite3
+import functools
+import threading
+import hashlib
+import logging
+from pathlib import Path
+
+# 任务状态
+JOB_STATUSES = ["pending", "leased", "done", "failed"]
+
+
+def result_key(row, job_id, index):
+    """结果的幂等键：优先使用news_id，没有标题或链接时使用任务和行号"""
+    return row.get("news_id") or hashlib.md5(f"{job_id}:{index}".encode("utf-8")).hexdigest()
+
+
+def _locked(method):
+    """同一个连接在多个线程中使用时逐个执行"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SqliteQueue:
+    """基于SQLite的任务队列
+
+    用法:
+        queue = SqliteQueue("data/crawl_queue.db")
+        queue.enqueue(url)                              # 协调进程
+        for job in queue.lease(worker_id):              # 采集进程
+            queue.complete(job["id"], worker_id, rows)
+        for key, row in queue.pending_results():        # 协调进程导出
+            ...
+    """
+
+    def __init__(self, path, lease_seconds=300, max_attempts=3, retry_delay=30, logger=None, clock=time.time):
+        """打开队列
+
+        参数:
+            path: 数据库文件路径
+            lease_seconds: 租约时长（秒），采集进程需要在到期前续约
+            max_attempts: 每个任务的最大尝试次数
+            retry_delay: 第一次重试前的等待时间（秒），之后每次加倍
+            logger: 日志记录器
+            clock: 返回当前时间戳的函数
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.logger = logger or logging.getLogger("news_crawler")
+        self.clock = clock
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 采集进程在线程中调用队列操作，连接由锁保护；多个进程同时写入时等待锁，而不是立即报错
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, tick REAL, "
+            "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "max_attempts INTEGER NOT NULL, owner TEXT, lease_until REAL, available_at REAL NOT NULL, "
+            "error TEXT, created_at REAL NOT NULL, finished_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, news_id TEXT NOT NULL UNIQUE, job_id INTEGER, "
+            "row TEXT NOT NULL, created_at REAL NOT NULL, exported INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_exported ON results (exported, seq)")
+
+    def _transaction(self):
+        """立即获取写锁的事务，领取任务时不会与其他进程重复领取"""
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    @_locked
+    def enqueue(self, url, tick=None):
+        """放入一个采集任务；同一URL已有未完成的任务时不重复放入
+
+        返回:
+            int: 任务ID，已有未完成的任务时返回None
+        """
+        now = self.clock()
+        self._transaction()
+        try:
+            if self.conn.execute(
+                "SELECT 1 FROM jobs WHERE url = ? AND status IN ('pending', 'leased')", (url,)
+            ).fetchone():
+                self.conn.execute("COMMIT")
+                return None
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (url, tick, max_attempts, available_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                (url, tick if tick is not None else now, self.max_attempts, now, now)
+            )
+            self.conn.execute("COMMIT")
+            return cursor.lastrowid
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def lease(self, worker, limit=1):
+        """领取到期的任务，租约到期未完成的任务也可以被重新领取
+
+        参数:
+            worker: 采集进程标识
+            limit: 最多领取的任务数
+
+        返回:
+            list: 任务列表，每项包含id、url、tick、attempts
+        """
+        now = self.clock()
+        self._transaction()
+        try:
+            # 租约到期且已用完尝试次数的任务不再领取
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = '租约到期', finished_at = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= max_attempts",
+                (now, now)
+            )
+            rows = self.conn.execute(
+                "SELECT id, url, tick, attempts FROM jobs "
+                "WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY available_at, id LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            jobs = []
+            for job_id, url, tick, attempts in rows:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'leased', owner = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (worker, now + self.lease_seconds, job_id)
+                )
+                jobs.append({"id": job_id, "url": url, "tick": tick, "attempts": attempts + 1})
+            self.conn.execute("COMMIT")
+            return jobs
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def extend(self, job_id, worker):
+        """续约，任务已被其他进程领取或已结束时返回False"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = 'leased'",
+            (self.clock() + self.lease_seconds, job_id, worker)
+        )
+        return cursor.rowcount == 1
+
+    @_locked
+    def complete(self, job_id, worker, rows):
+        """提交任务结果，以news_id去重
+
+        租约已到期、任务被其他进程重新领取后原进程仍然提交时，结果同样有效：
+        已有的news_id被忽略，任务只标记一次完成。
+
+        参数:
+            job_id: 任务ID
+            worker: 采集进程标识
+            rows: 标准化后的新闻行
+
+        返回:
+            int: 新保存的结果数
+        """
+        now = self.clock()
+        self._transaction()
+        try:
+            added = 0
+            for index, row in enumerate(rows):
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO results (news_id, job_id, row, created_at) VALUES (?, ?, ?, ?)",
+                    (result_key(row, job_id, index), job_id, json.dumps(row, ensure_ascii=False), now)
+                )
+                added += cursor.rowcount
+            self.conn.execute(
+                "UPDATE jobs SET status = 'done', owner = ?, error = NULL, finished_at = ? "
+                "WHERE id = ? AND status != 'done'",
+                (worker, now, job_id)
+            )
+            self.conn.execute("COMMIT")
+            return added
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def fail(self, job_id, worker, error):
+        """任务失败，未超过最大尝试次数时退避后重新排队
+
+        返回:
+            bool: 是否会重试
+        """
+        now = self.clock()
+        self._transaction()
+        try:
+            row = self.conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND owner = ? AND status = 'leased'",
+                (job_id, worker)
+            ).fetchone()
+            if row is None:
+                # 租约已到期并被其他进程领取，由新的持有者处理
+                self.conn.execute("COMMIT")
+                return False
+            attempts, max_attempts = row
+            if attempts >= max_attempts:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (str(error), now, job_id)
+                )
+                retry = False
+            else:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'pending', owner = NULL, lease_until = NULL, "
+                    "available_at = ?, error = ? WHERE id = ?",
+                    (now + self.retry_delay * 2 ** (attempts - 1), str(error), job_id)
+                )
+                retry = True
+            self.conn.execute("COMMIT")
+            return retry
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def pending_results(self, limit=500):
+        """尚未导出的结果，按提交顺序
+
+        返回:
+            list: (结果键, 新闻行) 列表，导出后把结果键传给mark_exported
+        """
+        rows = self.conn.execute(
+            "SELECT seq, row FROM results WHERE exported = 0 ORDER BY seq LIMIT ?", (limit,)
+        ).fetchall()
+        return [(seq, json.loads(row)) for seq, row in rows]
+
+    @_locked
+    def mark_exported(self, keys):
+        """标记结果已导出"""
+        keys = list(keys)
+        if not keys:
+            return
+        self.conn.executemany("UPDATE results SET exported = 1 WHERE seq = ?", ((key,) for key in keys))
+
+    @_locked
+    def prune(self, keep_days=7):
+        """删除已结束的任务和已导出的结果
+
+        结果表同时用于幂等提交，保留天数应不少于同一条新闻可能重复出现的时间
+
+        返回:
+            tuple: (删除的任务数, 删除的结果数)
+        """
+        cutoff = self.clock() - keep_days * 86400
+        self._transaction()
+        try:
+            jobs = self.conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?", (cutoff,)
+            ).rowcount
+            results = self.conn.execute(
+                "DELETE FROM results WHERE exported = 1 AND created_at < ?", (cutoff,)
+            ).rowcount
+            self.conn.execute("COMMIT")
+            return jobs, results
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    @_locked
+    def stats(self):
+        """各状态的任务数和待导出的结果数"""
+        counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        stats = {f"queue_{status}": counts.get(status, 0) for status in JOB_STATUSES}
+        stats["queue_unexported"] = self.conn.execute(
+            "SELECT COUNT(*) FROM results WHERE exported = 0"
+        ).fetchone()[0]
+        return stats
+
+    @_locked
+    def close(self):
+        self.conn.close()
+
+
+# 放入任务：同一URL已有未完成的任务时返回false
+ENQUEUE_SCRIPT = """
+local url, prefix = ARGV[1], ARGV[5]
+if redis.call('SADD', KEYS[1], url) == 0 then
+    return false
+end
+local id = redis.call('INCR', KEYS[2])
+redis.call('HSET', prefix .. ':job:' .. id, 'url', url, 'tick', ARGV[2], 'status', 'pending',
+    'attempts', 0, 'max_attempts', ARGV[4], 'created_at', ARGV[3])
+redis.call('ZADD', KEYS[3], ARGV[3], id)
+return id
+"""
+
+# 领取任务：先处理租约到期的任务，再从到期的待处理任务中取出
+LEASE_SCRIPT = """
+local pending, leased, prefix = KEYS[1], KEYS[2], ARGV[4]
+local now, lease_until, limit = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', leased, '-inf', now)) do
+    local job = prefix .. ':job:' .. id
+    redis.call('ZREM', leased, id)
+    if tonumber(redis.call('HGET', job, 'attempts')) >= tonumber(redis.call('HGET', job, 'max_attempts')) then
+        redis.call('HSET', job, 'status', 'failed', 'error', 'lease expired', 'finished_at', now)
+        redis.call('SREM', prefix .. ':open', redis.call('HGET', job, 'url'))
+    else
+        redis.call('HSET', job, 'status', 'pending')
+        redis.call('ZADD', pending, now, id)
+    end
+end
+local jobs = {}
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', pending, '-inf', now, 'LIMIT', 0, limit)) do
+    local job = prefix .. ':job:' .. id
+    redis.call('ZREM', pending, id)
+    redis.call('ZADD', leased, lease_until, id)
+    local attempts = redis.call('HINCRBY', job, 'attempts', 1)
+    redis.call('HSET', job, 'status', 'leased', 'owner', ARGV[5])
+    table.insert(jobs, {id, redis.call('HGET', job, 'url'), redis.call('HGET', job, 'tick'), attempts})
+end
+return jobs
+"""
+
+
+# 续约：只有当前持有者可以续约
+EXTEND_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'status') ~= 'leased' then
+    return 0
+end
+redis.call('ZADD', KEYS[2], 'XX', ARGV[3], ARGV[2])
+return 1
+"""
+
+# 提交结果：保存新的结果并加入待导出列表，任务只标记一次完成
+COMPLETE_SCRIPT = """
+local added = 0
+for i = 4, #ARGV, 2 do
+    if redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+        redis.call('RPUSH', KEYS[2], ARGV[i])
+        added = added + 1
+    end
+end
+if redis.call('HGET', KEYS[3], 'status') ~= 'done' then
+    redis.call('HSET', KEYS[3], 'status', 'done', 'owner', ARGV[1], 'finished_at', ARGV[2])
+    redis.call('ZREM', KEYS[4], ARGV[3])
+    redis.call('ZREM', KEYS[5], ARGV[3])
+    local url = redis.call('HGET', KEYS[3], 'url')
+    if url then
+        redis.call('SREM', KEYS[6], url)
+    end
+end
+return added
+"""
+
+# 任务失败：不是当前持有者时返回-1，重新排队返回1，标记为失败返回0
+FAIL_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'status') ~= 'leased' then
+    return -1
+end
+redis.call('ZREM', KEYS[2], ARGV[3])
+local attempts = tonumber(redis.call('HGET', KEYS[1], 'attempts'))
+if attempts >= tonumber(redis.call('HGET', KEYS[1], 'max_attempts')) then
+    redis.call('HSET', KEYS[1], 'status', 'failed', 'error', ARGV[4], 'finished_at', ARGV[2])
+    redis.call('SREM', KEYS[4], redis.call('HGET', KEYS[1], 'url'))
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', 'pending', 'owner', '', 'error', ARGV[4])
+redis.call('ZADD', KEYS[3], tonumber(ARGV[2]) + tonumber(ARGV[5]) * 2 ^ (attempts - 1), ARGV[3])
+return 1
+"""
+
+
+class RedisQueue:
+    """基于Redis的任务队列，接口与SqliteQueue相同（需要安装redis）
+
+    待处理任务和租约分别保存在按到期时间排序的有序集合中；结果保存在以news_id
+    为键的哈希中（HSETNX），新保存的news_id依次追加到待导出列表，导出后记入按
+    导出时间排序的有序集合，prune()据此删除过期的结果。放入、领取、续约、提交
+    和失败都由Lua脚本原子完成，进程在中途退出不会留下只完成一半的状态。
+    """
+
+    def __init__(self, url, prefix="news_crawler", lease_seconds=300, max_attempts=3, retry_delay=30,
+                 logger=None, clock=time.time):
+        """连接Redis
+
+        参数:
+            url: Redis地址，如 redis://localhost:6379/0
+            prefix: 键名前缀
+            其他参数同SqliteQueue
+        """
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.logger = logger or logging.getLogger("news_crawler")
+        self.clock = clock
+        self._enqueue = self.client.register_script(ENQUEUE_SCRIPT)
+        self._lease = self.client.register_script(LEASE_SCRIPT)
+        self._extend = self.client.register_script(EXTEND_SCRIPT)
+        self._complete = self.client.register_script(COMPLETE_SCRIPT)
+        self._fail = self.client.register_script(FAIL_SCRIPT)
+        # 上一次pending_results读取的结果键在待导出列表中的位置（从1开始）
+        self._export_positions = {}
+
+    def _key(self, *parts):
+        return ":".join((self.prefix,) + tuple(str(part) for part in parts))
+
+    def enqueue(self, url, tick=None):
+        now = self.clock()
+        job_id = self._enqueue(
+            keys=[self._key("open"), self._key("seq"), self._key("pending")],
+            args=[url, tick if tick is not None else now, now, self.max_attempts, self.prefix]
+        )
+        return int(job_id) if job_id else None
+
+    def lease(self, worker, limit=1):
+        now = self.clock()
+        rows = self._lease(
+            keys=[self._key("pending"), self._key("leased")],
+            args=[now, now + self.lease_seconds, limit, self.prefix, worker]
+        )
+        return [
+            {"id": int(job_id), "url": url, "tick": float(tick), "attempts": int(attempts)}
+            for job_id, url, tick, attempts in rows
+        ]
+
+    def extend(self, job_id, worker):
+        return bool(self._extend(
+            keys=[self._key("job", job_id), self._key("leased")],
+            args=[worker, job_id, self.clock() + self.lease_seconds]
+        ))
+
+    def complete(self, job_id, worker, rows):
+        args = [worker, self.clock(), job_id]
+        for index, row in enumerate(rows):
+            args += [result_key(row, job_id, index), json.dumps(row, ensure_ascii=False)]
+        return int(self._complete(
+            keys=[self._key("results"), self._key("export"), self._key("job", job_id),
+                  self._key("leased"), self._key("pending"), self._key("open")],
+            args=args
+        ))
+
+    def fail(self, job_id, worker, error):
+        result = self._fail(
+            keys=[self._key("job", job_id), self._key("leased"), self._key("pending"), self._key("open")],
+            args=[worker, self.clock(), job_id, str(error), self.retry_delay]
+        )
+        return int(result) == 1
+
+    def pending_results(self, limit=500):
+        while True:
+            keys = self.client.lrange(self._key("export"), 0, limit - 1)
+            self._export_positions = {key: position for position, key in enumerate(keys, 1)}
+            if not keys:
+                return []
+            rows = self.client.hmget(self._key("results"), keys)
+            batch = [(key, json.loads(row)) for key, row in zip(keys, rows) if row is not None]
+            if batch:
+                return batch
+            # 这一段的结果都已被清理，直接移出待导出列表
+            self.client.ltrim(self._key("export"), len(keys), -1)
+
+    def mark_exported(self, keys):
+        # 只有协调进程导出，已导出的总是待导出列表开头的若干项；按读取时的原始位置裁剪，
+        # 结果已被清理而没有返回的键一并移出
+        keys = list(keys)
+        end = max((self._export_positions.get(key, 0) for key in keys), default=0)
+        if not end:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        pipe.ltrim(self._key("export"), end, -1)
+        pipe.zadd(self._key("exported"), {key: self.clock() for key in keys})
+        pipe.execute()
+        self._export_positions = {}
+
+    def prune(self, keep_days=7, batch_size=1000):
+        cutoff = self.clock() - keep_days * 86400
+        deleted = 0
+        for key in self.client.scan_iter(self._key("job", "*")):
+            finished_at = self.client.hget(key, "finished_at")
+            if finished_at and float(finished_at) < cutoff:
+                self.client.delete(key)
+                deleted += 1
+
+        # 结果哈希同时用于幂等提交，只删除导出时间早于保留天数的结果
+        results = 0
+        while True:
+            keys = self.client.zrangebyscore(self._key("exported"), "-inf", cutoff, start=0, num=batch_size)
+            if not keys:
+                break
+            pipe = self.client.pipeline(transaction=True)
+            pipe.hdel(self._key("results"), *keys)
+            pipe.zrem(self._key("exported"), *keys)
+            results += pipe.execute()[0]
+        return deleted, results
+
+    def stats(self):
+        stats = {f"queue_{status}": 0 for status in JOB_STATUSES}
+        stats["queue_pending"] = self.client.zcard(self._key("pending"))
+        stats["queue_leased"] = self.client.zcard(self._key("leased"))
+        stats["queue_unexported"] = self.client.llen(self._key("export"))
+        return stats
+
+    def close(self):
+        self.client.close()
+
+
+def open_queue(spec, **kwargs):
+    """根据地址打开任务队列
+
+    参数:
+        spec: redis://或rediss://开头时使用Redis，否则为SQLite数据库路径（可以带sqlite:///前缀）
+        **kwargs: 传给队列的其他参数
+    """
+    if spec.startswith(("redis://", "rediss://")):
+        return RedisQueue(spec, **kwargs)
+    if spec.startswith("sqlite:///"):
+        spec = spec[len("sqlite:///"):]
+    return SqliteQueue(spec, **kwargs)
@@ -1,8 +1,12 @@
 import os
+import csv
 import time
 import datetime
 import asyncio
+import argparse
+import tracemalloc
 import pandas as pd
+from openpyxl import Workbook, load_workbook
 from playwright.async_api import async_playwright
 import logging
 from pathlib import Path
@@ -30,8 +34,93 @@ def extract_number(title):
         return match.group(1), match.group(2)
     return None, title
 
-async def run_scraper():
-    """爬取新闻数据"""
+# 输出字段
+FIELDNAMES = ['number', 'title', 'source', 'link', 'collect_time']
+
+def measure(func, *args, trace_memory=False):
+    """执行函数并统计耗时（秒）和内存峰值（MB）
+    
+    tracemalloc会跟踪每一次内存分配，明显拖慢openpyxl写入，
+    只有trace_memory为True（--profile）时才统计内存峰值，否则峰值为None
+    """
+    if not trace_memory:
+        start_time = time.time()
+        return func(*args), time.time() - start_time, None
+    
+    tracemalloc.start()
+    start_time = time.time()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, time.time() - start_time, peak / (1024 * 1024)
+
+def format_cost(elapsed, peak_mb):
+    """格式化耗时和内存峰值，未统计内存时只输出耗时"""
+    if peak_mb is None:
+        return f"耗时: {elapsed:.2f} 秒"
+    return f"耗时: {elapsed:.2f} 秒，内存峰值: {peak_mb:.1f} MB"
+
+def append_to_excel(rows, excel_path):
+    """把本次新增的行追加到当天的Excel文件，不再重新读取CSV"""
+    if os.path.exists(excel_path):
+        workbook = load_workbook(excel_path)
+        sheet = workbook.active
+    else:
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(FIELDNAMES)
+    
+    for row in rows:
+        sheet.append([row.get(name) for name in FIELDNAMES])
+    
+    workbook.save(excel_path)
+    return len(rows)
+
+def build_excel_from_csv(csv_path, excel_path):
+    """以只写（流式）模式从CSV一次性生成Excel文件"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    
+    count = 0
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.reader(f):
+            sheet.append(row)
+            count += 1
+    
+    workbook.save(excel_path)
+    return max(0, count - 1)
+
+def finalize_closed_days(data_dir, profile=False):
+    """为已结束日期的CSV生成Excel文件（Excel不存在或比CSV旧时）
+    
+    参数:
+        data_dir: 数据目录
+        profile: 是否统计内存峰值
+    """
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    
+    for csv_path in sorted(data_dir.glob("dataframe_news_*.csv")):
+        date_str = csv_path.stem[len("dataframe_news_"):]
+        if date_str >= today:
+            continue
+        
+        excel_path = csv_path.with_suffix(".xlsx")
+        if excel_path.exists() and excel_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            continue
+        
+        count, elapsed, peak_mb = measure(build_excel_from_csv, csv_path, excel_path, trace_memory=profile)
+        logger.info(f"已生成 {date_str} 的Excel文件（{count} 条），{format_cost(elapsed, peak_mb)}")
+
+async def run_scraper(excel_mode="daily", profile=False):
+    """爬取新闻数据
+    
+    参数:
+        excel_mode: Excel输出方式，'daily'（当天结束后从CSV一次性生成）、
+                    'append'（每次追加到当天的Excel，需要重新读写整个工作簿）或'none'（不输出Excel）
+        profile: 是否统计Excel写入的内存峰值（tracemalloc会拖慢写入）
+    """
     # 创建必要的目录
     data_dir = Path("data")
     screenshots_dir = Path("screenshots")
@@ -210,17 +299,17 @@ async def run_scraper():
                     quoting=1  # QUOTE_ALL
                 )
                 
-                # 保存为Excel，方便查看
-                if file_exists:
-                    # 如果文件已存在，读取并合并数据
-                    existing_df = pd.read_csv(csv_path, encoding='utf-8-sig')
-                    df = pd.concat([existing_df, df], ignore_index=True)
-                
-                # 保存到Excel文件
-                df.to_excel(excel_path, index=False, engine='openpyxl')
-                
                 logger.info(f"成功保存 {len(formatted_data)} 条新闻数据到CSV: {csv_path}")
-                logger.info(f"成功保存 {len(formatted_data)} 条新闻数据到Excel: {excel_path}")
+                
+                # 保存为Excel，方便查看
+                if excel_mode == "append":
+                    # 只追加本次新增的行
+                    _, elapsed, peak_mb = measure(append_to_excel, formatted_data, excel_path, trace_memory=profile)
+                    logger.info(f"成功保存 {len(formatted_data)} 条新闻数据到Excel: {excel_path}")
+                    logger.info(f"Excel追加{format_cost(elapsed, peak_mb)}")
+                elif excel_mode == "daily":
+                    # 当天结束后再一次性生成
+                    finalize_closed_days(data_dir, profile=profile)
             else:
                 logger.warning("未找到新闻数据，请检查网页结构是否改变")
             
@@ -249,8 +338,23 @@ async def run_scraper():
             return 0
 
 async def main():
+    parser = argparse.ArgumentParser(description="新闻爬虫（DataFrame版）")
+    parser.add_argument(
+        "--excel-mode",
+        type=str,
+        choices=["daily", "append", "none"],
+        default="daily",
+        help="Excel输出方式：daily（当天结束后从CSV生成）、append（每次重新读写当天的Excel并追加）或none（默认：daily）"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="统计Excel写入的内存峰值（使用tracemalloc，会明显拖慢写入）"
+    )
+    args = parser.parse_args()
+    
     logger.info("爬虫程序启动")
-    news_count = await run_scraper()
+    news_count = await run_scraper(excel_mode=args.excel_mode, profile=args.profile)
     logger.info(f"爬虫程序结束，共爬取 {news_count} 条新闻")
 
 if __name__ == "__main__":
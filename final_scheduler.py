@@ -3,10 +3,14 @@ import time
 import datetime
 import logging
 import asyncio
+import argparse
 import sys
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
 
+from adaptive_interval import AdaptiveInterval
+from tick_scheduler import TickScheduler
+
 # 导入爬虫模块
 try:
     from final_scraper import run_scraper
@@ -51,51 +55,64 @@ def setup_logger():
     
     return logger
 
-async def main():
-    """主函数"""
+async def main(adaptive=False):
+    """主函数
+    
+    参数:
+        adaptive: 是否使用自适应间隔，否则固定5分钟
+    """
     logger = setup_logger()
     logger.info("调度器启动")
     
-    # 设置间隔时间（分钟）
-    interval_minutes = 5
-    interval_seconds = interval_minutes * 60
+    # 间隔时间5分钟；开启自适应间隔时出错后先尽快重试，持续出错时退避。
+    # final_scraper不写运行记录，也不统计新增数，不按时段调整
+    scheduler = AdaptiveInterval(base_interval=5 * 60, logger=logger) if adaptive else None
     
     # 计数器
     cycle_count = 0
     
-    try:
-        while True:
-            cycle_count += 1
-            start_time = time.time()
-            current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            logger.info(f"开始第 {cycle_count} 个爬取周期，当前时间: {current_time}")
-            
-            try:
-                # 运行爬虫
-                news_count = await run_scraper()
-                
-                # 记录结果
-                end_time = time.time()
-                duration = end_time - start_time
-                
-                if news_count > 0:
-                    logger.info(f"爬取成功，获取了 {news_count} 条新闻，耗时: {duration:.2f}秒")
-                else:
-                    logger.warning(f"爬取完成，但未获取到新闻数据，耗时: {duration:.2f}秒")
-            
-            except Exception as e:
-                logger.error(f"爬虫执行过程中发生错误: {str(e)}")
+    async def run_cycle(tick):
+        """运行一个爬取周期"""
+        nonlocal cycle_count
+        cycle_count += 1
+        start_time = time.time()
+        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        logger.info(f"开始第 {cycle_count} 个爬取周期，当前时间: {current_time}")
+        
+        success = False
+        try:
+            # 运行爬虫
+            news_count = await run_scraper()
             
-            # 计算下一次运行的等待时间
-            elapsed_time = time.time() - start_time
-            wait_time = max(1, interval_seconds - elapsed_time)  # 至少等待1秒
+            # 记录结果
+            end_time = time.time()
+            duration = end_time - start_time
             
-            next_run_time = datetime.datetime.now() + datetime.timedelta(seconds=wait_time)
-            logger.info(f"等待 {wait_time:.2f} 秒后开始下一周期，预计时间: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            
-            # 等待到下一个周期
-            await asyncio.sleep(wait_time)
+            # 没有抛出异常就视为成功，没有新闻的周期不按出错退避
+            success = True
+            if news_count > 0:
+                logger.info(f"爬取成功，获取了 {news_count} 条新闻，耗时: {duration:.2f}秒")
+            else:
+                logger.warning(f"爬取完成，但未获取到新闻数据，耗时: {duration:.2f}秒")
+        
+        except Exception as e:
+            logger.error(f"爬虫执行过程中发生错误: {str(e)}")
+        
+        # 记录结果，用于计算之后的间隔
+        if scheduler is not None:
+            scheduler.observe(success=success)
+    
+    # 运行时间点对齐到间隔的整数倍，上一周期未结束时错过的时间点合并为一次
+    ticks = TickScheduler(
+        run_cycle,
+        interval=scheduler.next_interval if scheduler is not None else 5 * 60,
+        policy="coalesce",
+        logger=logger
+    )
+    
+    try:
+        await ticks.run()
     
     except KeyboardInterrupt:
         logger.info("用户中断，调度器停止")
@@ -107,4 +124,11 @@ async def main():
         logger.info("调度器已停止")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="新闻爬虫调度器（final_scraper）")
+    parser.add_argument(
+        "--adaptive-interval",
+        action="store_true",
+        help="出错后先尽快重试，持续出错时退避（默认：固定5分钟间隔）"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(adaptive=args.adaptive_interval))
\ No newline at end of file
@@ -1,5 +1,4 @@
 import os
-import csv
 import time
 import datetime
 import asyncio
@@ -7,6 +6,8 @@ from playwright.async_api import async_playwright
 import logging
 from pathlib import Path
 
+from safe_append import append_csv_rows
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -28,9 +29,6 @@ async def run_scraper():
     # CSV文件路径
     csv_path = data_dir / f"news_{current_date}.csv"
     
-    # 检查CSV文件是否存在
-    is_new_file = not csv_path.exists()
-    
     # 当前时间
     collect_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -174,17 +172,10 @@ async def run_scraper():
                         'collect_time': collect_time
                     })
                 
-                # 写入CSV
-                with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-                    fieldnames = ['number', 'title', 'source', 'link', 'collect_time']
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    
-                    # 如果是新文件，写入表头
-                    if is_new_file:
-                        writer.writeheader()
-                    
-                    # 写入数据
-                    writer.writerows(formatted_data)
+                # 加锁后一次追加到CSV，表头在锁内判断文件为空时写入，
+                # 与同时运行的其他爬虫不会交错或重复写入表头
+                fieldnames = ['number', 'title', 'source', 'link', 'collect_time']
+                append_csv_rows(csv_path, formatted_data, fieldnames, logger=logger)
                 
                 logger.info(f"成功保存 {len(formatted_data)} 条新闻数据到: {csv_path}")
             else:
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTML缓存离线提取
+读取scrape_news保存的HTML快照（html_cache/snapshots中的压缩快照，以及旧版本保存的
+html_cache/page_content_*.html），按与页面提取脚本
+（news_crawler.EXTRACT_NEWS_SCRIPT）相同的规则提取新闻，无需启动浏览器。
+可用于补采历史数据、修改选择器后重新提取，以及单独测试提取性能。
+需要安装lxml和cssselect。
+
+用法:
+    python html_replay.py html_cache --output=data/replay_news.csv --workers=4
+"""
+
+import re
+import sys
+import time
+import argparse
+import datetime
+import logging
+from pathlib import Path
+from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor
+
+from normalize import normalize_items
+from sinks import open_sink
+from snapshot_store import SnapshotStore, read_blob
+
+# 与EXTRACT_NEWS_SCRIPT中的选择器保持一致
+CARD_SELECTOR = ".card, .article-card, .news-card, article, .item"
+TITLE_SELECTOR = 'h2, h3, h4, .title, [class*="title"], a'
+LINK_SELECTOR = "a"
+SOURCE_SELECTOR = (
+    '.source, [class*="source"], .author, [class*="author"], .publisher, .site, .domain, '
+    '.hostname, [class*="hostname"], [class*="domain"], [class*="site"]'
+)
+TIME_SELECTOR = 'time, .time, .date, [class*="time"], [class*="date"], [datetime]'
+SUMMARY_SELECTOR = (
+    '.summary, .description, .abstract, .content, [class*="summary"], '
+    '[class*="description"], [class*="abstract"], [class*="content"]'
+)
+
+DEFAULT_BASE_URL = "https://newsnow.busiyi.world/c/hottest"
+
+# 缓存文件名中的时间戳
+TIMESTAMP_RE = re.compile(r"(\d{8}_\d{6})")
+
+# 输出字段，与news_crawler.NEWS_FIELDS一致
+NEWS_FIELDS = [
+    'number', 'original_number', 'title', 'source', 'link',
+    'summary', 'pub_time', 'collect_time', 'news_id'
+]
+
+logger = logging.getLogger("news_crawler")
+
+_xpaths = None
+
+
+def _compiled_xpaths():
+    """把CSS选择器编译为XPath（每个进程只编译一次）
+
+    卡片之外的选择器只匹配后代元素，与element.querySelector的行为一致。
+    """
+    global _xpaths
+    if _xpaths is None:
+        from lxml import etree
+        from cssselect import HTMLTranslator
+
+        translator = HTMLTranslator()
+
+        def compile_css(selector, prefix="descendant::"):
+            return etree.XPath(translator.css_to_xpath(selector, prefix=prefix))
+
+        _xpaths = {
+            "card": compile_css(CARD_SELECTOR, prefix="descendant-or-self::"),
+            "title": compile_css(TITLE_SELECTOR),
+            "link": compile_css(LINK_SELECTOR),
+            "source": compile_css(SOURCE_SELECTOR),
+            "time": compile_css(TIME_SELECTOR),
+            "summary": compile_css(SUMMARY_SELECTOR),
+            "all_links": compile_css(LINK_SELECTOR, prefix="descendant-or-self::"),
+        }
+    return _xpaths
+
+
+def _first(xpath, element):
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _text(element):
+    return element.text_content().strip()
+
+
+def _href(element, base_url):
+    """与a.href属性相同：解析为绝对URL，没有href属性时为空字符串"""
+    href = element.get("href")
+    if href is None:
+        return ""
+    return urljoin(base_url, href.strip())
+
+
+def extract_news_from_html(html, base_url=DEFAULT_BASE_URL):
+    """从HTML中提取新闻，结果格式与页面提取脚本相同
+
+    参数:
+        html: 页面HTML
+        base_url: 页面URL，用于把相对链接补全为绝对URL
+
+    返回:
+        list: 每条包含title、link、source、pubTime、summary
+    """
+    from lxml import html as lxml_html
+
+    xpaths = _compiled_xpaths()
+    document = lxml_html.document_fromstring(html)
+
+    base = document.find(".//base[@href]")
+    if base is not None:
+        base_url = urljoin(base_url, base.get("href"))
+
+    results = []
+    cards = xpaths["card"](document)
+
+    if cards:
+        for card in cards:
+            title_element = _first(xpaths["title"], card)
+            title = _text(title_element) if title_element is not None else ""
+
+            link_element = _first(xpaths["link"], card)
+            link = _href(link_element, base_url) if link_element is not None else ""
+
+            source_element = _first(xpaths["source"], card)
+            source = _text(source_element) if source_element is not None else ""
+
+            pub_time = ""
+            time_element = _first(xpaths["time"], card)
+            if time_element is not None:
+                if time_element.get("datetime") is not None:
+                    pub_time = time_element.get("datetime")
+                else:
+                    pub_time = _text(time_element)
+
+            summary = ""
+            summary_element = _first(xpaths["summary"], card)
+            if summary_element is not None and summary_element is not title_element:
+                summary = _text(summary_element)
+
+            if title:
+                results.append({
+                    "title": title,
+                    "link": link,
+                    "source": source,
+                    "pubTime": pub_time,
+                    "summary": summary,
+                })
+    else:
+        # 找不到卡片元素时，使用所有可能的链接
+        for link_element in xpaths["all_links"](document):
+            text = link_element.text_content()
+            href = _href(link_element, base_url)
+            if (text.strip() and "#" not in href and len(text) > 10
+                    and "javascript:" not in href):
+                results.append({
+                    "title": text.strip(),
+                    "link": href,
+                    "source": "",
+                    "pubTime": "",
+                    "summary": "",
+                })
+
+    # 去重，以标题为键
+    unique_results = []
+    seen_titles = set()
+    for item in results:
+        if item["title"] not in seen_titles:
+            seen_titles.add(item["title"])
+            unique_results.append(item)
+    return unique_results
+
+
+def collect_time_for(path, key=None):
+    """根据快照标记或缓存文件名中的时间戳还原采集时间，没有时间戳时使用文件修改时间"""
+    match = TIMESTAMP_RE.search(key or Path(path).name)
+    if match:
+        moment = datetime.datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    else:
+        moment = datetime.datetime.fromtimestamp(Path(path).stat().st_mtime)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def replay_file(path, base_url=DEFAULT_BASE_URL, key=None):
+    """离线提取单个快照，返回标准化后的新闻行和提取耗时
+
+    参数:
+        path: 快照文件路径，压缩快照按扩展名解压
+        base_url: 页面URL
+        key: 快照标记，用于还原采集时间，默认从文件名中读取
+    """
+    start_time = time.perf_counter()
+    news_data = extract_news_from_html(read_blob(path), base_url)
+    rows = normalize_items(news_data, collect_time_for(path, key))
+    return key or str(path), rows, time.perf_counter() - start_time
+
+
+def find_snapshots(directory, base_url=DEFAULT_BASE_URL, start=None, end=None, pattern="page_content_*.html"):
+    """列出目录中的快照，包括快照存储中的压缩快照和旧版本保存的HTML文件
+
+    返回:
+        list: 按快照标记排序的 (快照标记, 页面URL, 文件路径)
+    """
+    directory = Path(directory)
+    snapshots = []
+
+    for store_dir in (directory, directory / "snapshots"):
+        if (store_dir / "index.db").exists():
+            with SnapshotStore(store_dir) as store:
+                for key, url, path in store.iter_snapshots(start, end):
+                    snapshots.append((key, url or base_url, path))
+
+    for path in directory.glob(pattern):
+        match = TIMESTAMP_RE.search(path.name)
+        key = path.stem.replace("page_content_", "", 1)
+        if match and ((start and match.group(1) < start) or (end and match.group(1) >= end)):
+            continue
+        snapshots.append((key, base_url, path))
+
+    return sorted(snapshots, key=lambda snapshot: snapshot[0])
+
+
+def replay_directory(directory, base_url=DEFAULT_BASE_URL, workers=None, start=None, end=None):
+    """用进程池离线提取目录下的所有快照
+
+    参数:
+        directory: 缓存目录
+        base_url: 页面URL，快照存储中记录了URL时使用记录的URL
+        workers: 进程数，默认为CPU核数
+        start: 起始时间戳（包含），YYYYMMDD_HHMMSS
+        end: 结束时间戳（不包含）
+
+    返回:
+        生成器，按快照标记顺序依次返回 (快照标记, 新闻行, 提取耗时)
+    """
+    snapshots = find_snapshots(directory, base_url, start, end)
+    if not snapshots:
+        return
+    keys, urls, paths = zip(*snapshots)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(replay_file, paths, urls, keys, chunksize=4)
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="HTML缓存离线提取")
+    parser.add_argument("directory", type=str, nargs="?", default="html_cache", help="缓存目录（默认：html_cache）")
+    parser.add_argument("--output", type=str, help="输出文件路径，不指定时只统计不输出")
+    parser.add_argument("--format", type=str, choices=["csv", "jsonl", "parquet"], default="csv", help="输出格式（默认：csv）")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认：CPU核数）")
+    parser.add_argument("--base-url", type=str, default=DEFAULT_BASE_URL, help="页面URL，用于补全相对链接")
+    parser.add_argument("--dedup", action="store_true", help="跨文件按news_id去重")
+    parser.add_argument("--start", type=str, help="起始时间戳（包含），YYYYMMDD_HHMMSS")
+    parser.add_argument("--end", type=str, help="结束时间戳（不包含），YYYYMMDD_HHMMSS")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    start_time = time.time()
+    sink = open_sink(args.format, args.output, NEWS_FIELDS, append=False).open() if args.output else None
+    seen_ids = set()
+    file_count = 0
+    row_count = 0
+    number = 1
+
+    try:
+        for path, rows, elapsed in replay_directory(args.directory, args.base_url, args.workers, args.start, args.end):
+            file_count += 1
+            for row in rows:
+                if args.dedup:
+                    if row["news_id"] in seen_ids:
+                        continue
+                    seen_ids.add(row["news_id"])
+                row["number"] = number
+                number += 1
+                row_count += 1
+                if sink is not None:
+                    sink.write(row)
+            logger.debug(f"{path}: {len(rows)} 条，耗时 {elapsed * 1000:.1f} ms")
+    finally:
+        if sink is not None:
+            sink.close()
+
+    logger.info(f"共处理 {file_count} 个文件，提取 {row_count} 条新闻，耗时: {time.time() - start_time:.2f} 秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
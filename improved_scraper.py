@@ -7,7 +7,6 @@
 """
 
 import os
-import csv
 import time
 import asyncio
 import datetime
@@ -15,6 +14,8 @@ from pathlib import Path
 
 from playwright.async_api import async_playwright
 
+from safe_append import append_csv_rows
+
 
 async def run_scraper():
     """
@@ -152,16 +153,9 @@ async def run_scraper():
                 for item in news_data:
                     item["collect_time"] = current_time
                 
-                # 写入CSV
-                file_exists = csv_path.exists()
-                with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-                    fieldnames = ['title', 'source', 'link', 'collect_time']
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    
-                    if not file_exists:
-                        writer.writeheader()
-                    
-                    writer.writerows(news_data)
+                # 加锁后一次追加到CSV，与同时运行的其他爬虫不会交错或重复写入表头
+                fieldnames = ['title', 'source', 'link', 'collect_time']
+                append_csv_rows(csv_path, news_data, fieldnames)
                 
                 print(f"成功保存 {len(news_data)} 条新闻到 {csv_path}")
             else:
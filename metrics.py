@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+采集阶段计时
+用 with METRICS.span("goto"): 包住采集流程的各个阶段，记录本周期各阶段耗时，
+并在多个周期之间累计直方图，导出为Prometheus文本格式（可由node_exporter的
+textfile collector读取）
+"""
+
+import os
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# 直方图分桶上限（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Histogram:
+    """累计直方图，记录观测次数、总和以及各分桶的计数"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 最后一个为+Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """返回 [(上限, 累计计数), ...]，最后一项上限为+Inf"""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """按分桶估算分位数（取所在分桶的上限），没有观测时返回None"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class PhaseMetrics:
+    """各阶段耗时统计
+
+    - span(phase): 计时上下文，可以在async函数中包住await
+    - start_cycle()/cycle_timings(): 当前周期各阶段的耗时，并发采集多个目标时耗时累加
+    - 直方图和计数器在整个进程中累计，write_prometheus()导出
+    """
+
+    def __init__(self, prefix="news_crawler", buckets=DEFAULT_BUCKETS):
+        """初始化统计
+
+        参数:
+            prefix: Prometheus指标名前缀
+            buckets: 直方图分桶上限（秒）
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self.histograms = {}
+        self.counters = {}
+        self.cycle = {}
+        self._lock = threading.Lock()
+
+    def start_cycle(self):
+        """开始新的采集周期，清空本周期的阶段耗时"""
+        with self._lock:
+            self.cycle = {}
+
+    def observe(self, phase, seconds):
+        """记录一次阶段耗时"""
+        with self._lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            self.cycle[phase] = self.cycle.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def span(self, phase):
+        """统计with代码块的耗时，出错时同样记录"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start_time)
+
+    def inc(self, name, value=1, **labels):
+        """计数器加value"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def cycle_timings(self):
+        """本周期各阶段耗时（秒）"""
+        with self._lock:
+            return {phase: round(seconds, 3) for phase, seconds in self.cycle.items()}
+
+    def percentiles(self, phase, quantiles=(0.5, 0.9, 0.99)):
+        """按直方图估算某阶段耗时的分位数，超过最大分桶时为None"""
+        histogram = self.histograms.get(phase)
+        result = {}
+        for q in quantiles:
+            value = histogram.quantile(q) if histogram is not None else None
+            result[f"p{int(q * 100)}"] = None if value == float("inf") else value
+        return result
+
+    def render_prometheus(self):
+        """生成Prometheus文本格式"""
+        lines = []
+        with self._lock:
+            name = f"{self.prefix}_phase_seconds"
+            lines.append(f"# HELP {name} 采集各阶段耗时")
+            lines.append(f"# TYPE {name} histogram")
+            for phase in sorted(self.histograms):
+                histogram = self.histograms[phase]
+                for bound, total in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{le}"}} {total}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+
+            declared = set()
+            for (counter, labels), value in sorted(self.counters.items()):
+                metric = f"{self.prefix}_{counter}"
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} counter")
+                    declared.add(metric)
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}")
+
+        lines.append(f"# TYPE {self.prefix}_last_update_timestamp_seconds gauge")
+        lines.append(f"{self.prefix}_last_update_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """写入Prometheus文本文件，先写临时文件再替换，避免读到写了一半的内容"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+# 进程内共享的统计，持续模式下在各周期之间累计
+METRICS = PhaseMetrics()
@@ -1,18 +1,32 @@
 import os
-import csv
 import time
+import socket
 import datetime
 import asyncio
 import argparse
-import pandas as pd
-from playwright.async_api import async_playwright
 import logging
 from pathlib import Path
 import re
-import hashlib
-import json
-import glob
-import shutil
+import urllib.parse
+from browser_pool import BrowserPool
+from page_readiness import scroll_until_stable
+from request_filter import RequestFilter, DEFAULT_BLOCK_DOMAINS, parse_list
+from api_capture import ApiCapture
+from news_index import NewsIndex, lookup_history, iter_history_ids
+from bloom_filter import RollingBloomFilter
+from sinks import write_rows, export_excel, FORMAT_SUFFIXES
+from archive import compact_closed_days
+from normalize import normalize_items, news_ids
+from metrics import METRICS
+from run_ledger import RunLedger
+from snapshot_store import SnapshotStore
+from screenshot_policy import ScreenshotPolicy, SCREENSHOT_MODES
+from change_detector import ChangeDetector, FINGERPRINT_SCRIPT, fingerprint_items
+from adaptive_interval import AdaptiveInterval
+from tick_scheduler import TickScheduler, TICK_POLICIES
+from pipeline import PostProcessPipeline, EXECUTOR_KINDS, offload
+from crawl_queue import open_queue
+from cache_retention import apply_retention, parse_budgets, BackgroundCleaner
 
 # 配置日志
 def setup_logger(log_level=logging.INFO):
@@ -63,62 +77,104 @@ def get_timestamp():
     """获取当前时间戳，格式为YYYYMMDD_HHMMSS"""
     return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def clean_text(text):
-    """清理文本，去除多余的空格和换行符"""
-    if not text:
-        return ""
-    # 替换所有空白字符为单个空格
-    text = re.sub(r'\s+', ' ', text.strip())
-    return text
+def build_request_filter(args):
+    """根据命令行参数创建请求过滤器，禁用时返回None"""
+    if args.no_request_filter:
+        return None
+    
+    return RequestFilter(
+        block_types=parse_list(args.block_resources),
+        block_domains=list(DEFAULT_BLOCK_DOMAINS) + parse_list(args.block_domains),
+        allow_domains=parse_list(args.allow_domains)
+    )
+
+def target_options(args):
+    """根据命令行参数生成多目标采集参数"""
+    return {
+        "urls": resolve_targets([t.strip() for t in args.targets.split(",") if t.strip()]),
+        "concurrency": args.concurrency,
+        "target_timeout": args.target_timeout,
+        "target_retries": args.target_retries
+    }
 
-def extract_domain(url):
-    """从URL中提取域名作为来源"""
-    if not url:
-        return "未知来源"
+def build_dedup_filter(args, logger, dirs):
+    """根据命令行参数创建跨天去重的布隆过滤器，禁用时返回None"""
+    if args.dedup_days <= 0:
+        return None
     
-    try:
-        # 尝试解析URL获取域名
-        import urllib.parse
-        domain = urllib.parse.urlparse(url).netloc
-        
-        # 提取主域名
-        parts = domain.split('.')
-        if len(parts) >= 2:
-            if parts[-2] in ['com', 'net', 'org', 'gov', 'edu'] and len(parts) > 2:
-                main_domain = parts[-3]
-            else:
-                main_domain = parts[-2]
-                
-            # 映射常见域名到更友好的名称
-            domain_mapping = {
-                'zhihu': '知乎',
-                'weibo': '微博',
-                'baidu': '百度',
-                'douyin': '抖音',
-                'toutiao': '今日头条',
-                'bilibili': 'B站',
-                'wallstreetcn': '华尔街见闻',
-                'thepaper': '澎湃新闻',
-                'github': 'GitHub',
-                'coolapk': '酷安'
-            }
-            
-            return domain_mapping.get(main_domain, domain)
-    except:
-        pass
+    dedup_filter = RollingBloomFilter(
+        dirs["data"] / "bloom",
+        days=args.dedup_days,
+        capacity_per_day=args.bloom_capacity,
+        logger=logger
+    )
     
-    return "未知来源"
+    # 用最近几天的索引补充过滤器中缺少的ID：首次启用、关闭跨天去重期间写入的新闻，
+    # 以及上次写入后未来得及保存过滤器就退出的情况
+    seeded = dedup_filter.seed(iter_history_ids(dirs["data"], args.dedup_days))
+    if seeded:
+        logger.info(f"从索引补充 {seeded} 个ID到布隆过滤器")
+        dedup_filter.save()
+    
+    return dedup_filter
+
+def build_screenshot_policy(args, logger):
+    """根据命令行参数创建截图策略"""
+    return ScreenshotPolicy(
+        mode="never" if args.no_screenshots else args.screenshot_mode,
+        every=args.screenshot_every,
+        min_items=args.screenshot_min_items,
+        image_format=args.screenshot_format,
+        quality=args.screenshot_quality,
+        clip_selector=None if args.no_screenshot_clip else CARD_SELECTOR,
+        logger=logger
+    )
 
-def generate_news_id(title, link):
-    """生成新闻ID，用于去重"""
-    if not title or not link:
+def build_adaptive_interval(args, logger, dirs):
+    """根据命令行参数创建自适应采集间隔，未启用时返回None"""
+    if not args.adaptive_interval:
         return None
     
-    # 使用标题和链接生成唯一ID
-    content = f"{title}{link}".encode("utf-8")
-    return hashlib.md5(content).hexdigest()
+    scheduler = AdaptiveInterval.from_ledger(
+        dirs["logs"] / "runs",
+        base_interval=args.interval * 60,
+        min_interval=args.min_interval * 60,
+        max_interval=args.max_interval * 60,
+        target_new_items=args.target_new_items,
+        logger=logger
+    )
+    logger.info(f"启用自适应采集间隔（{args.min_interval}-{args.max_interval} 分钟），已学习 {len(scheduler.hourly_profile)} 个时段的新增速率")
+    return scheduler
+
+def build_pipeline(args, logger):
+    """根据命令行参数创建后处理阶段，后处理工作数为0时返回None（在事件循环中直接处理）"""
+    if args.post_workers <= 0:
+        return None
+    
+    return PostProcessPipeline(
+        workers=args.post_workers,
+        queue_size=args.post_queue_size,
+        executor=args.post_executor,
+        logger=logger
+    )
+
+def build_queue(args, logger):
+    """根据命令行参数打开分布式采集的任务队列"""
+    return open_queue(
+        args.queue,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        logger=logger
+    )
 
-def cleanup_cache_files(dirs, logger, max_files=100, keep_days=3):
+def build_api_capture(args, logger, dirs):
+    """根据命令行参数创建接口捕获，DOM模式下返回None"""
+    if args.fetch_mode != "api":
+        return None
+    
+    return ApiCapture(dirs["data"] / "api_endpoints.json", logger=logger)
+
+def cleanup_cache_files(dirs, logger, max_files=100, keep_days=3, max_bytes=0, budgets=None):
     """清理缓存文件，保留最新的文件
     
     参数:
@@ -126,11 +182,11 @@ def cleanup_cache_files(dirs, logger, max_files=100, keep_days=3):
         logger: 日志记录器
         max_files: 每个目录保留的最大文件数
         keep_days: 保留多少天以内的文件
+        max_bytes: 每个目录保留的最大字节数，0表示不限制
+        budgets: 单独设置的目录预算 {目录名: (最大文件数, 最大字节数)}，覆盖max_files和max_bytes
     """
     logger.info("开始清理缓存文件...")
-    
-    # 计算截止日期
-    cutoff_date = datetime.datetime.now() - datetime.timedelta(days=keep_days)
+    budgets = budgets or {}
     
     # 需要清理的目录
     cache_dirs = ["screenshots", "html_cache", "logs"]
@@ -138,51 +194,362 @@ def cleanup_cache_files(dirs, logger, max_files=100, keep_days=3):
     for dir_name in cache_dirs:
         if dir_name not in dirs:
             continue
-            
-        dir_path = dirs[dir_name]
-        logger.info(f"清理 {dir_name} 目录...")
         
-        # 获取所有文件
-        all_files = []
-        for ext in ["*.*", "*.png", "*.html", "*.log", "*.json"]:
-            all_files.extend(glob.glob(str(dir_path / ext)))
+        dir_max_files, dir_max_bytes = budgets.get(dir_name, (max_files, max_bytes))
+        deleted_count, freed_bytes = apply_retention(
+            dirs[dir_name],
+            max_files=dir_max_files,
+            max_bytes=dir_max_bytes,
+            keep_days=keep_days,
+            logger=logger
+        )
+        logger.info(f"已清理 {dir_name} 目录中的 {deleted_count} 个文件，释放 {freed_bytes / 1024 / 1024:.1f} MB")
+    
+    logger.info("缓存文件清理完成")
+
+# 输出字段
+NEWS_FIELDS = [
+    'number', 'original_number', 'title', 'source', 'link',
+    'summary', 'pub_time', 'collect_time', 'news_id'
+]
+
+# 目标网站
+BASE_URL = "https://newsnow.busiyi.world"
+DEFAULT_URL = f"{BASE_URL}/c/hottest"
+
+# 新闻卡片选择器，与提取脚本保持一致
+CARD_SELECTOR = ".card, .article-card, .news-card, article, .item"
+
+# 新闻提取脚本，在页面中执行
+EXTRACT_NEWS_SCRIPT = """
+    () => {
+        const results = [];
         
-        # 如果文件数量少于最大值，不需要清理
-        if len(all_files) <= max_files:
-            logger.info(f"{dir_name} 目录文件数量 ({len(all_files)}) 未超过上限 ({max_files})，无需清理")
-            continue
+        // 查找所有卡片元素
+        const cards = document.querySelectorAll('.card, .article-card, .news-card, article, .item');
         
-        # 获取文件信息
-        file_info = []
-        for file_path in all_files:
-            try:
-                file_stat = os.stat(file_path)
-                file_date = datetime.datetime.fromtimestamp(file_stat.st_mtime)
-                file_info.append((file_path, file_date))
-            except Exception as e:
-                logger.warning(f"获取文件信息出错: {file_path}, {str(e)}")
+        if (cards.length > 0) {
+            console.log("找到 " + cards.length + " 个卡片元素");
+            
+            for (const card of cards) {
+                // 获取标题
+                let title = '';
+                const titleElement = card.querySelector('h2, h3, h4, .title, [class*="title"], a');
+                if (titleElement) {
+                    title = titleElement.textContent.trim();
+                }
+                
+                // 获取链接
+                let link = '';
+                const linkElement = card.querySelector('a');
+                if (linkElement && linkElement.href) {
+                    link = linkElement.href;
+                }
+                
+                // 获取来源（尝试更多的选择器）
+                let source = '';
+                const sourceElement = card.querySelector('.source, [class*="source"], .author, [class*="author"], .publisher, .site, .domain, .hostname, [class*="hostname"], [class*="domain"], [class*="site"]');
+                if (sourceElement) {
+                    source = sourceElement.textContent.trim();
+                }
+                
+                // 获取发布时间
+                let pubTime = '';
+                const timeElement = card.querySelector('time, .time, .date, [class*="time"], [class*="date"], [datetime]');
+                if (timeElement) {
+                    if (timeElement.hasAttribute('datetime')) {
+                        pubTime = timeElement.getAttribute('datetime');
+                    } else {
+                        pubTime = timeElement.textContent.trim();
+                    }
+                }
+                
+                // 获取摘要/简介
+                let summary = '';
+                const summaryElement = card.querySelector('.summary, .description, .abstract, .content, [class*="summary"], [class*="description"], [class*="abstract"], [class*="content"]');
+                if (summaryElement && summaryElement !== titleElement) {
+                    summary = summaryElement.textContent.trim();
+                }
+                
+                // 只有当标题不为空时才添加
+                if (title) {
+                    results.push({
+                        title: title,
+                        link: link,
+                        source: source || '',
+                        pubTime: pubTime || '',
+                        summary: summary || ''
+                    });
+                }
+            }
+        } else {
+            // 如果找不到卡片元素，尝试查找所有可能的链接
+            console.log("未找到卡片元素，尝试查找链接...");
+            const links = document.querySelectorAll('a');
+            
+            for (const link of links) {
+                // 过滤掉导航链接和空链接
+                if (link.textContent.trim() && 
+                    !link.href.includes('#') && 
+                    link.textContent.length > 10 &&
+                    !link.href.includes('javascript:')) {
+                    
+                    results.push({
+                        title: link.textContent.trim(),
+                        link: link.href,
+                        source: '',
+                        pubTime: '',
+                        summary: ''
+                    });
+                }
+            }
+        }
         
-        # 按修改时间排序
-        file_info.sort(key=lambda x: x[1], reverse=True)
+        // 去重，以标题为键
+        const uniqueResults = [];
+        const seenTitles = new Set();
         
-        # 删除超过保留天数的文件和超过数量限制的文件
-        deleted_count = 0
-        for file_path, file_date in file_info:
-            # 保留最近的文件
-            if file_info.index((file_path, file_date)) < max_files and file_date > cutoff_date:
-                continue
-                
+        for (const item of results) {
+            if (!seenTitles.has(item.title)) {
+                seenTitles.add(item.title);
+                uniqueResults.push(item);
+            }
+        }
+        
+        console.log("找到 " + uniqueResults.length + " 条唯一新闻");
+        return uniqueResults;
+    }
+"""
+
+async def fetch_page_news(page, url, logger, dirs, timestamp, screenshot_policy=None, save_html=True, snapshot_store=None, change_detector=None, pipeline=None):
+    """访问页面并提取原始新闻数据
+    
+    参数:
+        page: 浏览器页面
+        url: 目标URL
+        logger: 日志记录器
+        dirs: 目录映射
+        timestamp: 本次采集的时间戳（用于文件命名）
+        screenshot_policy: 截图策略（ScreenshotPolicy），为空时不截图
+        save_html: 是否保存HTML内容
+        snapshot_store: HTML快照存储（SnapshotStore），为空时保存为未压缩的HTML文件
+        change_detector: 变化检测（ChangeDetector），热榜与上一周期相同时不再提取，返回空列表
+        pipeline: 后处理阶段（PostProcessPipeline），提供时HTML在后台线程中压缩和保存，不阻塞事件循环
+    """
+    logger.info(f"访问URL: {url}")
+    start_time = time.time()
+    with METRICS.span("goto"):
+        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    logger.info(f"页面加载完成，耗时: {time.time() - start_time:.2f} 秒")
+    
+    # 滚动页面加载更多内容，卡片数量稳定后立即停止
+    logger.info("滚动页面加载更多内容")
+    with METRICS.span("scroll"):
+        await scroll_until_stable(page, CARD_SELECTOR, logger=logger)
+    
+    # 在页面内计算标题和链接列表的指纹，与上一周期相同时跳过保存和提取
+    if change_detector is not None:
+        with METRICS.span("fingerprint"):
+            result = await page.evaluate(FINGERPRINT_SCRIPT)
+        if change_detector.check(url, result and result["fingerprint"]):
+            logger.info(f"热榜与上一周期相同（{result['count']} 条），跳过提取")
+            return []
+    
+    # 保存HTML内容，后处理阶段中保存时不等待保存完成
+    if save_html:
+        with METRICS.span("save_html"):
+            html_content = await page.content()
+            if snapshot_store is not None:
+                # 压缩后按内容哈希保存，与之前相同的页面不重复保存
+                if pipeline is not None:
+                    future = await pipeline.submit(snapshot_store.put, html_content, timestamp, url)
+                    future.add_done_callback(lambda f: log_save_result(f, logger))
+                else:
+                    digest, is_new = snapshot_store.put(html_content, timestamp, url=url)
+                    logger.info(f"HTML快照{'已保存' if is_new else '与已有快照相同'}：{digest[:12]}")
+            else:
+                html_path = dirs["html_cache"] / f"page_content_{timestamp}.html"
+                if pipeline is not None:
+                    future = await pipeline.submit(html_path.write_text, html_content, "utf-8")
+                    future.add_done_callback(lambda f: log_save_result(f, logger))
+                else:
+                    html_path.write_text(html_content, encoding="utf-8")
+                logger.info(f"HTML内容保存至：{html_path}")
+    
+    # 提取新闻标题和链接
+    logger.info("提取新闻数据...")
+    with METRICS.span("evaluate"):
+        news_data = await page.evaluate(EXTRACT_NEWS_SCRIPT)
+    
+    # 按截图策略保存当前页面状态，如新闻数量异常时
+    if screenshot_policy is not None and screenshot_policy.should_capture("state", news_count=len(news_data), key=url):
+        try:
+            screenshot_path = await screenshot_policy.capture(page, dirs["screenshots"], f"page_state_{timestamp}")
+            logger.info(f"页面截图保存至：{screenshot_path}")
+        except Exception as e:
+            logger.warning(f"保存页面截图失败: {str(e)}")
+    
+    return news_data
+
+def log_save_result(future, logger):
+    """记录后台保存HTML的结果"""
+    if future.cancelled():
+        return
+    if future.exception() is not None:
+        logger.warning(f"保存HTML内容失败: {str(future.exception())}")
+        return
+    if isinstance(future.result(), tuple):
+        digest, is_new = future.result()
+        logger.info(f"HTML快照{'已保存' if is_new else '与已有快照相同'}：{digest[:12]}")
+
+async def crawl_page(pool, url, logger, dirs, timestamp, screenshot_policy=None, save_html=True, api_capture=None, snapshot_store=None, change_detector=None, pipeline=None):
+    """从浏览器池借出页面完成一次DOM采集，出错时保存错误截图
+    
+    参数:
+        pool: 浏览器池
+        url: 目标URL
+        logger: 日志记录器
+        dirs: 目录映射
+        timestamp: 本次采集的时间戳（用于文件命名）
+        screenshot_policy: 截图策略（ScreenshotPolicy），为空时不截图
+        save_html: 是否保存HTML内容
+        api_capture: 接口捕获（ApiCapture），提供时在采集过程中学习新闻接口
+        snapshot_store: HTML快照存储（SnapshotStore）
+        change_detector: 变化检测（ChangeDetector）
+        pipeline: 后处理阶段（PostProcessPipeline）
+    """
+    responses = None
+    async with pool.page() as page:
+        if api_capture is not None:
+            responses = api_capture.attach(page)
+        
+        try:
+            news_data = await fetch_page_news(
+                page, url, logger, dirs, timestamp,
+                screenshot_policy=screenshot_policy,
+                save_html=save_html,
+                snapshot_store=snapshot_store,
+                change_detector=change_detector,
+                pipeline=pipeline
+            )
+        except Exception:
+            # 尝试截图保存错误状态
+            try:
+                if screenshot_policy is not None and screenshot_policy.should_capture("error"):
+                    error_screenshot_path = await screenshot_policy.capture(
+                        page, dirs["screenshots"], f"error_{timestamp}", clip=False
+                    )
+                    logger.info(f"错误状态截图保存至: {error_screenshot_path}")
+            except:
+                logger.error("无法保存错误状态截图")
+            raise
+    
+    if api_capture is not None and news_data:
+        api_capture.learn(url, news_data, responses)
+    
+    return news_data
+
+async def crawl_target(pool, url, logger, dirs, file_tag, semaphore, timeout=90, retries=1, **kwargs):
+    """在并发限制下采集单个目标页面，带超时和重试
+    
+    参数:
+        pool: 浏览器池
+        url: 目标URL
+        logger: 日志记录器
+        dirs: 目录映射
+        file_tag: 截图和HTML文件名中使用的标记
+        semaphore: 限制同时采集页面数的信号量
+        timeout: 单次采集超时时间（秒）
+        retries: 失败后的重试次数
+        **kwargs: 传给crawl_page的其他参数
+    
+    返回:
+        tuple: (新闻列表, 该目标的耗时统计)
+    """
+    timing = {"url": url, "attempts": 0, "success": False, "news_count": 0}
+    start_time = time.time()
+    news_data = []
+    
+    async with semaphore:
+        for attempt in range(retries + 1):
+            timing["attempts"] = attempt + 1
             try:
-                os.remove(file_path)
-                deleted_count += 1
+                news_data = await asyncio.wait_for(
+                    crawl_page(pool, url, logger, dirs, file_tag, **kwargs),
+                    timeout=timeout
+                )
+                timing["success"] = True
+                break
+            except asyncio.TimeoutError:
+                timing["error"] = f"超时（{timeout} 秒）"
+                logger.warning(f"采集 {url} 超时（第 {attempt + 1} 次）")
             except Exception as e:
-                logger.warning(f"删除文件出错: {file_path}, {str(e)}")
-        
-        logger.info(f"已清理 {dir_name} 目录中的 {deleted_count} 个文件")
+                timing["error"] = str(e)
+                logger.warning(f"采集 {url} 失败（第 {attempt + 1} 次）: {str(e)}")
     
-    logger.info("缓存文件清理完成")
+    if timing["success"]:
+        timing.pop("error", None)
+    timing["news_count"] = len(news_data or [])
+    timing["elapsed"] = round(time.time() - start_time, 3)
+    return news_data or [], timing
+
+def target_tag(url):
+    """根据URL生成文件名标记，如 https://newsnow.busiyi.world/c/tech -> tech"""
+    path = urllib.parse.urlparse(url).path.strip("/")
+    tag = re.sub(r"[^\w-]+", "_", path.split("/")[-1] if path else "index")
+    return tag or "index"
 
-async def scrape_news(logger, dirs, save_mode="single", output_file=None, screenshot_enabled=True, save_html=True):
+def resolve_targets(targets):
+    """把分类名或路径补全为完整URL"""
+    urls = []
+    for target in targets:
+        if target.startswith(("http://", "https://")):
+            urls.append(target)
+        elif target.startswith("/"):
+            urls.append(f"{BASE_URL}{target}")
+        else:
+            urls.append(f"{BASE_URL}/c/{target}")
+    return urls
+
+def filter_new_rows(candidates, output_path, next_idx, news_index=None, dedup_filter=None):
+    """过滤已保存过的新闻，为新的新闻编号
+    
+    参数:
+        candidates: 标准化后的新闻行
+        output_path: 输出文件路径，跨天去重时查询同一目录下最近几天的索引
+        next_idx: 下一个序号
+        news_index: 当前输出文件的去重索引（NewsIndex）
+        dedup_filter: 跨天去重的滚动布隆过滤器（RollingBloomFilter）
+    
+    返回:
+        tuple: (新的新闻行, 下一个序号)
+    """
+    candidate_ids = [row['news_id'] for row in candidates]
+    existing_ids = set()
+    # 当前输出文件的索引总是精确查询，过滤器不完整时也不会重复写入
+    if news_index is not None:
+        existing_ids = news_index.existing(candidate_ids)
+    if dedup_filter is not None:
+        # 布隆过滤器判定一定是新的ID无需查询历史索引，可能重复的再查最近几天的索引
+        new_ids, maybe_ids = dedup_filter.split(candidate_ids)
+        remaining_ids = set(maybe_ids) - existing_ids
+        if remaining_ids:
+            existing_ids |= lookup_history(
+                output_path.parent, remaining_ids, dedup_filter.days,
+                exclude=news_index.index_path if news_index is not None else None
+            )
+        dedup_filter.record_lookup(len(new_ids), len(set(maybe_ids) - existing_ids))
+    
+    formatted_data = []
+    for row in candidates:
+        if row['news_id'] in existing_ids:
+            continue
+        row['number'] = next_idx  # 使用连续的序号
+        next_idx += 1  # 递增序号
+        formatted_data.append(row)
+    return formatted_data, next_idx
+
+async def scrape_news(logger, dirs, save_mode="single", output_file=None, screenshot_enabled=True, save_html=True, pool=None, request_filter=None, api_capture=None, urls=None, concurrency=4, target_timeout=90, target_retries=1, dedup_filter=None, output_format="csv", excel_enabled=True, ledger=None, snapshot_store=None, screenshot_policy=None, change_detector=None, news_index=None, pipeline=None):
     """爬取新闻数据
     
     参数:
@@ -190,382 +557,805 @@ async def scrape_news(logger, dirs, save_mode="single", output_file=None, screen
         dirs: 目录映射
         save_mode: 保存模式，'single'（单次）或'continuous'（连续）
         output_file: 输出文件路径（仅在连续模式下使用）
-        screenshot_enabled: 是否保存页面截图
+        screenshot_enabled: 是否保存页面截图，仅在未提供截图策略时使用（每个周期都截图）
         save_html: 是否保存HTML内容
+        pool: 浏览器池（BrowserPool），为空时本次采集临时启动并关闭浏览器
+        request_filter: 请求过滤器（RequestFilter），仅在未提供浏览器池时使用
+        api_capture: 接口捕获（ApiCapture），提供时优先直接请求新闻接口
+        urls: 目标URL列表，多个目标在同一个浏览器中并发采集，默认为热榜页面
+        concurrency: 同时采集的最大页面数
+        target_timeout: 单个目标的超时时间（秒）
+        target_retries: 单个目标失败后的重试次数
+        dedup_filter: 跨天去重的滚动布隆过滤器（RollingBloomFilter），仅在连续模式下使用
+        output_format: 输出格式，csv、jsonl或parquet
+        excel_enabled: 单次模式下是否同时导出Excel（需要pandas）
+        ledger: 运行记录（RunLedger），为空时本次采集临时打开logs/runs下的记录文件
+        snapshot_store: HTML快照存储（SnapshotStore），为空且需要保存HTML时临时打开html_cache下的存储
+        screenshot_policy: 截图策略（ScreenshotPolicy），在持续模式的各周期之间复用
+        change_detector: 变化检测（ChangeDetector），热榜未变化时跳过提取和写入，有变化时只处理新出现的新闻
+        news_index: 已打开的去重索引（NewsIndex），与输出文件对应时直接复用，否则本次采集临时打开
+        pipeline: 后处理阶段（PostProcessPipeline），提供时各目标采集完成后立即在进程池中标准化，
+                  快照保存、写文件和导出Excel在线程池中运行；为空时在事件循环中直接处理
     """
+    cycle_start = time.time()
+    METRICS.start_cycle()
+    
     # 获取当前日期和时间
     current_date = datetime.datetime.now().strftime("%Y-%m-%d")
     timestamp = get_timestamp()
     
     # 设置输出文件
     if save_mode == "continuous" and output_file:
-        csv_path = Path(output_file)
+        output_path = Path(output_file)
     else:
         # 单次模式下，使用时间戳生成唯一文件名
-        csv_path = dirs["data"] / f"news_{current_date}_{timestamp}.csv"
-    
-    # 检查文件是否存在（用于判断是否需要写入表头）
-    is_new_file = not csv_path.exists()
+        output_path = dirs["data"] / f"news_{current_date}_{timestamp}{FORMAT_SUFFIXES[output_format]}"
     
-    # 读取现有数据（用于去重和确定起始序号）
-    existing_ids = set()
+    # 持续模式下通过索引去重和确定起始序号，不再读取整个CSV文件
+    own_index = False
     next_idx = 1  # 默认从1开始
     
-    if not is_new_file and save_mode == "continuous":
+    if save_mode != "continuous":
+        dedup_filter = None
+        news_index = None
+    else:
+        if news_index is not None and news_index.csv_path != output_path:
+            news_index = None
         try:
-            df_existing = pd.read_csv(csv_path, encoding="utf-8-sig")
-            if "news_id" in df_existing.columns:
-                existing_ids = set(df_existing["news_id"].dropna().tolist())
-            
-            # 确定下一个序号
-            if "number" in df_existing.columns and not df_existing.empty:
-                # 找到最大序号并加1
-                next_idx = int(df_existing["number"].max()) + 1
-            
-            logger.info(f"读取到 {len(existing_ids)} 条现有记录用于去重")
+            if news_index is None:
+                news_index = NewsIndex(output_path, logger=logger)
+                own_index = True
+            next_idx = news_index.last_number + 1
+            logger.info(f"索引中已有 {len(news_index)} 条记录用于去重")
         except Exception as e:
-            logger.warning(f"读取现有数据失败: {str(e)}")
+            logger.warning(f"打开去重索引失败: {str(e)}")
     
     # 当前采集时间
     collect_time = get_current_time()
     
-    async with async_playwright() as p:
-        try:
-            logger.info("开始新闻爬取流程")
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(viewport={"width": 1920, "height": 1080})
-            page = await context.new_page()
+    # 未提供浏览器池时，本次采集使用临时浏览器池
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool(logger=logger, max_pages=concurrency, request_filter=request_filter)
+    
+    # 每个周期的摘要追加到运行记录中
+    own_ledger = ledger is None
+    if own_ledger:
+        ledger = RunLedger(dirs["logs"] / "runs")
+    
+    if screenshot_policy is None:
+        screenshot_policy = ScreenshotPolicy(mode="always" if screenshot_enabled else "never", logger=logger)
+    screenshot_policy.begin_cycle()
+    if change_detector is not None:
+        change_detector.begin_cycle()
+    
+    own_store = save_html and snapshot_store is None
+    if own_store:
+        snapshot_store = SnapshotStore(dirs["html_cache"] / "snapshots", logger=logger)
+    
+    urls = urls or [DEFAULT_URL]
+    target_timings = []
+    
+    # 每个周期单独统计被拦截的请求
+    if pool.request_filter is not None:
+        pool.request_filter.reset()
+    
+    try:
+        logger.info("开始新闻爬取流程")
+        news_data = None
+        normalized = None
+        launch_time = 0.0
+        collected_count = 0
+        # 本周期采集到的全部新闻（变化检测之前），全部记入跨天去重过滤器
+        collected_items = []
+        api_results = []
+        dom_urls = urls
+        
+        # 接口模式：已学习到接口的目标直接请求接口，其他目标和请求失败的目标回退到DOM采集
+        api_urls = [url for url in urls if api_capture is not None and api_capture.has_endpoints(url)]
+        if api_urls:
+            async def fetch_target_api(url):
+                start_time = time.time()
+                return await api_capture.fetch(url), round(time.time() - start_time, 3)
             
-            # 访问目标网站
-            url = "https://newsnow.busiyi.world/c/hottest"
-            logger.info(f"访问URL: {url}")
-            await page.goto(url, wait_until="networkidle", timeout=60000)
+            with METRICS.span("api_fetch"):
+                fetched = await asyncio.gather(*(fetch_target_api(url) for url in api_urls))
+            for url, (target_data, elapsed) in zip(api_urls, fetched):
+                if not target_data:
+                    continue
+                collected_count += len(target_data)
+                target_timings.append({
+                    "url": url, "attempts": 1, "success": True, "news_count": len(target_data),
+                    "elapsed": elapsed, "fetch_mode": "api"
+                })
+                collected_items.extend(target_data)
+                if change_detector is not None:
+                    # 接口数据在本地计算指纹，与页面内计算的指纹分开记录
+                    key = f"api:{url}"
+                    if change_detector.check(key, fingerprint_items(target_data)):
+                        target_timings[-1]["unchanged"] = True
+                        target_data = []
+                    else:
+                        target_data = change_detector.diff(key, target_data)
+                api_results.append(target_data)
+            fetched_urls = {timing["url"] for timing in target_timings}
+            dom_urls = [url for url in urls if url not in fetched_urls]
+        
+        if not dom_urls:
+            fetch_mode = "api"
+        elif api_results:
+            fetch_mode = "mixed"
+        else:
+            fetch_mode = "dom"
+        
+        # 合并各目标结果，以标题去重
+        news_data = []
+        seen_titles = set()
+        for target_data in api_results:
+            for item in target_data:
+                if item['title'] not in seen_titles:
+                    seen_titles.add(item['title'])
+                    news_data.append(item)
+        
+        if dom_urls:
+            # 有后处理阶段时接口数据也先标准化，与DOM目标的标准化结果按顺序合并
+            if pipeline is not None:
+                normalized = await pipeline.run(normalize_items, news_data, collect_time, cpu=True) if news_data else []
             
-            # 等待页面加载完成
-            await page.wait_for_load_state("networkidle")
-            logger.info("页面加载完成")
+            with METRICS.span("launch"):
+                launch_time = await pool.begin_cycle()
             
-            # 滚动页面加载更多内容
-            logger.info("滚动页面加载更多内容")
-            for _ in range(5):
-                await page.evaluate("window.scrollBy(0, 800)")
-                await page.wait_for_timeout(1000)
-                
-            # 再滚动一次确保加载完全
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(3000)
+            # 多个目标在同一个浏览器中并发采集
+            semaphore = asyncio.Semaphore(concurrency)
             
-            # 截图保存当前页面状态
-            if screenshot_enabled:
-                screenshot_path = dirs["screenshots"] / f"page_state_{timestamp}.png"
-                await page.screenshot(path=screenshot_path)
-                logger.info(f"页面截图保存至：{screenshot_path}")
+            async def collect_target(url):
+                target_data, timing = await crawl_target(
+                    pool, url, logger, dirs,
+                    timestamp if len(urls) == 1 else f"{timestamp}_{target_tag(url)}",
+                    semaphore,
+                    timeout=target_timeout,
+                    retries=target_retries,
+                    screenshot_policy=screenshot_policy,
+                    save_html=save_html,
+                    api_capture=api_capture,
+                    snapshot_store=snapshot_store,
+                    change_detector=change_detector,
+                    pipeline=pipeline
+                )
+                collected_items.extend(target_data)
+                if change_detector is not None and timing["success"]:
+                    if timing["url"] in change_detector.unchanged:
+                        timing["unchanged"] = True
+                    else:
+                        # 只处理上一周期没有出现过的新闻
+                        target_data = change_detector.diff(timing["url"], target_data)
+                # 有后处理阶段时，先完成的目标先标准化，与其他目标的页面采集重叠
+                rows = None
+                if pipeline is not None and target_data:
+                    rows = await pipeline.run(normalize_items, target_data, collect_time, cpu=True)
+                return target_data, rows, timing
             
-            # 保存HTML内容
-            if save_html:
-                html_path = dirs["html_cache"] / f"page_content_{timestamp}.html"
-                html_content = await page.content()
-                with open(html_path, "w", encoding="utf-8") as f:
-                    f.write(html_content)
-                logger.info(f"HTML内容保存至：{html_path}")
+            results = await asyncio.gather(*(collect_target(url) for url in dom_urls))
             
-            # 提取新闻标题和链接
-            logger.info("提取新闻数据...")
-            news_data = await page.evaluate("""
-            () => {
-                const results = [];
-                
-                // 查找所有卡片元素
-                const cards = document.querySelectorAll('.card, .article-card, .news-card, article, .item');
-                
-                if (cards.length > 0) {
-                    console.log("找到 " + cards.length + " 个卡片元素");
-                    
-                    for (const card of cards) {
-                        // 获取标题
-                        let title = '';
-                        const titleElement = card.querySelector('h2, h3, h4, .title, [class*="title"], a');
-                        if (titleElement) {
-                            title = titleElement.textContent.trim();
-                        }
-                        
-                        // 获取链接
-                        let link = '';
-                        const linkElement = card.querySelector('a');
-                        if (linkElement && linkElement.href) {
-                            link = linkElement.href;
-                        }
-                        
-                        // 获取来源（尝试更多的选择器）
-                        let source = '';
-                        const sourceElement = card.querySelector('.source, [class*="source"], .author, [class*="author"], .publisher, .site, .domain, .hostname, [class*="hostname"], [class*="domain"], [class*="site"]');
-                        if (sourceElement) {
-                            source = sourceElement.textContent.trim();
-                        }
-                        
-                        // 获取发布时间
-                        let pubTime = '';
-                        const timeElement = card.querySelector('time, .time, .date, [class*="time"], [class*="date"], [datetime]');
-                        if (timeElement) {
-                            if (timeElement.hasAttribute('datetime')) {
-                                pubTime = timeElement.getAttribute('datetime');
-                            } else {
-                                pubTime = timeElement.textContent.trim();
-                            }
-                        }
-                        
-                        // 获取摘要/简介
-                        let summary = '';
-                        const summaryElement = card.querySelector('.summary, .description, .abstract, .content, [class*="summary"], [class*="description"], [class*="abstract"], [class*="content"]');
-                        if (summaryElement && summaryElement !== titleElement) {
-                            summary = summaryElement.textContent.trim();
-                        }
-                        
-                        // 只有当标题不为空时才添加
-                        if (title) {
-                            results.push({
-                                title: title,
-                                link: link,
-                                source: source || '',
-                                pubTime: pubTime || '',
-                                summary: summary || ''
-                            });
-                        }
-                    }
-                } else {
-                    // 如果找不到卡片元素，尝试查找所有可能的链接
-                    console.log("未找到卡片元素，尝试查找链接...");
-                    const links = document.querySelectorAll('a');
-                    
-                    for (const link of links) {
-                        // 过滤掉导航链接和空链接
-                        if (link.textContent.trim() && 
-                            !link.href.includes('#') && 
-                            link.textContent.length > 10 &&
-                            !link.href.includes('javascript:')) {
-                            
-                            results.push({
-                                title: link.textContent.trim(),
-                                link: link.href,
-                                source: '',
-                                pubTime: '',
-                                summary: ''
-                            });
-                        }
-                    }
-                }
-                
-                // 去重，以标题为键
-                const uniqueResults = [];
-                const seenTitles = new Set();
-                
-                for (const item of results) {
-                    if (!seenTitles.has(item.title)) {
-                        seenTitles.add(item.title);
-                        uniqueResults.push(item);
-                    }
-                }
-                
-                console.log("找到 " + uniqueResults.length + " 条唯一新闻");
-                return uniqueResults;
-            }
-            """)
+            for target_data, rows, timing in results:
+                target_timings.append(timing)
+                collected_count += timing["news_count"]
+                for index, item in enumerate(target_data):
+                    if item['title'] not in seen_titles:
+                        seen_titles.add(item['title'])
+                        news_data.append(item)
+                        if normalized is not None:
+                            normalized.append(rows[index])
             
-            # 处理数据并保存
-            if news_data:
-                # 准备数据
-                formatted_data = []
-                
-                for item in news_data:
-                    # 清理文本字段
-                    title = clean_text(item['title'])
-                    link = item['link']
-                    
-                    # 从标题中提取序号并移除
-                    match = re.match(r'^(\d+)[.、\s]*(.+)$', title)
-                    if match:
-                        original_number = match.group(1)
-                        cleaned_title = clean_text(match.group(2))
-                    else:
-                        original_number = ""
-                        cleaned_title = title
-                    
-                    # 尝试获取有意义的来源
-                    source = clean_text(item['source'])
-                    if not source:
-                        source = extract_domain(link)
-                    
-                    # 生成新闻ID用于去重
-                    news_id = generate_news_id(cleaned_title, link)
-                    
-                    # 检查是否为重复新闻
-                    if news_id in existing_ids:
-                        continue
-                    
-                    # 格式化数据
-                    formatted_data.append({
-                        'number': next_idx,  # 使用连续的序号
-                        'original_number': original_number,
-                        'title': cleaned_title,
-                        'source': source,
-                        'link': link,
-                        'summary': clean_text(item.get('summary', '')),
-                        'pub_time': clean_text(item.get('pubTime', '')),
-                        'collect_time': collect_time,
-                        'news_id': news_id
-                    })
-                    
-                    next_idx += 1  # 递增序号
-                
-                # 创建DataFrame
-                df = pd.DataFrame(formatted_data)
-                
-                # 保存为CSV
-                if is_new_file or save_mode == "single":
-                    # 新文件或单次模式：写入表头
-                    df.to_csv(
-                        csv_path, 
-                        index=False, 
-                        encoding='utf-8-sig',
-                        quoting=csv.QUOTE_ALL
+            if len(urls) > 1:
+                for timing in target_timings:
+                    logger.info(
+                        f"目标 {timing['url']}: {timing['news_count']} 条，"
+                        f"耗时 {timing['elapsed']:.2f} 秒，尝试 {timing['attempts']} 次"
                     )
-                else:
-                    # 增量模式：追加数据
-                    df.to_csv(
-                        csv_path, 
-                        mode='a', 
-                        index=False, 
-                        encoding='utf-8-sig',
-                        header=False,
-                        quoting=csv.QUOTE_ALL
-                    )
-                
-                # 生成摘要信息
-                summary_info = {
-                    "timestamp": collect_time,
-                    "total_news": len(news_data),
-                    "new_news": len(formatted_data),
-                    "file_path": str(csv_path)
-                }
+        
+        # 热榜未变化或没有新出现的新闻时，跳过后处理和写入
+        unchanged_cycle = (
+            change_detector is not None and not news_data
+            and (collected_count > 0 or bool(change_detector.unchanged))
+        )
+        
+        # 处理数据并保存
+        if unchanged_cycle:
+            # 没有新出现的新闻，但仍在榜上的新闻要记入今天的过滤器
+            if dedup_filter is not None and collected_items:
+                dedup_filter.add(news_ids(collected_items))
+                dedup_filter.save()
+            change_detector.commit()
+            cycle_time = time.time() - cycle_start
+            METRICS.observe("cycle", cycle_time)
+            METRICS.inc("cycles_total", result="unchanged")
+            METRICS.inc("news_items_total", collected_count, kind="collected")
+            phase_timings = METRICS.cycle_timings()
+            logger.info("热榜没有新出现的新闻，跳过后处理和写入")
+            
+            ledger.append({
+                "timestamp": collect_time,
+                "success": True,
+                "unchanged": True,
+                "total_news": collected_count,
+                "new_news": 0,
+                "file_path": str(output_path),
+                "launch_time": round(launch_time, 3),
+                "cycle_time": round(cycle_time, 3),
+                "browser_launch_count": pool.launch_count,
+                "fetch_mode": fetch_mode,
+                "targets": target_timings,
+                "phase_timings": phase_timings
+            })
+            return {
+                "success": True,
+                "unchanged": True,
+                "news_count": 0,
+                "file_path": str(output_path),
+                "launch_time": launch_time,
+                "cycle_time": cycle_time,
+                "phase_timings": phase_timings
+            }
+        elif news_data:
+            with METRICS.span("post_process"):
+                # 批量标准化：清理文本、拆分序号、识别来源、生成新闻ID
+                candidates = normalized
+                if candidates is None:
+                    candidates = await offload(pipeline, normalize_items, news_data, collect_time, cpu=True)
                 
-                # 保存执行摘要
-                summary_path = dirs["logs"] / f"summary_{timestamp}.json"
-                with open(summary_path, "w", encoding="utf-8") as f:
-                    json.dump(summary_info, f, ensure_ascii=False, indent=2)
+                # 只查询本次采集到的ID，过滤重复新闻
+                formatted_data, next_idx = filter_new_rows(candidates, output_path, next_idx, news_index, dedup_filter)
+            
+            # 逐行写入输出文件，新文件自动写入表头
+            if formatted_data:
+                with METRICS.span("write"):
+                    await offload(
+                        pipeline, write_rows, output_format, output_path,
+                        formatted_data, NEWS_FIELDS, save_mode == "continuous"
+                    )
+            
+            with METRICS.span("index_update"):
+                # 写入成功后更新索引
+                if news_index is not None:
+                    news_index.add((row['news_id'] for row in formatted_data), next_idx - 1)
                 
-                logger.info(f"成功保存 {len(formatted_data)} 条新闻数据到: {csv_path}")
+                # 本次出现的新闻都记入今天的过滤器（包括变化检测跳过的新闻），
+                # 持续多天的热点始终留在时间窗口内
+                if dedup_filter is not None:
+                    dedup_filter.add(news_ids(collected_items))
+                    dedup_filter.save()
                 
-                # 单次模式下，同时保存Excel格式以便查看
-                if save_mode == "single":
-                    excel_path = csv_path.with_suffix(".xlsx")
-                    df.to_excel(excel_path, index=False, engine='openpyxl')
+                # 写入成功后才记录本周期的指纹和新闻列表
+                if change_detector is not None:
+                    change_detector.commit()
+            
+            # 单次模式下，同时保存Excel格式以便查看
+            if save_mode == "single" and excel_enabled:
+                excel_path = output_path.with_suffix(".xlsx")
+                try:
+                    with METRICS.span("excel"):
+                        await offload(pipeline, export_excel, formatted_data, excel_path, NEWS_FIELDS)
                     logger.info(f"成功保存Excel格式数据到: {excel_path}")
-                
-                # 返回爬取摘要
-                return {
-                    "success": True,
-                    "news_count": len(formatted_data),
-                    "file_path": str(csv_path)
-                }
-            else:
-                logger.warning("未找到新闻数据，请检查网页结构是否改变")
-                return {
-                    "success": False,
-                    "news_count": 0,
-                    "file_path": None
-                }
-                
-        except Exception as e:
-            logger.error(f"爬取过程中发生错误: {str(e)}")
-            # 尝试截图保存错误状态
-            try:
-                if screenshot_enabled:
-                    error_screenshot_path = dirs["screenshots"] / f"error_{timestamp}.png"
-                    await page.screenshot(path=error_screenshot_path)
-                    logger.info(f"错误状态截图保存至: {error_screenshot_path}")
-            except:
-                logger.error("无法保存错误状态截图")
+                except ImportError:
+                    logger.warning("未安装pandas/openpyxl，跳过Excel导出")
             
-            # 关闭浏览器
-            try:
-                await browser.close()
-            except:
-                pass
+            cycle_time = time.time() - cycle_start
+            METRICS.observe("cycle", cycle_time)
+            METRICS.inc("cycles_total", result="success")
+            METRICS.inc("news_items_total", collected_count, kind="collected")
+            METRICS.inc("news_items_total", len(formatted_data), kind="new")
+            phase_timings = METRICS.cycle_timings()
+            logger.info("各阶段耗时: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in phase_timings.items()))
+            
+            # 生成摘要信息
+            summary_info = {
+                "timestamp": collect_time,
+                "success": True,
+                "total_news": collected_count,
+                # 启用变化检测时只处理上一周期没有出现过的新闻
+                "changed_news": len(news_data),
+                "new_news": len(formatted_data),
+                "file_path": str(output_path),
+                # 浏览器启动耗时与整个周期耗时分开统计
+                "launch_time": round(launch_time, 3),
+                "cycle_time": round(cycle_time, 3),
+                "browser_launch_count": pool.launch_count,
+                "fetch_mode": fetch_mode,
+                "targets": target_timings,
+                # 本周期各阶段耗时（秒），并发采集多个目标时为累计值
+                "phase_timings": phase_timings,
+                # 进程启动以来各阶段耗时的90分位数（按直方图分桶估算）
+                "phase_p90": {phase: METRICS.percentiles(phase)["p90"] for phase in phase_timings}
+            }
+            if dedup_filter is not None:
+                summary_info.update(dedup_filter.stats())
+            if pipeline is not None:
+                summary_info.update(pipeline.stats())
+            if pool.request_filter is not None:
+                filter_stats = pool.request_filter.stats()
+                summary_info.update(filter_stats)
+                logger.info(
+                    f"本次拦截 {filter_stats['blocked_requests']} 个请求，"
+                    f"估计节省 {filter_stats['bytes_saved_estimated'] / 1024:.0f} KB"
+                )
+            
+            # 追加到运行记录
+            ledger.append(summary_info)
             
+            logger.info(f"成功保存 {len(formatted_data)} 条新闻数据到: {output_path}")
+            
+            # 返回爬取摘要
+            return {
+                "success": True,
+                "news_count": len(formatted_data),
+                "file_path": str(output_path),
+                "launch_time": launch_time,
+                "cycle_time": cycle_time,
+                "phase_timings": phase_timings
+            }
+        else:
+            logger.warning("未找到新闻数据，请检查网页结构是否改变")
+            METRICS.observe("cycle", time.time() - cycle_start)
+            METRICS.inc("cycles_total", result="empty")
+            ledger.append({
+                "timestamp": collect_time,
+                "success": False,
+                "total_news": 0,
+                "new_news": 0,
+                "cycle_time": round(time.time() - cycle_start, 3),
+                "fetch_mode": fetch_mode,
+                "targets": target_timings
+            })
             return {
                 "success": False,
                 "news_count": 0,
-                "file_path": None,
-                "error": str(e)
+                "file_path": None
             }
-        finally:
-            # 确保浏览器关闭
-            try:
-                await browser.close()
-                logger.info("浏览器已关闭")
-            except:
-                pass
+            
+    except Exception as e:
+        logger.error(f"爬取过程中发生错误: {str(e)}")
+        METRICS.observe("cycle", time.time() - cycle_start)
+        METRICS.inc("cycles_total", result="error")
+        try:
+            ledger.append({
+                "timestamp": collect_time,
+                "success": False,
+                "total_news": 0,
+                "new_news": 0,
+                "cycle_time": round(time.time() - cycle_start, 3),
+                "targets": target_timings,
+                "error": str(e)
+            })
+        except Exception as ledger_error:
+            logger.warning(f"写入运行记录失败: {str(ledger_error)}")
+        return {
+            "success": False,
+            "news_count": 0,
+            "file_path": None,
+            "error": str(e)
+        }
+    finally:
+        # 等待后台保存的快照写完，再关闭临时打开的存储
+        if pipeline is not None:
+            await pipeline.drain()
+        # 临时浏览器池在本次采集后关闭
+        if own_pool:
+            await pool.close()
+        if own_index:
+            news_index.close()
+        if own_ledger:
+            ledger.close()
+        if own_store:
+            snapshot_store.close()
+        
+        # 直方图在各周期之间累计，导出为Prometheus文本文件
+        try:
+            METRICS.write_prometheus(dirs["logs"] / "metrics.prom")
+        except Exception as e:
+            logger.warning(f"写入指标文件失败: {str(e)}")
 
 async def run_continuous_mode(args, logger, dirs):
     """持续运行模式"""
-    # 设置输出文件名
-    if args.output:
-        output_file = args.output
-    else:
+    # 设置输出文件名，未指定时每天使用新的文件
+    def get_output_file():
+        if args.output:
+            return args.output
         current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-        output_file = str(dirs["data"] / f"continuous_news_{current_date}.csv")
+        return str(dirs["data"] / f"continuous_news_{current_date}{FORMAT_SUFFIXES[args.output_format]}")
     
+    output_file = get_output_file()
     logger.info(f"启动持续采集模式，数据将保存至: {output_file}")
     logger.info(f"采集间隔: {args.interval} 分钟")
     
-    # 缓存和截图设置
-    screenshot_enabled = not args.no_screenshots
+    # 缓存和截图设置，截图策略在各周期之间复用
+    screenshot_policy = build_screenshot_policy(args, logger)
     save_html = not args.no_html_cache
     
     # 自动清理频率（每N次采集执行一次清理）
     cleanup_frequency = 10
+    cleaner = BackgroundCleaner(logger)
+    
+    # 浏览器在各周期之间复用，按周期数或内存上限回收
+    pool = BrowserPool(
+        logger=logger,
+        max_pages=args.concurrency,
+        recycle_cycles=args.recycle_cycles,
+        max_memory_mb=args.max_browser_memory,
+        request_filter=build_request_filter(args)
+    )
+    api_capture = build_api_capture(args, logger, dirs)
+    dedup_filter = build_dedup_filter(args, logger, dirs)
+    # 运行记录文件在各周期之间保持打开，按批fsync
+    ledger = RunLedger(dirs["logs"] / "runs")
+    snapshot_store = SnapshotStore(dirs["html_cache"] / "snapshots", logger=logger) if save_html else None
+    # 热榜未变化的周期跳过提取和写入
+    change_detector = None if args.no_change_detection else ChangeDetector()
+    adaptive_interval = build_adaptive_interval(args, logger, dirs)
+    # 标准化、快照压缩和写文件交给进程池/线程池，事件循环只负责浏览器I/O
+    pipeline = build_pipeline(args, logger)
     
     cycle_count = 0
+    current_day = datetime.date.today()
+    
+    async def run_cycle(tick):
+        """运行一个采集周期"""
+        nonlocal cycle_count, output_file, current_day
+        cycle_count += 1
+        start_time = time.time()
+        
+        logger.info(f"开始第 {cycle_count} 次采集")
+        
+        # 跨天处理按日期判断，指定了--output时输出文件不变，但仍需要重置变化检测和归档
+        if datetime.date.today() != current_day:
+            current_day = datetime.date.today()
+            if get_output_file() != output_file:
+                output_file = get_output_file()
+                logger.info(f"日期已变更，数据将保存至: {output_file}")
+            else:
+                logger.info("日期已变更")
+        
+            # 新的一天完整处理一次当前热榜：新的输出文件需要完整写入，
+            # 仍在榜上的新闻也要记入今天的去重过滤器
+            if change_detector is not None:
+                change_detector.reset()
+        
+            # 归档已结束日期的数据，在线程中执行避免阻塞采集
+            if args.archive:
+                try:
+                    results = await asyncio.to_thread(
+                        compact_closed_days, dirs["data"], dirs["data"] / "archive"
+                    )
+                    logger.info(f"已归档 {len(results)} 天的数据")
+                except Exception as e:
+                    logger.warning(f"数据归档失败: {str(e)}")
+        
+        # 定期清理缓存文件
+        if cycle_count % cleanup_frequency == 0:
+            cleanup_options = dict(
+                max_files=args.max_cache_files,
+                keep_days=args.cache_days,
+                max_bytes=int(args.max_cache_mb * 1024 * 1024),
+                budgets=parse_budgets(args.cache_budget)
+            )
+            if args.background_cleanup:
+                cleaner.submit(cleanup_cache_files, dirs, logger, **cleanup_options)
+            else:
+                cleanup_cache_files(dirs, logger, **cleanup_options)
+        
+            # 删除过期的HTML快照，不再被引用的压缩文件一并删除
+            if snapshot_store is not None:
+                deleted_snapshots, deleted_blobs = snapshot_store.prune(
+                    keep_days=args.cache_days, max_snapshots=args.max_cache_files
+                )
+                logger.info(f"已清理 {deleted_snapshots} 个HTML快照记录，{deleted_blobs} 个快照文件")
+        
+        result = await scrape_news(
+            logger=logger,
+            dirs=dirs,
+            save_mode="continuous",
+            output_file=output_file,
+            screenshot_policy=screenshot_policy,
+            save_html=save_html,
+            pool=pool,
+            api_capture=api_capture,
+            dedup_filter=dedup_filter,
+            output_format=args.output_format,
+            ledger=ledger,
+            snapshot_store=snapshot_store,
+            change_detector=change_detector,
+            pipeline=pipeline,
+            **target_options(args)
+        )
+        
+        # 计算耗时
+        elapsed_time = time.time() - start_time
+        logger.info(f"第 {cycle_count} 次采集完成，耗时: {elapsed_time:.2f} 秒")
+        if result.get("launch_time"):
+            logger.info(f"其中浏览器启动耗时: {result['launch_time']:.2f} 秒")
+        
+        if result.get("unchanged"):
+            logger.info("热榜与上一周期相比没有变化")
+        elif result["success"]:
+            logger.info(f"成功采集 {result['news_count']} 条新新闻")
+        else:
+            logger.warning("本次采集未获取到新数据")
+        
+        # 自适应模式下按新增速率和出错情况调整之后的间隔
+        if adaptive_interval is not None:
+            adaptive_interval.observe(new_items=result["news_count"], success=result["success"])
+        
+        next_run_time = datetime.datetime.fromtimestamp(scheduler.next_tick(tick))
+        logger.info(f"下一次采集预计时间: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # 采集时间点对齐到间隔的整数倍，单次采集超时不会推迟之后的时间点；
+    # 各周期共享浏览器、索引和变化检测状态，同一时间只运行一个周期
+    scheduler = TickScheduler(
+        run_cycle,
+        interval=adaptive_interval.next_interval if adaptive_interval is not None else args.interval * 60,
+        policy=args.tick_policy,
+        jitter=args.jitter,
+        logger=logger
+    )
+    
     try:
+        await scheduler.run()
+    
+    except KeyboardInterrupt:
+        logger.info("用户中断，程序退出")
+    except Exception as e:
+        logger.error(f"持续模式运行时发生错误: {str(e)}")
+    finally:
+        await pool.close()
+        if pipeline is not None:
+            await pipeline.close()
+        ledger.close()
+        if snapshot_store is not None:
+            snapshot_store.close()
+        if api_capture is not None:
+            await api_capture.close()
+
+async def run_coordinator_mode(args, logger, dirs):
+    """协调模式：按周期把目标放入任务队列，把采集进程提交的结果去重后写入输出文件
+    
+    只有协调进程写入data/下的输出文件和去重索引，采集进程可以运行在其他机器上
+    """
+    def get_output_path():
+        if args.output:
+            return Path(args.output)
+        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        return dirs["data"] / f"continuous_news_{current_date}{FORMAT_SUFFIXES[args.output_format]}"
+    
+    urls = target_options(args)["urls"]
+    queue = build_queue(args, logger)
+    dedup_filter = build_dedup_filter(args, logger, dirs)
+    ledger = RunLedger(dirs["logs"] / "runs")
+    news_index = None
+    cycle_count = 0
+    logger.info(f"启动协调模式，任务队列: {args.queue}，共 {len(urls)} 个目标")
+    
+    def export_results():
+        """把未导出的结果去重、编号后追加到输出文件，返回新写入的新闻数"""
+        nonlocal news_index
+        output_path = get_output_path()
+        if news_index is None or news_index.csv_path != output_path:
+            if news_index is not None:
+                news_index.close()
+            news_index = NewsIndex(output_path, logger=logger)
+        
+        exported = 0
         while True:
-            cycle_count += 1
-            start_time = time.time()
+            batch = queue.pending_results()
+            if not batch:
+                break
+            candidates = [row for _, row in batch]
             
-            logger.info(f"开始第 {cycle_count} 次采集")
+            with METRICS.span("post_process"):
+                formatted_data, next_idx = filter_new_rows(
+                    candidates, output_path, news_index.last_number + 1, news_index, dedup_filter
+                )
+            if formatted_data:
+                with METRICS.span("write"):
+                    write_rows(args.output_format, output_path, formatted_data, NEWS_FIELDS)
             
-            # 定期清理缓存文件
-            if cycle_count % cleanup_frequency == 0:
-                cleanup_cache_files(dirs, logger, max_files=args.max_cache_files, keep_days=args.cache_days)
+            # 依次更新索引、过滤器和导出标记；中途退出时重新导出的结果由索引去重
+            with METRICS.span("index_update"):
+                news_index.add((row['news_id'] for row in formatted_data), next_idx - 1)
+                if dedup_filter is not None:
+                    dedup_filter.add([row['news_id'] for row in candidates])
+                    dedup_filter.save()
+                queue.mark_exported(key for key, _ in batch)
             
-            result = await scrape_news(
-                logger=logger,
-                dirs=dirs,
-                save_mode="continuous",
-                output_file=output_file,
-                screenshot_enabled=screenshot_enabled,
-                save_html=save_html
+            exported += len(formatted_data)
+            METRICS.inc("news_items_total", len(formatted_data), kind="new")
+        
+        if exported:
+            logger.info(f"成功保存 {exported} 条新闻数据到: {output_path}")
+        return exported
+    
+    async def export_loop():
+        while True:
+            await asyncio.sleep(args.export_interval)
+            try:
+                export_results()
+            except Exception as e:
+                logger.error(f"导出采集结果失败: {str(e)}")
+    
+    async def run_cycle(tick):
+        """放入本周期的采集任务，记录队列状态"""
+        nonlocal cycle_count
+        cycle_count += 1
+        start_time = time.time()
+        
+        enqueued = sum(1 for url in urls if queue.enqueue(url, tick) is not None)
+        new_news = export_results()
+        queue_stats = queue.stats()
+        logger.info(
+            f"第 {cycle_count} 次调度：放入 {enqueued} 个任务，待处理 {queue_stats['queue_pending']} 个，"
+            f"进行中 {queue_stats['queue_leased']} 个，失败 {queue_stats['queue_failed']} 个"
+        )
+        
+        # 定期删除已结束的任务和已导出的结果
+        if cycle_count % 100 == 0:
+            deleted_jobs, deleted_results = queue.prune(keep_days=max(args.dedup_days, 1))
+            logger.info(f"已清理 {deleted_jobs} 个任务记录，{deleted_results} 条结果记录")
+        
+        ledger.append({
+            "timestamp": get_current_time(),
+            "success": True,
+            "role": "coordinator",
+            "enqueued": enqueued,
+            "new_news": new_news,
+            "file_path": str(get_output_path()),
+            "cycle_time": round(time.time() - start_time, 3),
+            **queue_stats
+        })
+        try:
+            METRICS.write_prometheus(dirs["logs"] / "metrics.prom")
+        except Exception as e:
+            logger.warning(f"写入指标文件失败: {str(e)}")
+    
+    scheduler = TickScheduler(
+        run_cycle,
+        interval=args.interval * 60,
+        policy=args.tick_policy,
+        jitter=args.jitter,
+        logger=logger
+    )
+    export_task = asyncio.create_task(export_loop())
+    
+    try:
+        await scheduler.run()
+    
+    except KeyboardInterrupt:
+        logger.info("用户中断，程序退出")
+    except Exception as e:
+        logger.error(f"协调模式运行时发生错误: {str(e)}")
+    finally:
+        export_task.cancel()
+        await asyncio.gather(export_task, return_exceptions=True)
+        try:
+            export_results()
+        except Exception as e:
+            logger.error(f"导出采集结果失败: {str(e)}")
+        if news_index is not None:
+            news_index.close()
+        ledger.close()
+        queue.close()
+
+async def run_worker_mode(args, logger, dirs):
+    """采集模式：从任务队列领取目标，采集并标准化后提交结果，不写入输出文件"""
+    worker_id = args.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    queue = build_queue(args, logger)
+    logger.info(f"启动采集进程 {worker_id}，任务队列: {args.queue}")
+    
+    pool = BrowserPool(
+        logger=logger,
+        max_pages=args.concurrency,
+        recycle_cycles=args.recycle_cycles,
+        max_memory_mb=args.max_browser_memory,
+        request_filter=build_request_filter(args)
+    )
+    screenshot_policy = build_screenshot_policy(args, logger)
+    snapshot_store = None if args.no_html_cache else SnapshotStore(dirs["html_cache"] / "snapshots", logger=logger)
+    pipeline = build_pipeline(args, logger)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    
+    # 队列操作可能等待数据库锁，在线程中执行，不阻塞驱动浏览器的事件循环
+    async def keep_alive(job):
+        """采集期间定期续约，避免长时间的采集被其他进程重复领取"""
+        while True:
+            await asyncio.sleep(max(1, queue.lease_seconds / 3))
+            try:
+                if not await asyncio.to_thread(queue.extend, job["id"], worker_id):
+                    logger.warning(f"任务 {job['id']} 的租约已失效，结果仍会提交并按news_id去重")
+                    return
+            except Exception as e:
+                logger.warning(f"任务 {job['id']} 续约失败: {str(e)}")
+    
+    async def fail_job(job, error):
+        """把任务退回队列，退回失败时等待租约到期后由其他进程重新领取"""
+        try:
+            retry = await asyncio.to_thread(queue.fail, job["id"], worker_id, error)
+        except Exception as e:
+            logger.error(f"任务 {job['id']} 退回队列失败，等待租约到期: {str(e)}")
+            return
+        METRICS.inc("queue_jobs_total", result="retry" if retry else "failed")
+        logger.warning(f"任务 {job['id']}（{job['url']}）失败{'，稍后重试' if retry else ''}: {error}")
+    
+    async def run_job(job):
+        """采集一个任务并提交结果，任何异常都只让该任务失败"""
+        try:
+            await collect_job(job)
+        except Exception as e:
+            await fail_job(job, str(e))
+    
+    async def collect_job(job):
+        keeper = asyncio.create_task(keep_alive(job))
+        try:
+            news_data, timing = await crawl_target(
+                pool, job["url"], logger, dirs,
+                f"{get_timestamp()}_{target_tag(job['url'])}",
+                semaphore,
+                timeout=args.target_timeout,
+                retries=args.target_retries,
+                screenshot_policy=screenshot_policy,
+                save_html=snapshot_store is not None,
+                snapshot_store=snapshot_store,
+                pipeline=pipeline
             )
+        finally:
+            keeper.cancel()
+        
+        if not timing["success"]:
+            await fail_job(job, timing.get("error", "未知错误"))
+            return
+        
+        rows = await offload(pipeline, normalize_items, news_data, get_current_time(), cpu=True) if news_data else []
+        added = await asyncio.to_thread(queue.complete, job["id"], worker_id, rows)
+        METRICS.inc("queue_jobs_total", result="done")
+        METRICS.inc("news_items_total", len(rows), kind="collected")
+        logger.info(f"任务 {job['id']}（{job['url']}）完成，采集 {len(rows)} 条，新提交 {added} 条")
+    
+    try:
+        while True:
+            try:
+                jobs = await asyncio.to_thread(queue.lease, worker_id, args.concurrency)
+            except Exception as e:
+                logger.warning(f"领取任务失败: {str(e)}")
+                jobs = []
+            if not jobs:
+                await asyncio.sleep(args.poll_interval)
+                continue
             
-            # 计算耗时
-            elapsed_time = time.time() - start_time
-            logger.info(f"第 {cycle_count} 次采集完成，耗时: {elapsed_time:.2f} 秒")
-            
-            if result["success"]:
-                logger.info(f"成功采集 {result['news_count']} 条新新闻")
-            else:
-                logger.warning("本次采集未获取到新数据")
-            
-            # 计算下一次执行的等待时间
-            wait_time = max(1, args.interval * 60 - elapsed_time)
-            next_run_time = datetime.datetime.now() + datetime.timedelta(seconds=wait_time)
-            logger.info(f"等待 {wait_time:.2f} 秒后开始下一次采集，预计时间: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            
-            await asyncio.sleep(wait_time)
+            screenshot_policy.begin_cycle()
+            try:
+                await pool.begin_cycle()
+            except Exception as e:
+                # 浏览器启动失败时退回本批任务，下一轮重新启动
+                logger.error(f"启动浏览器失败: {str(e)}")
+                await asyncio.gather(*(fail_job(job, str(e)) for job in jobs))
+                await asyncio.sleep(args.poll_interval)
+                continue
+            await asyncio.gather(*(run_job(job) for job in jobs))
+            if pipeline is not None:
+                await pipeline.drain()
+            try:
+                METRICS.write_prometheus(dirs["logs"] / "metrics.prom")
+            except Exception as e:
+                logger.warning(f"写入指标文件失败: {str(e)}")
     
     except KeyboardInterrupt:
         logger.info("用户中断，程序退出")
     except Exception as e:
-        logger.error(f"持续模式运行时发生错误: {str(e)}")
+        logger.error(f"采集进程运行时发生错误: {str(e)}")
+    finally:
+        await pool.close()
+        if pipeline is not None:
+            await pipeline.close()
+        if snapshot_store is not None:
+            snapshot_store.close()
+        queue.close()
 
 async def main():
     """主函数"""
@@ -574,9 +1364,9 @@ async def main():
     parser.add_argument(
         "--mode", 
         type=str, 
-        choices=["single", "continuous"], 
+        choices=["single", "continuous", "coordinator", "worker"], 
         default="single",
-        help="运行模式：single（单次运行）或continuous（持续运行）"
+        help="运行模式：single（单次运行）、continuous（持续运行）、coordinator（分发采集任务并写入结果）或worker（从任务队列领取采集任务）"
     )
     parser.add_argument(
         "--interval", 
@@ -584,11 +1374,64 @@ async def main():
         default=5.0,
         help="连续模式下的运行间隔，单位分钟（默认：5分钟）"
     )
+    parser.add_argument(
+        "--tick-policy", 
+        type=str,
+        choices=TICK_POLICIES,
+        default="coalesce",
+        help="上一周期未结束时错过采集时间点的处理：skip（跳过）、coalesce（结束后立即补一次）或catch-up（依次补跑），默认：coalesce"
+    )
+    parser.add_argument(
+        "--jitter", 
+        type=float,
+        default=0.0,
+        help="每个采集时间点随机推迟的最大秒数（默认：0）"
+    )
+    parser.add_argument(
+        "--adaptive-interval", 
+        action="store_true",
+        help="根据新增速率、历史时段规律和出错情况自动调整采集间隔（连续模式）"
+    )
+    parser.add_argument(
+        "--min-interval", 
+        type=float, 
+        default=1.0,
+        help="自适应间隔的下限，单位分钟（默认：1分钟）"
+    )
+    parser.add_argument(
+        "--max-interval", 
+        type=float, 
+        default=30.0,
+        help="自适应间隔的上限，单位分钟（默认：30分钟）"
+    )
+    parser.add_argument(
+        "--target-new-items", 
+        type=int, 
+        default=10,
+        help="自适应模式下希望每个周期采集到的新新闻数（默认：10）"
+    )
     parser.add_argument(
         "--output", 
         type=str,
         help="连续模式下的输出文件路径"
     )
+    parser.add_argument(
+        "--output-format", 
+        type=str,
+        choices=["csv", "jsonl", "parquet"],
+        default="csv",
+        help="输出格式：csv、jsonl或parquet（parquet需要安装pyarrow，默认：csv）"
+    )
+    parser.add_argument(
+        "--no-excel", 
+        action="store_true",
+        help="单次模式下不导出Excel文件"
+    )
+    parser.add_argument(
+        "--archive", 
+        action="store_true",
+        help="持续模式下跨天时把已结束日期的数据归档为Parquet（需要安装pyarrow）"
+    )
     parser.add_argument(
         "--debug", 
         action="store_true",
@@ -599,6 +1442,48 @@ async def main():
         action="store_true",
         help="禁用页面截图功能"
     )
+    parser.add_argument(
+        "--no-change-detection", 
+        action="store_true",
+        help="禁用变化检测，每个周期都完整提取和去重（持续模式）"
+    )
+    parser.add_argument(
+        "--screenshot-mode", 
+        type=str,
+        choices=SCREENSHOT_MODES,
+        default="on-anomaly",
+        help="截图策略：never、always、on-error、on-anomaly（出错或新闻数量异常时）或sampled（每N个周期），默认：on-anomaly"
+    )
+    parser.add_argument(
+        "--screenshot-every", 
+        type=int,
+        default=10,
+        help="sampled策略下每隔多少个周期截图（默认：10）"
+    )
+    parser.add_argument(
+        "--screenshot-min-items", 
+        type=int,
+        default=10,
+        help="on-anomaly策略下新闻数量低于该值时截图（默认：10）"
+    )
+    parser.add_argument(
+        "--screenshot-format", 
+        type=str,
+        choices=["png", "jpeg", "webp"],
+        default="jpeg",
+        help="截图格式：png、jpeg或webp（webp需要安装Pillow，默认：jpeg）"
+    )
+    parser.add_argument(
+        "--screenshot-quality", 
+        type=int,
+        default=70,
+        help="JPEG/WebP截图质量，1-100（默认：70）"
+    )
+    parser.add_argument(
+        "--no-screenshot-clip", 
+        action="store_true",
+        help="截取整个可见区域，而不是只截取新闻列表区域"
+    )
     parser.add_argument(
         "--no-html-cache", 
         action="store_true",
@@ -616,6 +1501,156 @@ async def main():
         default=3,
         help="缓存文件保留天数（默认：3天）"
     )
+    parser.add_argument(
+        "--max-cache-mb", 
+        type=float,
+        default=0,
+        help="每种缓存类型保留的最大总大小，单位MB（默认：0，不限制）"
+    )
+    parser.add_argument(
+        "--cache-budget", 
+        type=str,
+        action="append",
+        help="单独设置某个目录的预算，格式为 目录名=最大文件数[:最大MB]，如 screenshots=200:500，可重复指定"
+    )
+    parser.add_argument(
+        "--background-cleanup", 
+        action="store_true",
+        help="在后台线程中清理缓存，不阻塞采集周期"
+    )
+    parser.add_argument(
+        "--recycle-cycles", 
+        type=int,
+        default=50,
+        help="持续模式下浏览器复用多少个周期后重启，0表示不限制（默认：50）"
+    )
+    parser.add_argument(
+        "--max-browser-memory", 
+        type=int,
+        default=1024,
+        help="持续模式下浏览器内存上限（MB），超过后重启，需要安装psutil，0表示不限制（默认：1024）"
+    )
+    parser.add_argument(
+        "--block-resources", 
+        type=str,
+        default="image,media,font",
+        help="拦截的资源类型，逗号分隔（默认：image,media,font）"
+    )
+    parser.add_argument(
+        "--block-domains", 
+        type=str,
+        default="",
+        help="额外拦截的域名，逗号分隔（内置常见统计域名）"
+    )
+    parser.add_argument(
+        "--allow-domains", 
+        type=str,
+        default="",
+        help="始终放行的域名，逗号分隔，优先于拦截规则"
+    )
+    parser.add_argument(
+        "--targets", 
+        type=str,
+        default="hottest",
+        help="采集目标，逗号分隔，可以是分类名（如realtime,tech,finance）、路径或完整URL（默认：hottest）"
+    )
+    parser.add_argument(
+        "--concurrency", 
+        type=int,
+        default=4,
+        help="多目标采集时同时打开的最大页面数（默认：4）"
+    )
+    parser.add_argument(
+        "--target-timeout", 
+        type=float,
+        default=90,
+        help="单个目标的采集超时时间，单位秒（默认：90）"
+    )
+    parser.add_argument(
+        "--target-retries", 
+        type=int,
+        default=1,
+        help="单个目标失败后的重试次数（默认：1）"
+    )
+    parser.add_argument(
+        "--queue", 
+        type=str,
+        default="data/crawl_queue.db",
+        help="协调/采集模式的任务队列，SQLite数据库路径或redis://地址（需要安装redis，默认：data/crawl_queue.db）"
+    )
+    parser.add_argument(
+        "--lease-seconds", 
+        type=float,
+        default=300,
+        help="采集任务的租约时长，采集进程崩溃后任务在租约到期时重新分配（默认：300秒）"
+    )
+    parser.add_argument(
+        "--max-attempts", 
+        type=int,
+        default=3,
+        help="每个采集任务的最大尝试次数（默认：3）"
+    )
+    parser.add_argument(
+        "--worker-id", 
+        type=str,
+        help="采集进程标识（默认：主机名:进程号）"
+    )
+    parser.add_argument(
+        "--poll-interval", 
+        type=float,
+        default=5,
+        help="采集进程没有任务时的轮询间隔，单位秒（默认：5）"
+    )
+    parser.add_argument(
+        "--export-interval", 
+        type=float,
+        default=10,
+        help="协调进程导出采集结果的间隔，单位秒（默认：10）"
+    )
+    parser.add_argument(
+        "--post-workers", 
+        type=int,
+        default=2,
+        help="后处理（标准化、快照压缩、写文件）的工作进程/线程数，0表示在事件循环中直接处理（默认：2）"
+    )
+    parser.add_argument(
+        "--post-queue-size", 
+        type=int,
+        default=16,
+        help="等待后处理的最大任务数，队列满时暂停提交新的任务（默认：16）"
+    )
+    parser.add_argument(
+        "--post-executor", 
+        type=str,
+        choices=EXECUTOR_KINDS,
+        default="thread",
+        help="标准化使用的执行器：thread（线程池）或process（进程池，启动子进程和传输数据的开销较大，"
+             "只适合批量很大的采集），默认：thread"
+    )
+    parser.add_argument(
+        "--dedup-days", 
+        type=int,
+        default=7,
+        help="持续模式下跨天去重的时间窗口，单位天，0表示只在当天文件内去重（默认：7）"
+    )
+    parser.add_argument(
+        "--bloom-capacity", 
+        type=int,
+        default=50000,
+        help="跨天去重布隆过滤器每天的预计新闻数量（默认：50000）"
+    )
+    parser.add_argument(
+        "--fetch-mode", 
+        type=str,
+        choices=["dom", "api"],
+        default="dom",
+        help="采集方式：dom（渲染页面提取）或api（学习并直接请求新闻接口，失败时回退到dom）"
+    )
+    parser.add_argument(
+        "--no-request-filter", 
+        action="store_true",
+        help="禁用请求拦截"
+    )
     
     args = parser.parse_args()
     
@@ -630,15 +1665,33 @@ async def main():
     try:
         if args.mode == "continuous":
             await run_continuous_mode(args, logger, dirs)
+        elif args.mode == "coordinator":
+            await run_coordinator_mode(args, logger, dirs)
+        elif args.mode == "worker":
+            await run_worker_mode(args, logger, dirs)
         else:
             logger.info("执行单次采集模式")
-            result = await scrape_news(
-                logger=logger,
-                dirs=dirs,
-                save_mode="single",
-                screenshot_enabled=not args.no_screenshots,
-                save_html=not args.no_html_cache
-            )
+            api_capture = build_api_capture(args, logger, dirs)
+            pipeline = build_pipeline(args, logger)
+            try:
+                result = await scrape_news(
+                    logger=logger,
+                    dirs=dirs,
+                    save_mode="single",
+                    screenshot_policy=build_screenshot_policy(args, logger),
+                    save_html=not args.no_html_cache,
+                    request_filter=build_request_filter(args),
+                    api_capture=api_capture,
+                    output_format=args.output_format,
+                    excel_enabled=not args.no_excel,
+                    pipeline=pipeline,
+                    **target_options(args)
+                )
+            finally:
+                if pipeline is not None:
+                    await pipeline.close()
+                if api_capture is not None:
+                    await api_capture.close()
             
             if result["success"]:
                 logger.info(f"采集完成，共获取 {result['news_count']} 条新闻")
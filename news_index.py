@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+新闻ID持久化索引
+用SQLite保存输出文件中已有的news_id和最后一个序号，持续模式下每个周期
+只需查询本次采集到的新闻，无需重新读取整个CSV文件
+"""
+
+import os
+import csv
+import json
+import sqlite3
+import logging
+import datetime
+from pathlib import Path
+
+# 单条SQL语句中IN查询的最大参数数量
+QUERY_CHUNK_SIZE = 500
+
+
+def index_path_for(csv_path):
+    """CSV文件对应的索引文件路径"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".index.db")
+
+
+class NewsIndex:
+    """输出CSV文件的news_id索引
+
+    索引记录了最后一次更新时CSV文件的大小和修改时间；如果索引文件不存在，
+    或CSV文件在索引之外被修改过，则从CSV重新建立索引。
+    """
+
+    def __init__(self, csv_path, index_path=None, logger=None):
+        """打开索引
+
+        参数:
+            csv_path: 输出的CSV文件路径
+            index_path: 索引文件路径，默认与CSV文件放在同一目录
+            logger: 日志记录器
+        """
+        self.csv_path = Path(csv_path)
+        self.index_path = Path(index_path) if index_path else index_path_for(self.csv_path)
+        self.logger = logger or logging.getLogger("news_crawler")
+
+        self.conn = sqlite3.connect(str(self.index_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS news_ids (news_id TEXT PRIMARY KEY)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+        if not self._in_sync():
+            self.rebuild()
+
+    def _get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _csv_signature(self):
+        """CSV文件的大小和修改时间，用于判断文件是否在索引之外被修改"""
+        try:
+            stat = os.stat(self.csv_path)
+            return f"{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            return "missing"
+
+    def _in_sync(self):
+        """索引是否与CSV文件一致"""
+        return self._get_meta("csv_signature") == self._csv_signature()
+
+    @property
+    def last_number(self):
+        """最后一条新闻的序号"""
+        return int(self._get_meta("last_number", 0))
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM news_ids").fetchone()[0]
+
+    def _iter_rows(self):
+        """按格式逐行读取数据文件中的news_id和number"""
+        if self.csv_path.is_dir():
+            # Parquet数据集（目录），需要pyarrow
+            import pyarrow.dataset as ds
+            table = ds.dataset(str(self.csv_path), format="parquet").to_table(
+                columns=["news_id", "number"]
+            )
+            yield from table.to_pylist()
+        elif self.csv_path.suffix == ".jsonl":
+            with open(self.csv_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            with open(self.csv_path, "r", encoding="utf-8-sig", newline="") as f:
+                yield from csv.DictReader(f)
+
+    def rebuild(self):
+        """从数据文件重新建立索引"""
+        self.conn.execute("DELETE FROM news_ids")
+        last_number = 0
+
+        if self.csv_path.exists():
+            try:
+                ids = []
+                for row in self._iter_rows():
+                    if row.get("news_id"):
+                        ids.append((row["news_id"],))
+                    try:
+                        last_number = max(last_number, int(row.get("number") or 0))
+                    except (TypeError, ValueError):
+                        pass
+                self.conn.executemany("INSERT OR IGNORE INTO news_ids (news_id) VALUES (?)", ids)
+            except Exception as e:
+                self.logger.warning(f"从数据文件重建索引失败: {str(e)}")
+
+        self._set_meta("last_number", last_number)
+        self._set_meta("csv_signature", self._csv_signature())
+        self.conn.commit()
+        self.logger.info(f"已从 {self.csv_path} 重建索引，共 {len(self)} 条记录")
+
+    def existing(self, news_ids):
+        """返回news_ids中已经存在于索引的ID集合"""
+        news_ids = [news_id for news_id in set(news_ids) if news_id]
+        found = set()
+        for i in range(0, len(news_ids), QUERY_CHUNK_SIZE):
+            chunk = news_ids[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT news_id FROM news_ids WHERE news_id IN ({placeholders})", chunk
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def add(self, news_ids, last_number):
+        """写入CSV之后记录新增的ID和最后一个序号"""
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO news_ids (news_id) VALUES (?)",
+            [(news_id,) for news_id in news_ids if news_id],
+        )
+        self._set_meta("last_number", last_number)
+        self._set_meta("csv_signature", self._csv_signature())
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _history_index_paths(directory, days, exclude=None):
+    """时间窗口内更新过的其他索引文件"""
+    cutoff = datetime.datetime.now().timestamp() - days * 86400
+    exclude = Path(exclude).resolve() if exclude else None
+    for path in Path(directory).glob("*.index.db"):
+        try:
+            if path.stat().st_mtime < cutoff or (exclude and path.resolve() == exclude):
+                continue
+        except OSError:
+            continue
+        yield path
+
+
+def _open_readonly(path):
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def lookup_history(directory, news_ids, days, exclude=None):
+    """在最近N天的其他索引文件（往日的输出文件）中查找news_id
+
+    参数:
+        directory: 索引文件所在目录
+        news_ids: 要查找的ID
+        days: 时间窗口（天）
+        exclude: 不需要查找的索引文件（通常是当前输出文件的索引）
+
+    返回:
+        set: 找到的ID
+    """
+    remaining = [news_id for news_id in set(news_ids) if news_id]
+    found = set()
+    for path in _history_index_paths(directory, days, exclude):
+        if not remaining:
+            break
+        try:
+            conn = _open_readonly(path)
+            try:
+                for i in range(0, len(remaining), QUERY_CHUNK_SIZE):
+                    chunk = remaining[i:i + QUERY_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT news_id FROM news_ids WHERE news_id IN ({placeholders})", chunk
+                    )
+                    found.update(row[0] for row in rows)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            continue
+        remaining = [news_id for news_id in remaining if news_id not in found]
+    return found
+
+
+def iter_history_ids(directory, days):
+    """遍历最近N天所有索引文件中的news_id（用于初始化布隆过滤器）"""
+    for path in _history_index_paths(directory, days):
+        try:
+            conn = _open_readonly(path)
+            try:
+                for row in conn.execute("SELECT news_id FROM news_ids"):
+                    yield row[0]
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            continue
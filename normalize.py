@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+采集数据标准化
+对页面提取的整批新闻统一清理文本、拆分序号、识别来源和生成ID。
+正则表达式预先编译，来源识别按域名缓存。
+"""
+
+import re
+import hashlib
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# 标题开头的序号，如 "1. 标题"、"2、标题"
+NUMBER_PREFIX_RE = re.compile(r'^(\d+)[.、\s]*(.+)$')
+
+UNKNOWN_SOURCE = "未知来源"
+
+# 常见域名对应的友好名称
+DOMAIN_MAPPING = {
+    'zhihu': '知乎',
+    'weibo': '微博',
+    'baidu': '百度',
+    'douyin': '抖音',
+    'toutiao': '今日头条',
+    'bilibili': 'B站',
+    'wallstreetcn': '华尔街见闻',
+    'thepaper': '澎湃新闻',
+    'github': 'GitHub',
+    'coolapk': '酷安'
+}
+
+# 二级域名后缀，如 xxx.com.cn
+SECOND_LEVEL_SUFFIXES = ('com', 'net', 'org', 'gov', 'edu')
+
+
+def clean_text(text):
+    """清理文本，去除多余的空格和换行符"""
+    if not text:
+        return ""
+    # 按空白字符切分再用单个空格连接，与 re.sub(r'\s+', ' ', text.strip()) 结果相同
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=4096)
+def source_for_domain(domain):
+    """根据域名识别来源名称，结果按域名缓存"""
+    parts = domain.split('.')
+    if len(parts) < 2:
+        return UNKNOWN_SOURCE
+
+    # 提取主域名
+    if parts[-2] in SECOND_LEVEL_SUFFIXES and len(parts) > 2:
+        main_domain = parts[-3]
+    else:
+        main_domain = parts[-2]
+
+    return DOMAIN_MAPPING.get(main_domain, domain)
+
+
+def extract_domain(url):
+    """从URL中提取域名作为来源"""
+    if not url:
+        return UNKNOWN_SOURCE
+
+    try:
+        return source_for_domain(urlsplit(url).netloc)
+    except Exception:
+        return UNKNOWN_SOURCE
+
+
+def generate_news_id(title, link):
+    """生成新闻ID，用于去重"""
+    if not title or not link:
+        return None
+
+    # 使用标题和链接生成唯一ID
+    return hashlib.md5(f"{title}{link}".encode("utf-8")).hexdigest()
+
+
+def split_number(title):
+    """从标题中提取序号并移除，返回 (序号, 标题)"""
+    match = NUMBER_PREFIX_RE.match(title)
+    if match:
+        return match.group(1), clean_text(match.group(2))
+    return "", title
+
+
+def news_ids(news_data):
+    """只计算新闻ID，结果与normalize_items生成的news_id相同
+
+    用于把本周期采集到的全部新闻记入去重过滤器，不需要完整标准化
+    """
+    md5 = hashlib.md5
+    match_number = NUMBER_PREFIX_RE.match
+    ids = []
+
+    for item in news_data:
+        title = " ".join(item['title'].split()) if item['title'] else ""
+        link = item['link']
+
+        match = match_number(title)
+        if match:
+            title = " ".join(match.group(2).split())
+
+        if title and link:
+            ids.append(md5(f"{title}{link}".encode("utf-8")).hexdigest())
+
+    return ids
+
+
+def normalize_items(news_data, collect_time):
+    """批量标准化页面提取的新闻
+
+    参数:
+        news_data: 页面提取的新闻列表，每条包含title、link、source、pubTime、summary
+        collect_time: 采集时间
+
+    返回:
+        list: 标准化后的新闻行，number留空，由调用方在去重后编号
+    """
+    md5 = hashlib.md5
+    match_number = NUMBER_PREFIX_RE.match
+    rows = []
+
+    for item in news_data:
+        title = " ".join(item['title'].split()) if item['title'] else ""
+        link = item['link']
+
+        match = match_number(title)
+        if match:
+            original_number = match.group(1)
+            title = " ".join(match.group(2).split())
+        else:
+            original_number = ""
+
+        source = clean_text(item['source']) or extract_domain(link)
+
+        rows.append({
+            'number': None,
+            'original_number': original_number,
+            'title': title,
+            'source': source,
+            'link': link,
+            'summary': clean_text(item.get('summary', '')),
+            'pub_time': clean_text(item.get('pubTime', '')),
+            'collect_time': collect_time,
+            'news_id': md5(f"{title}{link}".encode("utf-8")).hexdigest() if title and link else None
+        })
+
+    return rows
@@ -1,10 +1,11 @@
 import os
-import csv
 import time
 import datetime
 from playwright.sync_api import sync_playwright
 import logging
 import re
+from request_filter import RequestFilter
+from safe_append import append_csv_rows
 
 # 配置日志
 logging.basicConfig(
@@ -53,9 +54,6 @@ def scrape_news():
     # CSV文件路径
     csv_filename = os.path.join(data_dir, f'news_{get_current_date()}.csv')
     
-    # 检查CSV文件是否已存在
-    file_exists = os.path.exists(csv_filename)
-    
     # 当前时间作为采集时间
     collect_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -66,6 +64,10 @@ def scrape_news():
             # 启动浏览器
             browser = p.chromium.launch(headless=True)
             context = browser.new_context(viewport={'width': 1920, 'height': 1080})
+            
+            # 拦截图片、字体、媒体和统计脚本，只加载文本内容
+            request_filter = RequestFilter()
+            context.route("**/*", request_filter.handle_sync)
             page = context.new_page()
             
             # 访问目标网页
@@ -132,18 +134,11 @@ def scrape_news():
                         })
             
             logger.info(f"成功提取 {len(news_items)} 条新闻数据")
+            logger.info(f"拦截请求 {request_filter.blocked_count} 个，估计节省 {request_filter.bytes_saved / 1024:.0f} KB")
             
-            # 写入CSV文件
-            with open(csv_filename, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = ['number', 'title', 'source', 'link', 'collect_time']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                # 如果文件不存在，写入表头
-                if not file_exists:
-                    writer.writeheader()
-                
-                # 写入数据
-                writer.writerows(news_items)
+            # 加锁后一次追加到CSV文件，新文件自动写入表头
+            fieldnames = ['number', 'title', 'source', 'link', 'collect_time']
+            append_csv_rows(csv_filename, news_items, fieldnames, logger=logger)
             
             logger.info(f"数据已保存至: {csv_filename}")
             
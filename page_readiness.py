@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面就绪检测
+根据新闻卡片数量判断页面是否加载完成：数量在一段时间内不变视为首屏就绪，
+滚动后数量不再增长时立即停止滚动，取代固定时长的等待。
+只看卡片数量，轮播、计时器等持续变化的DOM不会拖住检测；整个过程有总时长上限。
+"""
+
+import time
+import logging
+
+# 卡片数量大于0且保持不变超过指定时长后返回数量
+WAIT_STABLE_SCRIPT = """
+([selector, stableMs]) => {
+    const count = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const state = window.__cardCount;
+    if (!state || state.count !== count) {
+        window.__cardCount = { count: count, since: now };
+        return false;
+    }
+    return count > 0 && now - state.since >= stableMs ? count : false;
+}
+"""
+
+# 卡片数量超过上一次的数量后返回新的数量
+WAIT_GROWTH_SCRIPT = """
+([selector, previous]) => {
+    const count = document.querySelectorAll(selector).length;
+    return count > previous ? count : false;
+}
+"""
+
+COUNT_SCRIPT = "(selector) => document.querySelectorAll(selector).length"
+
+
+async def _wait_count(page, script, arg, timeout_ms):
+    """在页面中轮询卡片数量直到脚本返回数量，返回 (数量, 是否超时)"""
+    if timeout_ms > 0:
+        try:
+            handle = await page.wait_for_function(script, arg=arg, polling=100, timeout=timeout_ms)
+            return await handle.json_value(), False
+        except Exception:
+            pass
+    return await page.evaluate(COUNT_SCRIPT, arg[0]), True
+
+
+async def scroll_until_stable(page, selector, logger=None, max_scrolls=10, stable_ms=500,
+                              timeout_ms=3000, budget_ms=15000, load_more_selector=None):
+    """滚动页面直到卡片数量稳定
+
+    首屏等待卡片数量保持不变；之后每次滚动到底部后等待卡片数量增长，
+    超时仍未增长（且没有可点击的"加载更多"按钮）则立即停止。
+
+    参数:
+        page: 浏览器页面
+        selector: 新闻卡片的CSS选择器
+        logger: 日志记录器
+        max_scrolls: 最大滚动次数
+        stable_ms: 首屏卡片数量保持多长时间（毫秒）不变视为就绪
+        timeout_ms: 单次等待的超时时间（毫秒）
+        budget_ms: 首屏等待和滚动的总时长上限（毫秒）
+        load_more_selector: "加载更多"按钮的选择器，可选
+
+    返回:
+        dict: 各阶段耗时（秒）、滚动次数和最终卡片数量
+    """
+    logger = logger or logging.getLogger("news_crawler")
+    timings = {}
+    deadline = time.time() + budget_ms / 1000
+
+    def remaining_ms(limit):
+        return min(limit, int((deadline - time.time()) * 1000))
+
+    # 首屏内容就绪
+    start_time = time.time()
+    count, timed_out = await _wait_count(
+        page, WAIT_STABLE_SCRIPT, [selector, stable_ms], remaining_ms(timeout_ms)
+    )
+    timings["settle"] = time.time() - start_time
+    if timed_out:
+        logger.debug("等待首屏卡片数量稳定超时")
+
+    # 滚动加载，卡片数量不再增长或用完总时长时停止
+    start_time = time.time()
+    scrolls = 0
+    while scrolls < max_scrolls and remaining_ms(timeout_ms) > 0:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        scrolls += 1
+        new_count, timed_out = await _wait_count(
+            page, WAIT_GROWTH_SCRIPT, [selector, count], remaining_ms(timeout_ms)
+        )
+
+        if timed_out and load_more_selector and remaining_ms(timeout_ms) > 0:
+            try:
+                button = await page.query_selector(load_more_selector)
+                if button:
+                    await button.click()
+                    logger.info("点击了'加载更多'按钮")
+                    new_count, timed_out = await _wait_count(
+                        page, WAIT_GROWTH_SCRIPT, [selector, count], remaining_ms(timeout_ms)
+                    )
+            except Exception as e:
+                logger.debug(f"没有找到或无法点击'加载更多'按钮: {e}")
+
+        if new_count <= count:
+            break
+        count = new_count
+    timings["scroll"] = time.time() - start_time
+
+    logger.info(
+        f"页面就绪: {count} 个卡片，滚动 {scrolls} 次，"
+        f"首屏耗时 {timings['settle']:.2f} 秒，滚动耗时 {timings['scroll']:.2f} 秒"
+    )
+
+    return {
+        "settle_time": round(timings["settle"], 3),
+        "scroll_time": round(timings["scroll"], 3),
+        "scrolls": scrolls,
+        "card_count": count,
+    }
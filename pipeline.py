@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+采集后处理阶段
+浏览器I/O留在事件循环中，采集结果的后处理交给执行器：标准化等CPU密集的处理
+默认在线程池中运行，也可以改用进程池（多个目标时可以使用多个CPU核，但子进程用spawn
+启动并重新导入爬虫模块，每批数据还要pickle传输，只有批量很大时才值得）；快照压缩、
+写文件、导出Excel等在线程池中运行。任务先放入有界队列，队列满时提交方等待（背压），避免后处理
+跟不上时采集结果在内存中无限堆积。
+"""
+
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from metrics import METRICS
+
+EXECUTOR_KINDS = ["process", "thread"]
+
+
+class PostProcessPipeline:
+    """有界队列 + 进程池/线程池的后处理阶段
+
+    用法:
+        pipeline = PostProcessPipeline(workers=2)
+        rows = await pipeline.run(normalize_items, news_data, collect_time, cpu=True)
+        future = await pipeline.submit(snapshot_store.put, html, key)  # 不等待结果
+        await pipeline.close()
+    """
+
+    def __init__(self, workers=2, queue_size=16, executor="thread", logger=None):
+        """初始化
+
+        参数:
+            workers: 进程池和线程池各自的最大工作数
+            queue_size: 等待处理的最大任务数，队列满时提交方等待
+            executor: CPU密集任务使用的执行器，process或thread
+            logger: 日志记录器
+        """
+        if executor not in EXECUTOR_KINDS:
+            raise ValueError(f"不支持的执行器: {executor}")
+
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.executor_kind = executor
+        self.logger = logger or logging.getLogger("news_crawler")
+
+        self.queue = None
+        self._consumers = []
+        self._cpu_executor = None
+        self._io_executor = None
+
+        # 统计信息
+        self.submitted = 0
+        self.max_depth = 0
+        self.blocked_seconds = 0.0
+
+    def _start(self):
+        """在事件循环中首次提交任务时创建队列、执行器和消费协程"""
+        if self.queue is not None:
+            return
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.executor_kind == "process":
+            # 浏览器驱动运行在后台线程中，用spawn启动子进程，避免fork带有线程的进程
+            self._cpu_executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._cpu_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="post-cpu")
+        self._io_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="post-io")
+
+        # 两类执行器都可以同时占满
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers * 2)]
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            func, args, cpu, future = await self.queue.get()
+            try:
+                if not future.cancelled():
+                    executor = self._cpu_executor if cpu else self._io_executor
+                    result = await loop.run_in_executor(executor, func, *args)
+                    if not future.cancelled():
+                        future.set_result(result)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    async def submit(self, func, *args, cpu=False):
+        """放入队列，队列满时等待；返回可等待的结果
+
+        参数:
+            func: 处理函数，cpu为True且使用进程池时必须是模块级函数，参数必须可以pickle
+            *args: 函数参数
+            cpu: 是否为CPU密集任务
+        """
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+
+        if self.queue.full():
+            start_time = time.perf_counter()
+            await self.queue.put((func, args, cpu, future))
+            waited = time.perf_counter() - start_time
+            self.blocked_seconds += waited
+            METRICS.observe("queue_wait", waited)
+        else:
+            self.queue.put_nowait((func, args, cpu, future))
+
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return future
+
+    async def run(self, func, *args, cpu=False):
+        """放入队列并等待结果"""
+        return await (await self.submit(func, *args, cpu=cpu))
+
+    async def drain(self):
+        """等待队列中的任务全部处理完"""
+        if self.queue is not None:
+            await self.queue.join()
+
+    def stats(self):
+        """队列统计信息"""
+        return {
+            "pipeline_tasks": self.submitted,
+            "pipeline_max_queue_depth": self.max_depth,
+            "pipeline_blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+    async def close(self):
+        """处理完剩余任务后关闭执行器"""
+        if self.queue is None:
+            return
+        await self.drain()
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._cpu_executor.shutdown(wait=True)
+        self._io_executor.shutdown(wait=True)
+        self.queue = None
+
+
+async def offload(pipeline, func, *args, cpu=False):
+    """在后处理阶段中运行，没有后处理阶段时在当前线程中直接运行"""
+    if pipeline is None:
+        return func(*args)
+    return await pipeline.run(func, *args, cpu=cpu)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+采集运行记录
+每个采集周期的摘要追加写入按月分段的JSONL文件（logs/runs/runs_YYYY-MM.jsonl），
+代替每个周期单独生成的summary_*.json。写入后立即flush，每隔若干条或若干秒
+才fsync一次；进程异常退出时最多丢失最后一批记录，写了一半的行在读取时跳过。
+
+用法:
+    python run_ledger.py                                  # 最近24小时
+    python run_ledger.py --start="2025-02-01" --end="2025-02-08 12:00" --json
+"""
+
+import os
+import json
+import math
+import time
+import argparse
+import datetime
+from pathlib import Path
+
+# 时间格式，与采集时间一致
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 报告中统计分位数的阶段
+REPORT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def segment_name(moment):
+    """记录所在的分段文件名"""
+    return f"runs_{moment.strftime('%Y-%m')}.jsonl"
+
+
+class RunLedger:
+    """只追加的运行记录
+
+    用法:
+        ledger = RunLedger(dirs["logs"] / "runs")
+        ledger.append({"success": True, "new_news": 12, ...})
+        ledger.close()
+    """
+
+    def __init__(self, directory, fsync_every=10, fsync_interval=60):
+        """初始化运行记录
+
+        参数:
+            directory: 记录文件目录
+            fsync_every: 每写入多少条记录fsync一次
+            fsync_interval: 距上次fsync超过多少秒时立即fsync
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+        self._file = None
+        self._segment = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _open_segment(self, moment):
+        segment = segment_name(moment)
+        if segment != self._segment:
+            self.sync()
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.directory / segment, "a", encoding="utf-8")
+            self._segment = segment
+        return self._file
+
+    def append(self, record):
+        """追加一条记录，自动补充记录时间"""
+        now = datetime.datetime.now()
+        record = dict(record)
+        record.setdefault("timestamp", now.strftime(TIME_FORMAT))
+
+        f = self._open_segment(now)
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+
+        self._pending += 1
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """把已写入的记录刷到磁盘"""
+        if self._file is not None and self._pending:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def parse_time(value):
+    """解析命令行中的时间，支持只写日期"""
+    for fmt in (TIME_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"无法解析时间: {value}")
+
+
+def iter_records(directory, start=None, end=None):
+    """按时间范围逐条读取记录，只打开范围内月份的分段
+
+    参数:
+        directory: 记录文件目录
+        start: 开始时间（包含），datetime
+        end: 结束时间（不包含），datetime
+    """
+    start_segment = segment_name(start) if start else None
+    end_segment = segment_name(end) if end else None
+    start_text = start.strftime(TIME_FORMAT) if start else None
+    end_text = end.strftime(TIME_FORMAT) if end else None
+
+    for path in sorted(Path(directory).glob("runs_*.jsonl")):
+        if start_segment and path.name < start_segment:
+            continue
+        if end_segment and path.name > end_segment:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 异常退出时写了一半的行
+                    continue
+                timestamp = record.get("timestamp", "")
+                if start_text and timestamp < start_text:
+                    continue
+                if end_text and timestamp >= end_text:
+                    continue
+                yield record
+
+
+def percentile(sorted_values, q):
+    """最近秩法计算分位数"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def build_report(records):
+    """汇总吞吐量、新增率和耗时分位数
+
+    返回:
+        dict: 报告内容
+    """
+    cycles = 0
+    succeeded = 0
+    total_news = 0
+    new_news = 0
+    first_time = None
+    last_time = None
+    latencies = {}
+
+    for record in records:
+        cycles += 1
+        if record.get("success", True):
+            succeeded += 1
+        total_news += record.get("total_news", 0) or 0
+        new_news += record.get("new_news", 0) or 0
+
+        timestamp = record.get("timestamp")
+        if timestamp:
+            first_time = timestamp if first_time is None or timestamp < first_time else first_time
+            last_time = timestamp if last_time is None or timestamp > last_time else last_time
+
+        if record.get("cycle_time") is not None:
+            latencies.setdefault("cycle", []).append(record["cycle_time"])
+        for phase, seconds in (record.get("phase_timings") or {}).items():
+            if phase != "cycle":
+                latencies.setdefault(phase, []).append(seconds)
+
+    hours = None
+    if first_time and last_time and first_time != last_time:
+        span = parse_time(last_time) - parse_time(first_time)
+        hours = span.total_seconds() / 3600
+
+    report = {
+        "first_run": first_time,
+        "last_run": last_time,
+        "cycles": cycles,
+        "success_rate": round(succeeded / cycles, 4) if cycles else None,
+        "total_news": total_news,
+        "new_news": new_news,
+        # 新增率：采集到的新闻中未出现过的比例
+        "new_item_rate": round(new_news / total_news, 4) if total_news else None,
+        "new_news_per_hour": round(new_news / hours, 2) if hours else None,
+        "cycles_per_hour": round(cycles / hours, 2) if hours else None,
+        "latency": {},
+    }
+    for phase, values in sorted(latencies.items()):
+        values.sort()
+        report["latency"][phase] = {
+            f"p{int(q * 100)}": round(percentile(values, q), 3) for q in REPORT_QUANTILES
+        }
+        report["latency"][phase]["max"] = round(values[-1], 3)
+    return report
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="采集运行记录查询")
+    parser.add_argument("--dir", type=str, default="logs/runs", help="记录文件目录（默认：logs/runs）")
+    parser.add_argument("--start", type=str, help="开始时间，YYYY-MM-DD[ HH:MM[:SS]]（默认：24小时前）")
+    parser.add_argument("--end", type=str, help="结束时间（不包含），默认到现在")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    args = parser.parse_args()
+
+    start = parse_time(args.start) if args.start else datetime.datetime.now() - datetime.timedelta(days=1)
+    end = parse_time(args.end) if args.end else None
+    report = build_report(iter_records(args.dir, start, end))
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"时间范围: {report['first_run']} ~ {report['last_run']}")
+    print(f"采集周期: {report['cycles']} 次，成功率: {report['success_rate']}")
+    print(f"采集新闻: {report['total_news']} 条，新增: {report['new_news']} 条，新增率: {report['new_item_rate']}")
+    print(f"吞吐量: 每小时 {report['cycles_per_hour']} 个周期，{report['new_news_per_hour']} 条新新闻")
+    for phase, values in report["latency"].items():
+        print(f"  {phase:<14} " + "  ".join(f"{key} {value:.2f}s" for key, value in values.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多进程安全的文件追加
+多个爬虫（或调度器和手动运行）同时向同一个数据文件追加时：
+- 咨询锁：对同名的.lock文件加排他锁（POSIX使用fcntl.flock，Windows使用
+  msvcrt.locking），同一台机器上的进程和线程之间互斥
+- 批量追加：一批数据先在内存中编码好，加锁后一次写入并fsync，各批之间不会交错
+- 表头：在锁内判断文件是否为空，只有第一个写入者写入表头
+- 崩溃恢复：每次写入成功后在锁文件中记录文件大小；下一次写入前如果发现文件
+  末尾有不完整的一行（写入进程中途退出），先截断到上次记录的大小
+"""
+
+import io
+import os
+import csv
+import codecs
+import logging
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_SUFFIX = ".lock"
+
+# 锁文件中记录文件大小的固定宽度，覆盖写入时不需要截断
+MARKER_WIDTH = 32
+
+# 查找最后一个换行符时每次向前读取的字节数
+SCAN_CHUNK_SIZE = 64 * 1024
+
+
+def lock_path_for(path):
+    """数据文件对应的锁文件路径"""
+    path = Path(path)
+    return path.with_name(path.name + LOCK_SUFFIX)
+
+
+class FileLock:
+    """数据文件的排他咨询锁
+
+    锁文件同时记录上一次成功写入后数据文件的大小，用于发现不完整的写入。
+    只有通过本模块写入的进程之间互斥，直接打开文件写入的程序不受限制。
+
+    用法:
+        with FileLock(path) as lock:
+            size = lock.committed_size()
+            ...
+            lock.commit(new_size)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = lock_path_for(self.path)
+        self._fd = None
+
+    def acquire(self):
+        """阻塞直到获得锁"""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                # LK_LOCK每秒重试一次，10次后抛出异常，继续等待
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return self
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                # Windows的锁从当前位置开始计算，解锁前回到加锁时的位置
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def committed_size(self):
+        """上一次成功写入后数据文件的大小，没有记录时返回None"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, MARKER_WIDTH)
+        try:
+            return int(data.decode("ascii").strip())
+        except ValueError:
+            return None
+
+    def commit(self, size):
+        """记录本次写入后数据文件的大小"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, f"{size:<{MARKER_WIDTH - 1}}\n".encode("ascii"))
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _last_line_end(fd, size):
+    """文件中最后一个换行符之后的位置，没有换行符时返回0"""
+    end = size
+    while end > 0:
+        start = max(0, end - SCAN_CHUNK_SIZE)
+        os.lseek(fd, start, os.SEEK_SET)
+        chunk = os.read(fd, end - start)
+        index = chunk.rfind(b"\n")
+        if index >= 0:
+            return start + index + 1
+        end = start
+    return 0
+
+
+def _repair_tail(fd, size, committed, path, logger):
+    """截断上一次中途退出的写入留下的不完整的行，返回修复后的文件大小"""
+    if size == 0:
+        return 0
+    os.lseek(fd, size - 1, os.SEEK_SET)
+    if os.read(fd, 1) == b"\n":
+        return size
+
+    if committed is not None and committed < size:
+        # 上一次成功写入之后的内容都属于未完成的写入
+        cut = committed
+    else:
+        # 没有记录或文件在本模块之外被修改过，退回到最后一个完整的行
+        cut = _last_line_end(fd, size)
+    os.ftruncate(fd, cut)
+    logger.warning(f"{path} 末尾有不完整的写入，已截断 {size - cut} 字节")
+    return cut
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def append_records(path, data, header=b"", truncate=False, logger=None):
+    """加锁后把一批完整的行追加到文件末尾
+
+    参数:
+        path: 数据文件路径
+        data: 编码后的数据，必须以换行符结尾
+        header: 文件为空时先写入的表头
+        truncate: 是否先清空文件（覆盖写入）
+        logger: 日志记录器
+
+    返回:
+        int: 写入的字节数
+    """
+    path = Path(path)
+    logger = logger or logging.getLogger("news_crawler")
+
+    with FileLock(path) as lock:
+        fd = os.open(str(path), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            if truncate:
+                os.ftruncate(fd, 0)
+            size = _repair_tail(fd, os.fstat(fd).st_size, lock.committed_size(), path, logger)
+
+            payload = header + data if size == 0 else data
+            os.lseek(fd, size, os.SEEK_SET)
+            _write_all(fd, payload)
+            os.fsync(fd)
+            lock.commit(size + len(payload))
+            return len(payload)
+        finally:
+            os.close(fd)
+
+
+def csv_header(fieldnames, quoting=csv.QUOTE_MINIMAL, bom=False):
+    """编码后的CSV表头，bom为True时带UTF-8 BOM以便Excel打开"""
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=quoting).writerow(fieldnames)
+    return (codecs.BOM_UTF8 if bom else b"") + buffer.getvalue().encode("utf-8")
+
+
+def append_csv_rows(path, rows, fieldnames, quoting=csv.QUOTE_MINIMAL, bom=False, truncate=False, logger=None):
+    """把多行一次追加到CSV文件，新文件自动写入表头
+
+    参数:
+        path: CSV文件路径
+        rows: 字典列表（可以是生成器）
+        fieldnames: 字段列表，决定列的顺序，多余的字段被忽略
+        quoting: csv模块的引号策略
+        bom: 新文件是否带UTF-8 BOM
+        truncate: 是否先清空文件（覆盖写入）
+        logger: 日志记录器
+
+    返回:
+        int: 写入的行数
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, quoting=quoting, extrasaction="ignore")
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+
+    if count or truncate:
+        append_records(
+            path, buffer.getvalue().encode("utf-8"),
+            header=csv_header(fieldnames, quoting, bom), truncate=truncate, logger=logger
+        )
+    return count
@@ -6,44 +6,28 @@
 定时执行爬虫任务
 """
 
-import time
-import subprocess
-import datetime
 import sys
+import asyncio
+import argparse
+import logging
+import datetime
 from pathlib import Path
 
-
-def run_scraper():
-    """
-    运行爬虫
-    """
-    print(f"[{datetime.datetime.now()}] 开始执行爬虫任务...")
-    
-    # 获取Python解释器路径
-    python_exe = sys.executable
-    
-    # 运行爬虫脚本
-    try:
-        process = subprocess.run(
-            [python_exe, "simple_scraper.py"],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        print(f"[{datetime.datetime.now()}] 爬虫输出: {process.stdout}")
-    except subprocess.CalledProcessError as e:
-        print(f"[{datetime.datetime.now()}] 爬虫执行失败: {e}")
-        print(f"错误输出: {e.stderr}")
-    except Exception as e:
-        print(f"[{datetime.datetime.now()}] 执行过程中出错: {e}")
-    
-    print(f"[{datetime.datetime.now()}] 爬虫任务执行结束")
+from crawl_daemon import CrawlDaemon, ScraperJob, build_adaptive_interval
 
 
 def main():
     """
     主函数
     """
+    parser = argparse.ArgumentParser(description="新闻爬虫调度器（simple_scraper）")
+    parser.add_argument(
+        "--adaptive-interval",
+        action="store_true",
+        help="出错后先尽快重试，持续出错时退避（默认：固定5分钟间隔）"
+    )
+    args = parser.parse_args()
+    
     # 创建日志目录
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -51,24 +35,30 @@ def main():
     # 设置日志文件
     log_file = log_dir / f"scheduler_{datetime.datetime.now().strftime('%Y%m%d')}.log"
     
-    # 重定向输出到日志文件
-    sys.stdout = open(log_file, "a", encoding="utf-8")
+    # 重定向输出到日志文件，按行缓冲，爬虫的输出实时写入日志
+    sys.stdout = open(log_file, "a", encoding="utf-8", buffering=1)
     sys.stderr = sys.stdout
     
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+    logger = logging.getLogger("scheduler")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    
     print(f"\n[{datetime.datetime.now()}] 调度器启动")
     
     try:
-        # 立即执行一次
-        run_scraper()
-        
-        # 设置执行间隔（秒）
-        interval = 5 * 60  # 5分钟
+        # 执行间隔5分钟；开启自适应间隔时出错后先尽快重试，持续出错时退避
+        scheduler = build_adaptive_interval("simple_scraper", 5 * 60, logger=logger) if args.adaptive_interval else None
         
-        # 持续执行
-        while True:
-            print(f"[{datetime.datetime.now()}] 等待 {interval} 秒后再次执行...")
-            time.sleep(interval)
-            run_scraper()
+        # 在同一个进程中运行爬虫，不再每次启动新的Python解释器
+        daemon = CrawlDaemon(
+            ScraperJob("simple_scraper", "run_scraper", logger=logger),
+            logger=logger,
+            timeout=4 * 60,
+            adaptive_interval=scheduler
+        )
+        asyncio.run(daemon.run_forever())
             
     except KeyboardInterrupt:
         print(f"[{datetime.datetime.now()}] 调度器被用户中断")
@@ -77,6 +67,7 @@ def main():
     finally:
         print(f"[{datetime.datetime.now()}] 调度器关闭")
         # 恢复标准输出
+        logger.removeHandler(handler)
         sys.stdout.close()
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
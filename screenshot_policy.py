@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面截图策略
+决定每个周期是否截图，并以较低的成本截图：
+- never: 从不截图
+- always: 每个周期都截图
+- on-error: 只在出错时截图
+- on-anomaly: 出错、等待元素超时或新闻数量异常（低于下限或比上次骤降）时截图
+- sampled: 每N个周期截图一次，出错时也截图
+截图可以保存为JPEG（可设置质量）或WebP（需要安装Pillow），并只截取新闻列表所在区域。
+"""
+
+import io
+import logging
+from pathlib import Path
+
+from metrics import METRICS
+
+SCREENSHOT_MODES = ["never", "always", "on-error", "on-anomaly", "sampled"]
+
+# 截图格式对应的文件扩展名
+FORMAT_SUFFIXES = {
+    "png": ".png",
+    "jpeg": ".jpg",
+    "webp": ".webp",
+}
+
+# 计算所有匹配元素在页面中的外接矩形
+LIST_REGION_SCRIPT = """
+    (selector) => {
+        let top = Infinity, left = Infinity, right = 0, bottom = 0;
+        for (const el of document.querySelectorAll(selector)) {
+            const rect = el.getBoundingClientRect();
+            if (!rect.width || !rect.height) continue;
+            top = Math.min(top, rect.top + window.scrollY);
+            left = Math.min(left, rect.left + window.scrollX);
+            right = Math.max(right, rect.right + window.scrollX);
+            bottom = Math.max(bottom, rect.bottom + window.scrollY);
+        }
+        if (top === Infinity) return null;
+        return {x: left, y: top, width: right - left, height: bottom - top};
+    }
+"""
+
+
+class ScreenshotPolicy:
+    """截图策略
+
+    用法:
+        policy = ScreenshotPolicy(mode="on-anomaly", image_format="jpeg", clip_selector=".card")
+        policy.begin_cycle()
+        if policy.should_capture("state", news_count=len(news_data), key=url):
+            await policy.capture(page, dirs["screenshots"], f"page_state_{timestamp}")
+    """
+
+    def __init__(self, mode="always", every=10, min_items=10, drop_ratio=0.5,
+                 image_format="png", quality=70, clip_selector=None, max_height=4000, logger=None):
+        """初始化截图策略
+
+        参数:
+            mode: 截图策略，见SCREENSHOT_MODES
+            every: sampled策略下每隔多少个周期截图
+            min_items: on-anomaly策略下新闻数量低于该值时截图
+            drop_ratio: on-anomaly策略下新闻数量低于上次的该比例时截图
+            image_format: png、jpeg或webp
+            quality: JPEG/WebP质量（1-100）
+            clip_selector: 只截取匹配元素所在的区域，为空时截取可见区域
+            max_height: 截取区域的最大高度（像素）
+            logger: 日志记录器
+        """
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"不支持的截图策略: {mode}")
+        if image_format not in FORMAT_SUFFIXES:
+            raise ValueError(f"不支持的截图格式: {image_format}")
+
+        self.mode = mode
+        self.every = max(1, every)
+        self.min_items = min_items
+        self.drop_ratio = drop_ratio
+        self.image_format = image_format
+        self.quality = quality
+        self.clip_selector = clip_selector
+        self.max_height = max_height
+        self.logger = logger or logging.getLogger("news_crawler")
+
+        self.cycle = -1
+        self._last_counts = {}
+
+    @property
+    def enabled(self):
+        return self.mode != "never"
+
+    def begin_cycle(self):
+        """开始新的采集周期（用于sampled策略计数）"""
+        self.cycle += 1
+
+    def is_anomaly(self, news_count, key=None):
+        """新闻数量是否异常，同时记录本次数量供下次比较"""
+        last_count = self._last_counts.get(key)
+        self._last_counts[key] = news_count
+        if news_count < self.min_items:
+            return True
+        return last_count is not None and news_count < last_count * self.drop_ratio
+
+    def should_capture(self, kind, news_count=None, key=None):
+        """判断是否需要截图
+
+        参数:
+            kind: state（正常采集后）、anomaly（如等待元素超时）或error（出错）
+            news_count: 本次采集的新闻数量，kind为state时用于判断数量异常
+            key: 区分不同目标的标记，通常为URL
+        """
+        anomaly = kind == "anomaly"
+        if kind == "state" and news_count is not None:
+            anomaly = self.is_anomaly(news_count, key)
+
+        if self.mode == "never":
+            return False
+        if self.mode == "always" or kind == "error":
+            return True
+        if self.mode == "on-error":
+            return False
+        if self.mode == "on-anomaly":
+            return anomaly
+        # sampled
+        return anomaly or (kind == "state" and self.cycle % self.every == 0)
+
+    async def _clip(self, page):
+        """新闻列表区域，找不到时返回None"""
+        if not self.clip_selector:
+            return None
+        try:
+            region = await page.evaluate(LIST_REGION_SCRIPT, self.clip_selector)
+        except Exception:
+            return None
+        if not region:
+            return None
+        region["height"] = min(region["height"], self.max_height)
+        return region
+
+    async def capture(self, page, directory, name, clip=True):
+        """按设置的格式截图
+
+        参数:
+            page: 浏览器页面
+            directory: 保存目录
+            name: 文件名（不含扩展名）
+            clip: 是否只截取新闻列表区域
+
+        返回:
+            Path: 截图路径
+        """
+        image_format = self.image_format
+        path = Path(directory) / f"{name}{FORMAT_SUFFIXES[image_format]}"
+
+        with METRICS.span("screenshot"):
+            options = {}
+            region = await self._clip(page) if clip else None
+            if region:
+                options["clip"] = region
+                options["full_page"] = True
+
+            if image_format == "webp":
+                # 浏览器不直接输出WebP，先截取PNG再用Pillow转换
+                try:
+                    from PIL import Image
+                except ImportError:
+                    self.logger.warning("保存WebP截图需要安装Pillow，改为保存JPEG")
+                    image_format = self.image_format = "jpeg"
+                    path = path.with_suffix(FORMAT_SUFFIXES["jpeg"])
+                else:
+                    data = await page.screenshot(type="png", **options)
+                    Image.open(io.BytesIO(data)).save(path, "WEBP", quality=self.quality)
+
+            if image_format == "png":
+                await page.screenshot(path=path, type="png", **options)
+            elif image_format == "jpeg":
+                await page.screenshot(path=path, type="jpeg", quality=self.quality, **options)
+
+        METRICS.inc("screenshots_total", format=image_format)
+        return path
@@ -18,6 +18,20 @@ setup(
         "python-dotenv>=1.0.0",
         "pytest>=7.3.1",
         "loguru>=0.7.0",
-        "schedule>=1.2.0",
     ],
+    # 可选依赖，按需要的功能安装，如 pip install .[parquet]
+    extras_require={
+        # Parquet输出（--output-format=parquet）和数据归档（archive.py）
+        "parquet": ["pyarrow>=14.0.0"],
+        # 离线重新提取（html_replay.py）
+        "replay": ["lxml>=4.9.0", "cssselect>=1.2.0"],
+        # HTML快照使用zstd压缩（snapshot_store.py，未安装时使用gzip）
+        "snapshots": ["zstandard>=0.21.0"],
+        # 分布式采集使用Redis任务队列（--queue=redis://...）
+        "redis": ["redis>=4.5.0"],
+        # 浏览器内存上限检查（--max-browser-memory）
+        "monitor": ["psutil>=5.9.0"],
+        # WebP格式截图（--screenshot-format=webp，未安装时改为JPEG）
+        "webp": ["Pillow>=10.0.0"],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+采集结果输出
+以流式方式逐行写入CSV、JSONL或Parquet文件，不需要构建DataFrame；
+pandas只在导出Excel时按需导入。CSV和JSONL先在内存中编码，再加锁批量追加，
+多个爬虫可以同时写入同一个文件（见safe_append）
+"""
+
+import io
+import os
+import csv
+import json
+from pathlib import Path
+
+from safe_append import append_records, csv_header
+
+# 内存中缓冲的数据超过该大小时先追加一批
+FLUSH_SIZE = 1024 * 1024
+
+# Parquet每批写入的行数
+PARQUET_BATCH_SIZE = 1000
+
+# 输出格式对应的文件扩展名
+FORMAT_SUFFIXES = {
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+}
+
+
+class RowSink:
+    """逐行写入的输出接口
+
+    用法:
+        with CsvSink(path, fieldnames) as sink:
+            sink.write_rows(row for row in rows)
+    """
+
+    def __init__(self, path, fieldnames, append=True):
+        """初始化输出
+
+        参数:
+            path: 输出文件路径
+            fieldnames: 字段列表，决定列的顺序
+            append: 是否追加到已有文件
+        """
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.append = append
+        self.rows_written = 0
+
+    def open(self):
+        return self
+
+    def write(self, row):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        """写入多行（可以是生成器），返回写入的行数"""
+        count = 0
+        for row in rows:
+            self.write(row)
+            count += 1
+        return count
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BufferedSink(RowSink):
+    """先写入内存缓冲，关闭时（或缓冲超过FLUSH_SIZE时）加锁一次追加到文件"""
+
+    # 文件为空时写入的表头
+    header = b""
+
+    def open(self):
+        self._buffer = io.StringIO()
+        # 覆盖写入时第一批先清空文件
+        self._truncate = not self.append
+        return self
+
+    def _flush(self):
+        data = self._buffer.getvalue()
+        if not data and not self._truncate:
+            return
+        append_records(self.path, data.encode("utf-8"), header=self.header, truncate=self._truncate)
+        self._truncate = False
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+    def close(self):
+        self._flush()
+
+
+class CsvSink(BufferedSink):
+    """CSV输出，所有字段加引号，新文件使用带BOM的UTF-8以便Excel打开"""
+
+    def open(self):
+        super().open()
+        # 表头和BOM只在文件为空时写入，由safe_append在锁内判断
+        self.header = csv_header(self.fieldnames, quoting=csv.QUOTE_ALL, bom=True)
+        self._writer = csv.DictWriter(self._buffer, fieldnames=self.fieldnames,
+                                      quoting=csv.QUOTE_ALL, extrasaction="ignore")
+        return self
+
+    def write(self, row):
+        self._writer.writerow(row)
+        self.rows_written += 1
+        if self._buffer.tell() >= FLUSH_SIZE:
+            self._flush()
+
+
+class JsonlSink(BufferedSink):
+    """JSON Lines输出，每行一条新闻"""
+
+    def write(self, row):
+        record = {name: row.get(name) for name in self.fieldnames}
+        self._buffer.write(json.dumps(record, ensure_ascii=False))
+        self._buffer.write("\n")
+        self.rows_written += 1
+        if self._buffer.tell() >= FLUSH_SIZE:
+            self._flush()
+
+
+class ParquetSink(RowSink):
+    """Parquet输出（需要安装pyarrow）
+
+    Parquet文件不能追加，因此输出路径是一个目录，每次写入生成一个新的分片文件，
+    读取时按数据集整体读取即可。
+    """
+
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("输出Parquet格式需要安装pyarrow: pip install pyarrow")
+
+        self._pa = pa
+        self._pq = pq
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not self.append:
+            for part in self.path.glob("part-*.parquet"):
+                part.unlink()
+
+        # 以独占方式创建分片文件，同时写入的爬虫不会使用同一个分片
+        part_number = len(list(self.path.glob("part-*.parquet"))) + 1
+        while True:
+            self._part_path = self.path / f"part-{part_number:05d}.parquet"
+            try:
+                os.close(os.open(str(self._part_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                part_number += 1
+        self._schema = pa.schema([(name, pa.string()) for name in self.fieldnames])
+        self._writer = None
+        self._batch = []
+        return self
+
+    def _flush(self):
+        if not self._batch:
+            return
+        columns = {
+            name: [None if row.get(name) is None else str(row.get(name)) for row in self._batch]
+            for name in self.fieldnames
+        }
+        table = self._pa.Table.from_pydict(columns, schema=self._schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(str(self._part_path), self._schema)
+        self._writer.write_table(table)
+        self._batch = []
+
+    def write(self, row):
+        self._batch.append(row)
+        self.rows_written += 1
+        if len(self._batch) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            # 没有写入任何行，删除预先创建的空分片
+            self._part_path.unlink()
+
+
+SINK_CLASSES = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+}
+
+
+def open_sink(output_format, path, fieldnames, append=True):
+    """按格式创建输出
+
+    参数:
+        output_format: 输出格式，csv、jsonl或parquet
+        path: 输出路径
+        fieldnames: 字段列表
+        append: 是否追加到已有文件
+    """
+    if output_format not in SINK_CLASSES:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    return SINK_CLASSES[output_format](path, fieldnames, append=append)
+
+
+def write_rows(output_format, path, rows, fieldnames, append=True):
+    """打开输出、写入多行并关闭，返回写入的行数（便于在后处理线程中调用）"""
+    with open_sink(output_format, path, fieldnames, append=append) as sink:
+        return sink.write_rows(rows)
+
+
+def export_excel(rows, path, fieldnames=None):
+    """导出Excel文件，pandas和openpyxl只在这里按需导入"""
+    import pandas as pd
+
+    df = pd.DataFrame(list(rows), columns=fieldnames)
+    df.to_excel(path, index=False, engine="openpyxl")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTML快照存储
+页面HTML压缩后按内容哈希保存（html_cache/snapshots/blobs/ab/abcdef....html.gz），
+内容相同的快照只保存一份；SQLite索引（snapshots/index.db）记录每个采集周期
+（时间戳和目标标记）对应的快照。存储放在子目录中，不受缓存清理影响，由prune()清理。
+安装了zstandard时使用zstd压缩，否则使用gzip。put()可以在后处理线程中调用，压缩不持有锁。
+"""
+
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # zstandard为可选依赖，缺失时使用gzip
+    zstandard = None
+
+# 压缩格式对应的文件扩展名
+CODEC_SUFFIXES = {
+    "zstd": ".html.zst",
+    "gzip": ".html.gz",
+}
+
+
+def compress(data, codec, level=None):
+    """压缩字节数据"""
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level or 10).compress(data)
+    return gzip.compress(data, compresslevel=level or 6)
+
+
+def read_blob(path):
+    """读取并解压快照文件，按扩展名判断压缩格式"""
+    path = Path(path)
+    data = path.read_bytes()
+    if path.name.endswith(CODEC_SUFFIXES["zstd"]):
+        if zstandard is None:
+            raise RuntimeError("读取zstd压缩的快照需要安装zstandard: pip install zstandard")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif path.name.endswith(CODEC_SUFFIXES["gzip"]):
+        data = gzip.decompress(data)
+    return data.decode("utf-8")
+
+
+class SnapshotStore:
+    """内容寻址的HTML快照存储
+
+    用法:
+        store = SnapshotStore(dirs["html_cache"] / "snapshots")
+        store.put(html, "20250201_101500", url=url)
+        html = store.get_snapshot("20250201_101500")
+    """
+
+    def __init__(self, directory, codec=None, level=None, logger=None):
+        """打开快照存储
+
+        参数:
+            directory: 存储目录
+            codec: 压缩格式，zstd或gzip，默认有zstandard时使用zstd
+            level: 压缩级别，默认zstd为10、gzip为6
+            logger: 日志记录器
+        """
+        self.directory = Path(directory)
+        self.blob_dir = self.directory / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("zstd压缩需要安装zstandard: pip install zstandard")
+        self.level = level
+        self.logger = logger or logging.getLogger("news_crawler")
+
+        # 索引连接可以在后处理线程中使用，读写由锁串行化
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.directory / "index.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "hash TEXT PRIMARY KEY, path TEXT, size INTEGER, stored_size INTEGER, created REAL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "key TEXT PRIMARY KEY, url TEXT, hash TEXT, created REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS snapshots_hash ON snapshots (hash)")
+        self.conn.commit()
+
+    def put(self, html, key, url=None):
+        """保存一个快照
+
+        参数:
+            html: 页面HTML
+            key: 快照标记，即采集时间戳（多目标时带目标标记，如 20250201_101500_tech）
+            url: 页面URL
+
+        返回:
+            tuple: (内容哈希, 是否写入了新文件)
+        """
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            row = self.conn.execute("SELECT path FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        is_new = row is None or not (self.directory / row[0]).exists()
+        if is_new:
+            relative_path = Path("blobs") / digest[:2] / f"{digest}{CODEC_SUFFIXES[self.codec]}"
+            blob_path = self.directory / relative_path
+            blob_path.parent.mkdir(exist_ok=True)
+
+            # 先写临时文件再替换，避免留下不完整的快照；临时文件按线程区分
+            compressed = compress(data, self.codec, self.level)
+            tmp_path = blob_path.with_name(f"{blob_path.name}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, blob_path)
+
+        with self._lock:
+            if is_new:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO blobs (hash, path, size, stored_size, created) VALUES (?, ?, ?, ?, ?)",
+                    (digest, relative_path.as_posix(), len(data), len(compressed), time.time())
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (key, url, hash, created) VALUES (?, ?, ?, ?)",
+                (key, url, digest, time.time())
+            )
+            self.conn.commit()
+        return digest, is_new
+
+    def blob_path(self, digest):
+        """快照内容对应的文件路径，不存在时返回None"""
+        with self._lock:
+            row = self.conn.execute("SELECT path FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        return self.directory / row[0] if row else None
+
+    def get(self, digest):
+        """按内容哈希读取HTML"""
+        path = self.blob_path(digest)
+        if path is None:
+            raise KeyError(digest)
+        return read_blob(path)
+
+    def get_snapshot(self, key):
+        """按快照标记读取HTML"""
+        with self._lock:
+            row = self.conn.execute("SELECT hash FROM snapshots WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self.get(row[0])
+
+    def iter_snapshots(self, start=None, end=None):
+        """按标记顺序列出快照
+
+        参数:
+            start: 起始时间戳（包含），YYYYMMDD_HHMMSS
+            end: 结束时间戳（不包含）
+
+        返回:
+            生成器，依次返回 (快照标记, URL, 快照文件路径)
+        """
+        query = "SELECT s.key, s.url, b.path FROM snapshots s JOIN blobs b ON s.hash = b.hash"
+        conditions = []
+        params = []
+        if start:
+            conditions.append("s.key >= ?")
+            params.append(start)
+        if end:
+            conditions.append("s.key < ?")
+            params.append(end)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY s.key"
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        for key, url, path in rows:
+            yield key, url, self.directory / path
+
+    def prune(self, keep_days=3, max_snapshots=0):
+        """删除过期的快照记录，以及不再被引用的快照文件
+
+        参数:
+            keep_days: 保留多少天以内的快照，0表示不按时间删除
+            max_snapshots: 最多保留的快照数，0表示不限制
+
+        返回:
+            tuple: (删除的快照记录数, 删除的文件数)
+        """
+        with self._lock:
+            return self._prune(keep_days, max_snapshots)
+
+    def _prune(self, keep_days, max_snapshots):
+        deleted_snapshots = 0
+        if keep_days:
+            cursor = self.conn.execute(
+                "DELETE FROM snapshots WHERE created < ?", (time.time() - keep_days * 86400,)
+            )
+            deleted_snapshots += cursor.rowcount
+        if max_snapshots:
+            cursor = self.conn.execute(
+                "DELETE FROM snapshots WHERE key NOT IN "
+                "(SELECT key FROM snapshots ORDER BY created DESC LIMIT ?)", (max_snapshots,)
+            )
+            deleted_snapshots += cursor.rowcount
+
+        orphans = self.conn.execute(
+            "SELECT hash, path FROM blobs WHERE hash NOT IN (SELECT hash FROM snapshots)"
+        ).fetchall()
+        deleted_blobs = 0
+        for digest, path in orphans:
+            try:
+                os.remove(self.directory / path)
+                deleted_blobs += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"删除快照文件出错: {path}, {str(e)}")
+                continue
+            self.conn.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+        self.conn.commit()
+        return deleted_snapshots, deleted_blobs
+
+    def stats(self):
+        """快照数量和压缩前后的大小"""
+        with self._lock:
+            snapshots = self.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            blobs, size, stored_size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "snapshots": snapshots,
+            "blobs": blobs,
+            "raw_bytes": size,
+            "stored_bytes": stored_size,
+        }
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
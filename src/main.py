@@ -7,19 +7,27 @@
 """
 
 import os
+import sys
 import time
 import asyncio
 import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-import schedule
 from loguru import logger
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
 from selectors import Selectors
 from utils import get_data_file_path, save_to_csv, get_random_user_agent, deduplicate_news_data
 
+# 项目根目录中的公共模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from page_readiness import scroll_until_stable
+from request_filter import RequestFilter
+from metrics import METRICS
+from screenshot_policy import ScreenshotPolicy
+from tick_scheduler import TickScheduler
+
 # 配置日志
 log_path = Path(__file__).parent.parent / "logs"
 log_path.mkdir(exist_ok=True)
@@ -35,17 +43,46 @@ logger.add(
 class NewsCrawler:
     """资讯爬虫类"""
 
-    def __init__(self, url: str = "https://newsnow.busiyi.world/c/hottest"):
+    def __init__(self, url: str = "https://newsnow.busiyi.world/c/hottest",
+                 request_filter: Optional[RequestFilter] = None,
+                 screenshot_policy: Optional[ScreenshotPolicy] = None):
         """初始化爬虫
 
         Args:
             url: 目标网站URL
+            request_filter: 请求过滤器，默认拦截图片、字体、媒体和统计脚本
+            screenshot_policy: 截图策略，默认只在出错或页面异常时截取新闻列表区域的JPEG
         """
         self.url = url
+        self.request_filter = request_filter or RequestFilter()
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.selectors = Selectors()
+        self.screenshot_policy = screenshot_policy or ScreenshotPolicy(
+            mode="on-anomaly",
+            image_format="jpeg",
+            clip_selector=self.selectors.NEWS_ITEM,
+            logger=logger,
+        )
+
+    async def capture_screenshot(self, kind: str, name: str) -> None:
+        """按截图策略保存当前页面状态
+
+        Args:
+            kind: anomaly（页面异常）或error（出错）
+            name: 文件名前缀
+        """
+        if not self.page or not self.screenshot_policy.should_capture(kind):
+            return
+        try:
+            # 异常时只截取新闻列表区域（找不到列表时截取整个页面），出错时保留整个页面便于排查
+            await self.screenshot_policy.capture(
+                self.page, log_path, f"{name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                clip=kind != "error"
+            )
+        except Exception as e:
+            logger.error(f"保存页面截图失败: {e}")
 
     async def setup(self) -> None:
         """设置浏览器环境"""
@@ -56,6 +93,8 @@ class NewsCrawler:
             viewport={"width": 1920, "height": 1080},
             user_agent=get_random_user_agent(),
         )
+        # 拦截与新闻文本无关的请求
+        await self.context.route("**/*", self.request_filter.handle)
         self.page = await self.context.new_page()
         
         # 设置超时
@@ -87,51 +126,25 @@ class NewsCrawler:
             except Exception as e:
                 logger.warning(f"等待关键元素超时: {e}")
                 # 尝试截图保存当前页面状态
-                await self.page.screenshot(path=log_path / f"page_state_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+                await self.capture_screenshot("anomaly", "page_state")
             
             logger.info("页面加载完成")
         except Exception as e:
             logger.error(f"页面导航失败: {e}")
-            await self.page.screenshot(path=log_path / f"navigation_failed_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+            await self.capture_screenshot("error", "navigation_failed")
             raise
 
     async def scroll_to_bottom(self) -> None:
-        """滚动到页面底部以加载更多内容"""
+        """滚动到页面底部以加载更多内容，新闻数量稳定后立即停止"""
         logger.info("正在滚动页面以加载更多内容...")
         
-        # 获取初始高度
-        prev_height = await self.page.evaluate("document.body.scrollHeight")
-        
-        # 最大滚动尝试次数
-        max_scroll_attempts = 10
-        scroll_attempts = 0
-        
-        while scroll_attempts < max_scroll_attempts:
-            # 滚动到底部
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            # 等待加载
-            await self.page.wait_for_timeout(2000)
-            
-            # 检查是否有"加载更多"按钮并点击
-            try:
-                load_more_button = await self.page.query_selector(self.selectors.LOAD_MORE_BUTTON)
-                if load_more_button:
-                    await load_more_button.click()
-                    await self.page.wait_for_timeout(2000)
-                    logger.info("点击了'加载更多'按钮")
-            except Exception as e:
-                logger.debug(f"没有找到或无法点击'加载更多'按钮: {e}")
-            
-            # 获取新高度
-            new_height = await self.page.evaluate("document.body.scrollHeight")
-            
-            # 如果高度没有变化，尝试再滚动几次或跳出循环
-            if new_height == prev_height:
-                scroll_attempts += 1
-            else:
-                scroll_attempts = 0  # 重置尝试次数
-                
-            prev_height = new_height
+        await scroll_until_stable(
+            self.page,
+            self.selectors.NEWS_ITEM,
+            logger=logger,
+            max_scrolls=10,
+            load_more_selector=self.selectors.LOAD_MORE_BUTTON,
+        )
             
         logger.info("页面滚动完成")
 
@@ -148,7 +161,7 @@ class NewsCrawler:
             await self.page.wait_for_selector(".news-list, .article-list, .feed-list", timeout=10000)
         except Exception as e:
             logger.error(f"无法找到新闻列表容器: {e}")
-            await self.page.screenshot(path=log_path / f"no_news_list_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+            await self.capture_screenshot("anomaly", "no_news_list")
             # 尝试获取页面内容以便调试
             page_content = await self.page.content()
             with open(log_path / f"page_content_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.html", "w", encoding="utf-8") as f:
@@ -265,26 +278,44 @@ class NewsCrawler:
         """运行爬虫流程"""
         start_time = time.time()
         logger.info("开始爬取任务")
+        METRICS.start_cycle()
+        self.screenshot_policy.begin_cycle()
         
         try:
-            await self.setup()
-            await self.navigate_to_page()
-            await self.scroll_to_bottom()
-            news_data = await self.extract_news()
-            self.save_to_csv(news_data)
+            with METRICS.span("launch"):
+                await self.setup()
+            with METRICS.span("goto"):
+                await self.navigate_to_page()
+            with METRICS.span("scroll"):
+                await self.scroll_to_bottom()
+            with METRICS.span("extract"):
+                news_data = await self.extract_news()
+            with METRICS.span("write"):
+                self.save_to_csv(news_data)
             
             # 记录任务完成情况
             end_time = time.time()
             duration = end_time - start_time
+            METRICS.observe("cycle", duration)
+            METRICS.inc("cycles_total", result="success")
+            METRICS.inc("news_items_total", len(news_data), kind="collected")
             logger.info(f"任务完成，耗时: {duration:.2f}秒，获取数据: {len(news_data)} 条")
+            logger.info("各阶段耗时: " + ", ".join(
+                f"{phase} {seconds:.2f}s" for phase, seconds in METRICS.cycle_timings().items()
+            ))
+            
+            filter_stats = self.request_filter.stats()
+            logger.info(f"拦截请求 {filter_stats['blocked_requests']} 个，估计节省 {filter_stats['bytes_saved_estimated'] / 1024:.0f} KB")
             
         except Exception as e:
             logger.error(f"爬虫运行出错: {e}")
+            METRICS.observe("cycle", time.time() - start_time)
+            METRICS.inc("cycles_total", result="error")
             
             # 如果页面已加载，尝试保存页面状态以便调试
             if self.page:
                 try:
-                    await self.page.screenshot(path=log_path / f"error_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+                    await self.capture_screenshot("error", "error")
                     page_content = await self.page.content()
                     with open(log_path / f"error_content_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.html", "w", encoding="utf-8") as f:
                         f.write(page_content)
@@ -292,6 +323,11 @@ class NewsCrawler:
                     logger.error(f"保存错误状态截图失败: {screenshot_err}")
         finally:
             await self.close()
+            # 定时任务在同一进程中运行，直方图在各次任务之间累计
+            try:
+                METRICS.write_prometheus(log_path / "crawler_metrics.prom")
+            except Exception as e:
+                logger.warning(f"写入指标文件失败: {e}")
 
 
 async def main():
@@ -302,20 +338,10 @@ async def main():
     logger.info("爬虫任务执行完成")
 
 
-def scheduled_task():
-    """定时任务"""
-    asyncio.run(main())
-
-
 if __name__ == "__main__":
-    # 设置定时任务，每5分钟执行一次
-    schedule.every(5).minutes.do(scheduled_task)
-    
-    # 立即执行一次
-    scheduled_task()
+    # 每5分钟执行一次，时间点对齐到整5分钟；上一次未结束时错过的时间点合并为一次
+    scheduler = TickScheduler(lambda tick: main(), interval=5 * 60, policy="coalesce")
     
-    # 持续运行定时任务
+    # 启动时立即执行一次，之后持续运行定时任务
     logger.info("爬虫已启动，每5分钟执行一次")
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
\ No newline at end of file
+    asyncio.run(scheduler.run())
@@ -7,7 +7,7 @@
 """
 
 import os
-import csv
+import sys
 import json
 import random
 import datetime
@@ -17,6 +17,10 @@ from typing import Dict, List, Any, Optional
 import pandas as pd
 from loguru import logger
 
+# 项目根目录下的公共模块
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from safe_append import append_csv_rows
+
 
 def get_data_file_path(date_str: Optional[str] = None) -> Path:
     """获取数据文件路径
@@ -47,21 +51,10 @@ def save_to_csv(data: List[Dict[str, Any]], file_path: Path) -> None:
         logger.warning("没有数据可保存")
         return
         
-    # 检查文件是否存在，决定是否写入表头
-    file_exists = file_path.exists()
-    
     try:
-        with open(file_path, mode="a", newline="", encoding="utf-8") as f:
-            fieldnames = list(data[0].keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            # 如果文件不存在，写入表头
-            if not file_exists:
-                writer.writeheader()
-                
-            # 写入数据
-            writer.writerows(data)
-            
+        # 加锁后一次追加，表头在锁内判断文件为空时写入，多个爬虫同时写入同一个文件时
+        # 不会交错或重复写入表头
+        append_csv_rows(file_path, data, list(data[0].keys()))
         logger.info(f"成功将 {len(data)} 条数据保存到 {file_path}")
     except Exception as e:
         logger.error(f"保存数据时出错: {e}")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自适应采集间隔测试脚本
+"""
+
+import datetime
+
+from adaptive_interval import AdaptiveInterval, hourly_rates
+
+
+def test_interval_follows_rate_and_backs_off():
+    """新增多时缩短间隔，没有新增时拉长间隔，出错时指数退避"""
+    scheduler = AdaptiveInterval(base_interval=300, min_interval=60, max_interval=1800, target_new_items=10)
+    assert scheduler.next_interval() == 300
+
+    scheduler.observe(new_items=20, elapsed=300)  # 每分钟4条
+    assert scheduler.next_interval() == 150
+
+    for _ in range(20):
+        scheduler.observe(new_items=0, elapsed=300)
+    assert scheduler.next_interval() == 1800
+
+    scheduler.observe(success=False)
+    assert scheduler.next_interval() == 120
+    scheduler.observe(success=False)
+    assert scheduler.next_interval() == 240
+
+
+def test_hourly_profile_from_records():
+    """按小时统计历史记录中的新增速率"""
+    start = datetime.datetime(2025, 2, 1, 3, 0)
+    records = [
+        {"timestamp": (start + datetime.timedelta(minutes=5 * i)).strftime("%Y-%m-%d %H:%M:%S"), "new_news": 5}
+        for i in range(6)
+    ]
+    assert hourly_rates(records) == {3: 1.0}
+
+    scheduler = AdaptiveInterval(hourly_profile={3: 1.0}, target_new_items=10)
+    assert scheduler.next_interval(moment=start) == 600
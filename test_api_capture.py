@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+接口捕获测试脚本
+"""
+
+from api_capture import ApiCapture, convert_items, infer_schema
+
+TARGET = "https://newsnow.busiyi.world/c/hottest"
+OTHER_TARGET = "https://newsnow.busiyi.world/c/tech"
+ENDPOINT = "https://newsnow.busiyi.world/api/s?id=hottest"
+
+
+def api_items(titles):
+    return [{"title": title, "url": f"/news/{index}"} for index, title in enumerate(titles)]
+
+
+def test_empty_titles_do_not_match_dom(tmp_path):
+    capture = ApiCapture(tmp_path / "api_endpoints.json")
+    dom_items = [{"title": "1. 热点新闻"}]
+    responses = [(ENDPOINT, {"items": api_items(["热点新闻", " ", " ", " "])})]
+
+    assert capture.learn(TARGET, dom_items, responses) == 0
+    assert not capture.has_endpoints()
+
+
+def test_endpoints_are_kept_per_target(tmp_path):
+    store_path = tmp_path / "api_endpoints.json"
+    capture = ApiCapture(store_path)
+    titles = [f"新闻{index}" for index in range(10)]
+    responses = [(ENDPOINT, {"items": api_items(titles)})]
+
+    assert capture.learn(TARGET, [{"title": title} for title in titles], responses) == 1
+    assert capture.has_endpoints(TARGET)
+    assert not capture.has_endpoints(OTHER_TARGET)
+
+    # 重新加载后仍按目标区分，某个目标失效不影响其他目标
+    capture = ApiCapture(store_path)
+    assert capture.has_endpoints(TARGET)
+    capture.invalidate(OTHER_TARGET)
+    assert capture.has_endpoints(TARGET)
+    capture.invalidate(TARGET)
+    assert not capture.has_endpoints()
+
+
+def test_relative_links_are_resolved_against_endpoint():
+    items = api_items(["新闻"]) + [{"title": "外部", "url": "https://example.com/a"}]
+    results = convert_items(items, infer_schema(items), base_url=ENDPOINT)
+
+    assert [item["link"] for item in results] == [
+        "https://newsnow.busiyi.world/news/0",
+        "https://example.com/a",
+    ]
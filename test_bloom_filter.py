@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+布隆过滤器测试脚本
+"""
+
+import datetime
+
+from bloom_filter import BloomFilter, RollingBloomFilter
+
+
+def test_no_false_negatives_and_low_fpr(tmp_path):
+    """已添加的ID一定命中，误判率接近设定值"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"id{i}")
+    assert all(f"id{i}" in bloom for i in range(1000))
+
+    false_positives = sum(1 for i in range(1000, 11000) if f"id{i}" in bloom)
+    assert false_positives / 10000 < 0.03
+
+    path = tmp_path / "bloom.bin"
+    bloom.save(path)
+    loaded = BloomFilter.load(path)
+    assert loaded.count == 1000
+    assert "id1" in loaded
+
+
+def test_rolling_window_drops_expired_days(tmp_path):
+    """超出时间窗口的过滤器文件在加载时删除"""
+    old_date = (datetime.date.today() - datetime.timedelta(days=10)).isoformat()
+    old = BloomFilter(capacity=100)
+    old.add("old-id")
+    old.save(tmp_path / f"bloom_{old_date}.bin")
+
+    rolling = RollingBloomFilter(tmp_path, days=7, capacity_per_day=100)
+    assert not rolling.might_contain("old-id")
+    assert not (tmp_path / f"bloom_{old_date}.bin").exists()
+
+    rolling.add(["new-id"])
+    rolling.save()
+    reloaded = RollingBloomFilter(tmp_path, days=7, capacity_per_day=100)
+    new_ids, maybe_ids = reloaded.split(["new-id", "other-id"])
+    assert maybe_ids == ["new-id"]
+    assert new_ids == ["other-id"]
+
+
+def test_readding_does_not_inflate_count(tmp_path):
+    """重复添加的ID不计入count，seed只补充缺少的ID"""
+    rolling = RollingBloomFilter(tmp_path, days=7, capacity_per_day=100)
+    assert rolling.add(["a", "b"]) == 2
+    assert rolling.add(["a", "b"]) == 0
+    assert rolling.stats()["bloom_items"] == 2
+    assert rolling.seed(["a", "c"]) == 1
+
+
+def test_save_writes_only_changed_days(tmp_path):
+    """只重写有变化的日期文件"""
+    yesterday = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+    old = BloomFilter(capacity=100)
+    old.add("old-id")
+    old_path = tmp_path / f"bloom_{yesterday}.bin"
+    old.save(old_path)
+    mtime = old_path.stat().st_mtime_ns
+
+    rolling = RollingBloomFilter(tmp_path, days=7, capacity_per_day=100)
+    rolling.add(["new-id"])
+    rolling.save()
+    assert old_path.stat().st_mtime_ns == mtime
+    assert (tmp_path / f"bloom_{datetime.date.today().isoformat()}.bin").exists()
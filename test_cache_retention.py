@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缓存清理测试脚本
+"""
+
+import os
+import time
+
+from cache_retention import apply_retention, parse_budgets
+
+
+def make_files(directory, count, size=100, step=3600):
+    """生成count个文件，编号越大越旧"""
+    now = time.time()
+    for i in range(count):
+        path = directory / f"page_state_{i:03d}.png"
+        path.write_bytes(b"x" * size)
+        os.utime(path, (now - i * step, now - i * step))
+
+
+def test_keeps_newest_within_count_bytes_and_age(tmp_path):
+    """只保留最新的文件，同时满足数量、大小和天数限制"""
+    make_files(tmp_path, 30, size=100, step=86400 / 4)
+    (tmp_path / "runs").mkdir()
+
+    deleted, freed = apply_retention(tmp_path, max_files=20, max_bytes=1500, keep_days=3)
+    remaining = sorted(path.name for path in tmp_path.iterdir() if path.is_file())
+    assert remaining == [f"page_state_{i:03d}.png" for i in range(12)]
+    assert deleted == 18 and freed == 1800
+    # 子目录不清理
+    assert (tmp_path / "runs").is_dir()
+
+    assert apply_retention(tmp_path, max_files=20) == (0, 0)
+
+
+def test_parse_budgets():
+    assert parse_budgets(["screenshots=200:1.5", "logs=50"]) == {
+        "screenshots": (200, int(1.5 * 1024 * 1024)),
+        "logs": (50, 0),
+    }
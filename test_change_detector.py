@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+变化检测测试脚本
+"""
+
+from change_detector import ChangeDetector, fingerprint_items
+
+
+def news(*titles):
+    return [{"title": title, "link": f"https://example.com/{title}"} for title in titles]
+
+
+def test_diff_only_after_commit():
+    """只返回上一周期没有出现过的新闻，状态在提交后才生效"""
+    detector = ChangeDetector()
+    url = "https://example.com/c/hottest"
+
+    detector.begin_cycle()
+    assert not detector.check(url, "fp1")
+    assert detector.diff(url, news("a", "b")) == news("a", "b")
+
+    # 上一周期未提交（如写入失败），本周期重新完整处理
+    detector.begin_cycle()
+    assert not detector.check(url, "fp1")
+    assert detector.diff(url, news("a", "b")) == news("a", "b")
+    detector.commit()
+
+    detector.begin_cycle()
+    assert detector.check(url, "fp1")
+    assert url in detector.unchanged
+
+    detector.begin_cycle()
+    assert not detector.check(url, "fp2")
+    assert detector.diff(url, news("c", "a", "b")) == news("c")
+    detector.commit()
+
+    detector.reset()
+    assert not detector.check(url, "fp2")
+
+
+def test_fingerprint_depends_on_order():
+    assert fingerprint_items(news("a", "b")) == fingerprint_items(news("a", "b"))
+    assert fingerprint_items(news("a", "b")) != fingerprint_items(news("b", "a"))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分布式采集任务队列测试脚本
+"""
+
+from crawl_queue import SqliteQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def open_test_queue(tmp_path, clock):
+    return SqliteQueue(tmp_path / "queue.db", lease_seconds=60, max_attempts=2, retry_delay=10, clock=clock)
+
+
+def test_lease_is_exclusive_and_expires(tmp_path):
+    clock = Clock()
+    queue = open_test_queue(tmp_path, clock)
+    assert queue.enqueue("https://example.com/a") is not None
+    # 同一URL已有未完成的任务时不重复放入
+    assert queue.enqueue("https://example.com/a") is None
+
+    jobs = queue.lease("worker-1", limit=5)
+    assert [job["url"] for job in jobs] == ["https://example.com/a"]
+    assert queue.lease("worker-2") == []
+
+    # 租约到期后由其他进程重新领取，原进程不能再续约
+    clock.now += 61
+    jobs = queue.lease("worker-2")
+    assert jobs[0]["attempts"] == 2
+    assert not queue.extend(jobs[0]["id"], "worker-1")
+    assert queue.extend(jobs[0]["id"], "worker-2")
+    queue.close()
+
+
+def test_retry_with_backoff_then_fail(tmp_path):
+    clock = Clock()
+    queue = open_test_queue(tmp_path, clock)
+    queue.enqueue("https://example.com/a")
+
+    job = queue.lease("worker-1")[0]
+    assert queue.fail(job["id"], "worker-1", "超时")
+    assert queue.lease("worker-1") == []
+    clock.now += 10
+    job = queue.lease("worker-1")[0]
+    assert not queue.fail(job["id"], "worker-1", "超时")
+
+    stats = queue.stats()
+    assert stats["queue_failed"] == 1 and stats["queue_pending"] == 0
+    queue.close()
+
+
+def test_results_are_committed_once(tmp_path):
+    clock = Clock()
+    queue = open_test_queue(tmp_path, clock)
+    queue.enqueue("https://example.com/a")
+    job = queue.lease("worker-1")[0]
+    rows = [{"news_id": "n1", "title": "一"}, {"news_id": "n2", "title": "二"}]
+
+    # 租约到期后两个进程都提交了同一批结果
+    clock.now += 61
+    queue.lease("worker-2")
+    assert queue.complete(job["id"], "worker-2", rows) == 2
+    assert queue.complete(job["id"], "worker-1", rows + [{"news_id": "n3", "title": "三"}]) == 1
+
+    batch = queue.pending_results()
+    assert [row["news_id"] for _, row in batch] == ["n1", "n2", "n3"]
+    queue.mark_exported(key for key, _ in batch)
+    assert queue.pending_results() == []
+    assert queue.stats()["queue_done"] == 1
+
+    # 已完成的URL可以再次放入
+    assert queue.enqueue("https://example.com/a") is not None
+    queue.close()
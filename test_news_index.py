@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+去重索引测试脚本
+"""
+
+import csv
+
+from news_index import NewsIndex, index_path_for
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["number", "title", "news_id"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_rebuild_from_csv(tmp_path):
+    """索引不存在时从CSV重建"""
+    csv_path = tmp_path / "continuous_news.csv"
+    write_csv(csv_path, [
+        {"number": 1, "title": "a", "news_id": "id1"},
+        {"number": 2, "title": "b", "news_id": "id2"},
+    ])
+
+    with NewsIndex(csv_path) as index:
+        assert len(index) == 2
+        assert index.last_number == 2
+        assert index.existing(["id1", "id3"]) == {"id1"}
+    assert index_path_for(csv_path).exists()
+
+
+def test_add_keeps_index_in_sync(tmp_path):
+    """追加写入后记录的ID和序号在重新打开时仍然有效"""
+    csv_path = tmp_path / "continuous_news.csv"
+    write_csv(csv_path, [{"number": 1, "title": "a", "news_id": "id1"}])
+
+    with NewsIndex(csv_path) as index:
+        with open(csv_path, "a", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerow([2, "b", "id2"])
+        index.add(["id2"], 2)
+
+    with NewsIndex(csv_path) as index:
+        assert index.last_number == 2
+        assert index.existing(["id1", "id2"]) == {"id1", "id2"}
+
+
+def test_rebuild_when_csv_changed(tmp_path):
+    """CSV在索引之外被修改时重建索引"""
+    csv_path = tmp_path / "continuous_news.csv"
+    write_csv(csv_path, [{"number": 1, "title": "a", "news_id": "id1"}])
+    NewsIndex(csv_path).close()
+
+    write_csv(csv_path, [{"number": 5, "title": "c", "news_id": "id5"}])
+    with NewsIndex(csv_path) as index:
+        assert index.last_number == 5
+        assert index.existing(["id1", "id5"]) == {"id5"}
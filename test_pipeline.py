@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+后处理阶段测试脚本
+"""
+
+import time
+import asyncio
+
+from normalize import normalize_items
+from pipeline import PostProcessPipeline, offload
+
+
+NEWS = [
+    {"title": f"{i} 测试新闻 {i}", "link": f"https://example.com/{i}", "source": "", "pubTime": "", "summary": ""}
+    for i in range(1, 4)
+]
+
+
+def test_normalize_in_process_pool():
+    async def main():
+        pipeline = PostProcessPipeline(workers=1, executor="process")
+        try:
+            rows = await pipeline.run(normalize_items, NEWS, "2024-01-01 00:00:00", cpu=True)
+        finally:
+            await pipeline.close()
+        return rows, pipeline.stats()
+
+    rows, stats = asyncio.run(main())
+    assert rows == normalize_items(NEWS, "2024-01-01 00:00:00")
+    assert stats["pipeline_tasks"] == 1
+
+
+def test_full_queue_blocks_submitter():
+    async def main():
+        pipeline = PostProcessPipeline(workers=1, queue_size=1, executor="thread")
+        futures = [await pipeline.submit(time.sleep, 0.05) for _ in range(6)]
+        await pipeline.drain()
+        await pipeline.close()
+        return futures, pipeline.stats()
+
+    futures, stats = asyncio.run(main())
+    assert all(future.done() for future in futures)
+    assert stats["pipeline_max_queue_depth"] == 1
+    assert stats["pipeline_blocked_seconds"] > 0
+
+
+def test_errors_and_inline_offload():
+    async def main():
+        pipeline = PostProcessPipeline(workers=1, executor="thread")
+        try:
+            try:
+                await pipeline.run(int, "x")
+            except ValueError:
+                failed = True
+            else:
+                failed = False
+            inline = await offload(None, sum, [1, 2, 3])
+        finally:
+            await pipeline.close()
+        return failed, inline
+
+    assert asyncio.run(main()) == (True, 6)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多进程安全追加测试脚本
+"""
+
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+from safe_append import append_csv_rows, lock_path_for
+from sinks import write_rows
+
+FIELDS = ["number", "title", "link"]
+
+
+def write_batches(path, writer_id, batches=20, batch_size=50):
+    for batch in range(batches):
+        rows = [
+            {"number": f"{writer_id}-{batch}-{i}", "title": "标题" * 20, "link": f"https://example.com/{i}"}
+            for i in range(batch_size)
+        ]
+        write_rows("csv", path, rows, FIELDS)
+
+
+def read_rows(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_parallel_writers_share_one_header(tmp_path):
+    path = tmp_path / "news.csv"
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write_batches, [path] * 4, range(4)))
+
+    content = path.read_bytes()
+    assert content.startswith(b"\xef\xbb\xbf")
+    assert content.count(b'"number","title","link"') == 1
+
+    rows = read_rows(path)
+    assert len(rows) == 4 * 20 * 50
+    assert len({row["number"] for row in rows}) == len(rows)
+    assert all(row["link"].startswith("https://") for row in rows)
+
+
+def test_partial_write_is_truncated(tmp_path):
+    path = tmp_path / "news.csv"
+    append_csv_rows(path, [{"number": "1", "title": "a", "link": "x"}], FIELDS)
+    assert lock_path_for(path).exists()
+
+    # 模拟写入进程中途退出，留下不完整的一行
+    with open(path, "ab") as f:
+        f.write(b"2,b,htt")
+    append_csv_rows(path, [{"number": "3", "title": "c", "link": "z"}], FIELDS)
+
+    assert [row["number"] for row in read_rows(path)] == ["1", "3"]
+
+
+def test_overwrite_rewrites_header(tmp_path):
+    path = tmp_path / "news.csv"
+    write_rows("csv", path, [{"number": "1", "title": "a", "link": "x"}], FIELDS)
+    write_rows("csv", path, [{"number": "2", "title": "b", "link": "y"}], FIELDS, append=False)
+
+    assert [row["number"] for row in read_rows(path)] == ["2"]
+    assert path.read_bytes().count(b"\xef\xbb\xbf") == 1
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+时钟对齐调度测试脚本
+"""
+
+import asyncio
+
+from tick_scheduler import TickScheduler
+
+
+def run_slow_job(policy):
+    """任务耗时为间隔的2.5倍，检查运行次数、并发数和错过时间点的处理"""
+    active = []
+    peak = []
+
+    async def job(tick):
+        active.append(tick)
+        peak.append(len(active))
+        await asyncio.sleep(0.25)
+        active.remove(tick)
+
+    scheduler = TickScheduler(job, interval=0.1, policy=policy, metrics=None)
+
+    async def main():
+        asyncio.get_running_loop().call_later(1.0, scheduler.stop)
+        await scheduler.run()
+
+    asyncio.run(main())
+    return scheduler, max(peak)
+
+
+def test_skip_never_overlaps():
+    scheduler, peak = run_slow_job("skip")
+    assert peak == 1
+    assert 3 <= scheduler.stats["run"] <= 5
+    assert scheduler.stats["skipped"] >= 4
+    # 跳过的时间点不补跑，开始时间紧跟时间点
+    assert scheduler.stats["max_lag"] < 0.1
+
+
+def test_coalesce_runs_as_soon_as_free():
+    scheduler, peak = run_slow_job("coalesce")
+    assert peak == 1
+    assert scheduler.stats["coalesced"] >= 1
+    assert scheduler.stats["max_lag"] > 0.1
+
+
+def test_max_runs_and_concurrency():
+    started = []
+
+    async def job(tick):
+        started.append(tick)
+        await asyncio.sleep(0.15)
+
+    scheduler = TickScheduler(job, interval=0.05, policy="catch-up", max_concurrent=2, metrics=None)
+    asyncio.run(scheduler.run(max_runs=6))
+    assert len(started) == 6
+    assert scheduler.stats["run"] == 6
+
+
+def test_callable_interval_is_aligned_after_each_run():
+    """间隔为函数时对齐到当前间隔的整数倍，任务结束后按新的间隔重新对齐"""
+    starts = []
+    current = {"interval": 0.1}
+
+    async def job(tick):
+        starts.append(tick)
+        await asyncio.sleep(0.02)
+        current["interval"] = 0.2
+
+    scheduler = TickScheduler(job, interval=lambda: current["interval"], metrics=None)
+    asyncio.run(scheduler.run(max_runs=3))
+
+    for tick in starts[1:]:
+        assert min(tick % 0.2, 0.2 - tick % 0.2) < 1e-6
+    assert abs(starts[2] - starts[1] - 0.2) < 1e-6
+
+
+def test_callable_interval_applies_policy():
+    """间隔为函数时任务超过时间点仍按策略处理，不会一直等到任务结束"""
+    async def job(tick):
+        await asyncio.sleep(0.25)
+
+    scheduler = TickScheduler(job, interval=lambda: 0.1, policy="skip", metrics=None)
+
+    async def main():
+        asyncio.get_running_loop().call_later(1.0, scheduler.stop)
+        await scheduler.run()
+
+    asyncio.run(main())
+    assert scheduler.stats["skipped"] >= 4
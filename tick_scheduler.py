@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+按时钟对齐的周期调度
+采集时间点对齐到间隔的整数倍（如间隔5分钟时为 :00、:05、:10 ...），不受单次
+采集耗时的影响。到点时如果正在运行的任务数已达上限，或者因进程阻塞、系统休眠
+错过了若干个时间点，按策略处理：
+- skip: 丢弃错过的时间点，只在有空闲时运行最新的一个
+- coalesce: 错过的时间点合并为一次，空闲后立即运行
+- catch-up: 错过的时间点依次补跑（最多保留max_backlog个）
+每次运行的调度延迟（实际开始时间减去计划时间）记录为schedule_lag指标。
+
+间隔为函数时（如自适应间隔），时间点同样对齐到当前间隔的整数倍；正在运行的
+任务在下一个时间点之前结束时，按本次运行结果得到的新间隔重新对齐。
+"""
+
+import math
+import time
+import random
+import asyncio
+import logging
+
+from metrics import METRICS
+
+TICK_POLICIES = ["skip", "coalesce", "catch-up"]
+
+
+class TickScheduler:
+    """按时钟对齐的周期调度器
+
+    用法:
+        async def job(tick):
+            await scrape_news(...)
+
+        scheduler = TickScheduler(job, interval=300, policy="coalesce", jitter=10)
+        await scheduler.run()
+    """
+
+    def __init__(self, job, interval, policy="skip", max_concurrent=1, jitter=0.0, offset=0.0,
+                 max_backlog=10, run_immediately=True, logger=None, metrics=METRICS, clock=time.time):
+        """初始化调度器
+
+        参数:
+            job: 异步任务函数，参数为计划运行的时间戳
+            interval: 间隔（秒），也可以是返回间隔的函数（每次运行结束后重新计算，如自适应间隔）
+            policy: 错过时间点时的处理策略，见TICK_POLICIES
+            max_concurrent: 同时运行的最大任务数
+            jitter: 每个时间点随机推迟0到jitter秒，避免多个实例同时请求
+            offset: 时间点相对于间隔整数倍的偏移（秒）
+            max_backlog: catch-up策略下最多保留的待补跑时间点数
+            run_immediately: 启动时是否立即运行一次
+            logger: 日志记录器
+            metrics: 记录调度延迟和时间点计数的统计（PhaseMetrics），为None时不记录
+            clock: 返回当前时间戳的函数
+        """
+        if policy not in TICK_POLICIES:
+            raise ValueError(f"不支持的调度策略: {policy}")
+
+        self.job = job
+        self.interval = interval
+        self.policy = policy
+        self.max_concurrent = max(1, max_concurrent)
+        self.jitter = jitter
+        self.offset = offset
+        self.max_backlog = max_backlog
+        self.run_immediately = run_immediately
+        self.logger = logger or logging.getLogger("scheduler")
+        self.metrics = metrics
+        self.clock = clock
+
+        self.running = set()
+        self.backlog = []
+        self.pending = None
+        self.started = 0
+        self.max_runs = 0
+        self.stats = {"run": 0, "skipped": 0, "coalesced": 0, "max_lag": 0.0}
+        self._stop = asyncio.Event()
+        self._idle = asyncio.Event()
+
+    def interval_seconds(self):
+        return self.interval() if callable(self.interval) else self.interval
+
+    def next_tick(self, after):
+        """after之后的下一个时间点，对齐到当前间隔的整数倍（加上偏移）"""
+        interval = max(0.001, self.interval_seconds())
+        return self.offset + (math.floor((after - self.offset) / interval) + 1) * interval
+
+    def stop(self):
+        """停止调度，正在运行的任务结束后退出"""
+        self._stop.set()
+
+    def _count(self, result, value=1):
+        self.stats[result] += value
+        if self.metrics is not None and value:
+            self.metrics.inc("ticks_total", value, result=result)
+
+    async def _sleep_until(self, deadline, wake=None):
+        """等待到deadline
+
+        返回:
+            str: 调用stop()时返回"stop"，wake事件先触发时返回"wake"，到时间返回None
+        """
+        waiters = {asyncio.create_task(self._stop.wait()): "stop"}
+        if wake is not None:
+            waiters[asyncio.create_task(wake.wait())] = "wake"
+        try:
+            done, _ = await asyncio.wait(
+                waiters, timeout=max(0.0, deadline - self.clock()), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if not done:
+            return None
+        return "stop" if self._stop.is_set() else "wake"
+
+    def _exhausted(self):
+        return bool(self.max_runs) and self.started >= self.max_runs
+
+    def _start(self, scheduled):
+        """开始一次运行，记录调度延迟"""
+        lag = max(0.0, self.clock() - scheduled)
+        self.stats["max_lag"] = max(self.stats["max_lag"], lag)
+        if self.metrics is not None:
+            self.metrics.observe("schedule_lag", lag)
+        self._count("run")
+        if lag >= 1:
+            self.logger.info(f"调度延迟 {lag:.2f} 秒")
+
+        self.started += 1
+        self._idle.clear()
+        task = asyncio.create_task(self._run_job(scheduled))
+        self.running.add(task)
+        task.add_done_callback(self._on_done)
+
+    async def _run_job(self, scheduled):
+        try:
+            await self.job(scheduled)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"计划于 {time.strftime('%H:%M:%S', time.localtime(scheduled))} 的任务出错: {str(e)}")
+
+    def _on_done(self, task):
+        self.running.discard(task)
+        if not self._stop.is_set():
+            self._drain()
+        if not self.running:
+            self._idle.set()
+
+    def _drain(self):
+        """有空闲时运行合并或待补跑的时间点"""
+        while len(self.running) < self.max_concurrent and not self._exhausted():
+            if self.pending is not None:
+                scheduled, self.pending = self.pending, None
+            elif self.backlog:
+                scheduled = self.backlog.pop(0)
+            else:
+                break
+            self._start(scheduled)
+
+    def _dispatch(self, due):
+        """处理到期的时间点（按时间顺序，除最后一个外都是错过的）"""
+        if self.policy == "skip":
+            if len(self.running) < self.max_concurrent and not self._exhausted():
+                self._count("skipped", len(due) - 1)
+                self._start(due[-1])
+            else:
+                self._count("skipped", len(due))
+                self.logger.warning(f"仍有 {len(self.running)} 个任务在运行，跳过本次调度")
+        elif self.policy == "coalesce":
+            self._count("coalesced", len(due) - 1 + (1 if self.pending is not None else 0))
+            # 合并后的运行按最早的计划时间计算延迟
+            self.pending = self.pending if self.pending is not None else due[0]
+            self._drain()
+        else:
+            self.backlog.extend(due)
+            if len(self.backlog) > self.max_backlog:
+                dropped = len(self.backlog) - self.max_backlog
+                del self.backlog[:dropped]
+                self._count("skipped", dropped)
+                self.logger.warning(f"待补跑的调度过多，丢弃最早的 {dropped} 个")
+            self._drain()
+
+    async def run(self, max_runs=0):
+        """按时间点运行任务，直到调用stop()或达到最大运行次数
+
+        参数:
+            max_runs: 最多运行多少次，0表示不限制
+        """
+        self.max_runs = max_runs
+        self._stop.clear()
+        self._idle.set()
+
+        last_tick = self.clock()
+        if self.run_immediately:
+            self._start(last_tick)
+
+        try:
+            while not self._stop.is_set() and not self._exhausted():
+                tick = self.next_tick(last_tick)
+                if callable(self.interval) and self.running:
+                    # 间隔取决于正在运行的任务的结果，任务在时间点之前结束时按新的间隔重新对齐；
+                    # 任务超过时间点仍未结束时按原来的时间点调度，由策略处理
+                    woke = await self._sleep_until(tick, wake=self._idle)
+                    if woke == "stop":
+                        break
+                    if woke == "wake":
+                        tick = self.next_tick(last_tick)
+                scheduled = tick + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+                if await self._sleep_until(scheduled) == "stop":
+                    break
+
+                # 休眠或阻塞期间错过的时间点，最多统计max_backlog个
+                now = self.clock()
+                due = [scheduled]
+                last_tick = tick
+                while len(due) <= self.max_backlog:
+                    following = self.next_tick(last_tick)
+                    if following > now:
+                        break
+                    due.append(following)
+                    last_tick = following
+                if self.next_tick(last_tick) <= now:
+                    # 错过的时间点超过统计上限，其余的直接丢弃
+                    interval = max(0.001, self.interval_seconds())
+                    skipped = int((now - last_tick) // interval)
+                    self._count("skipped", skipped)
+                    last_tick += skipped * interval
+
+                self._dispatch(due)
+
+            # 等待已开始的任务结束
+            await self._idle.wait()
+        finally:
+            for task in list(self.running):
+                task.cancel()
+            if self.running:
+                await asyncio.gather(*self.running, return_exceptions=True)